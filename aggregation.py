@@ -0,0 +1,165 @@
+# aggregation.py
+
+import numpy as np
+
+from zones import BASIC_ZONES, BASELINE_Y, HALF_COURT_Y, SIDELINE_X, basic_zone_codes
+
+# Extensión de la media cancha en unidades de LOC (décimas de pie)
+COURT_X_MIN, COURT_X_MAX = -SIDELINE_X, SIDELINE_X
+COURT_Y_MIN, COURT_Y_MAX = BASELINE_Y, HALF_COURT_Y
+
+DEFAULT_BIN_SIZE = 10  # 1 pie por celda
+# Tamaños de celda precalculados en el resumen de cada entrada de la caché (mapa de tiros y eficiencia)
+SUMMARY_BIN_SIZES = (DEFAULT_BIN_SIZE, 20)
+# Cambia cuando cambia el contenido del resumen; los resúmenes de otro formato se recalculan
+SUMMARY_FORMAT = 2
+
+
+def grid_shape(bin_size=DEFAULT_BIN_SIZE):
+    """Número de celdas (nx, ny) de la rejilla sobre la media cancha."""
+    nx = int(np.ceil((COURT_X_MAX - COURT_X_MIN) / bin_size))
+    ny = int(np.ceil((COURT_Y_MAX - COURT_Y_MIN) / bin_size))
+    return nx, ny
+
+
+def bin_centers(bin_size=DEFAULT_BIN_SIZE):
+    """Coordenadas de los centros de las celdas en X y en Y."""
+    nx, ny = grid_shape(bin_size)
+    x_centers = COURT_X_MIN + bin_size * (np.arange(nx) + 0.5)
+    y_centers = COURT_Y_MIN + bin_size * (np.arange(ny) + 0.5)
+    return x_centers, y_centers
+
+
+def bin_index(loc_x, loc_y, bin_size=DEFAULT_BIN_SIZE):
+    """
+    Índice lineal de celda (iy * nx + ix) para cada tiro, en O(n).
+    Los tiros fuera de la media cancha reciben -1.
+    """
+    nx, ny = grid_shape(bin_size)
+    ix = np.floor((np.asarray(loc_x, dtype=np.float64) - COURT_X_MIN) / bin_size).astype(np.int64)
+    iy = np.floor((np.asarray(loc_y, dtype=np.float64) - COURT_Y_MIN) / bin_size).astype(np.int64)
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    return np.where(inside, iy * nx + ix, -1)
+
+
+def grid_counts(loc_x, loc_y, bin_size=DEFAULT_BIN_SIZE, weights=None):
+    """Cuenta (o suma de pesos) por celda; devuelve una matriz (ny, nx) lista para un Heatmap."""
+    nx, ny = grid_shape(bin_size)
+    index = bin_index(loc_x, loc_y, bin_size)
+    inside = index >= 0
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[inside]
+    counts = np.bincount(index[inside], weights=weights, minlength=nx * ny)
+    return counts.reshape(ny, nx)
+
+
+def aggregate_shots(loc_x, loc_y, made, bin_size=DEFAULT_BIN_SIZE, min_attempts=1):
+    """
+    Intentos, anotados y FG% por celda en una sola pasada O(n).
+    Devuelve tres matrices (ny, nx); el FG% es NaN en las celdas con menos
+    de min_attempts intentos.
+    """
+    nx, ny = grid_shape(bin_size)
+    index = bin_index(loc_x, loc_y, bin_size)
+    inside = index >= 0
+    index = index[inside]
+    made = np.asarray(made, dtype=bool)[inside]
+
+    attempts = np.bincount(index, minlength=nx * ny).reshape(ny, nx)
+    makes = np.bincount(index[made], minlength=nx * ny).reshape(ny, nx)
+    fg_pct = fg_percentage(attempts, makes, min_attempts)
+    return attempts, makes, fg_pct
+
+
+def fg_percentage(attempts, makes, min_attempts=1):
+    """FG% por celda con enmascarado (NaN) de las celdas con muestra insuficiente."""
+    attempts = np.asarray(attempts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fg_pct = np.asarray(makes) / attempts
+    fg_pct[attempts < max(min_attempts, 1)] = np.nan
+    return fg_pct
+
+
+def summarize_shots(loc_x, loc_y, made, bin_sizes=SUMMARY_BIN_SIZES):
+    """
+    Resumen aditivo de un conjunto de tiros: intentos y anotados por zona oficial
+    (BASIC_ZONES) y por celda para cada tamaño de celda. Se guarda en el meta del ShotStore (JSON) y
+    se actualiza con merge_summaries sin volver a recorrer todos los tiros.
+    """
+    made = np.asarray(made, dtype=bool)
+    zone = basic_zone_codes(loc_x, loc_y)
+    summary = {
+        'format': SUMMARY_FORMAT,
+        'rows': int(len(made)),
+        'zones': {
+            'attempts': np.bincount(zone, minlength=len(BASIC_ZONES)).tolist(),
+            'makes': np.bincount(zone[made], minlength=len(BASIC_ZONES)).tolist(),
+        },
+        'bins': {},
+    }
+    for bin_size in bin_sizes:
+        attempts, makes, _ = aggregate_shots(loc_x, loc_y, made, bin_size)
+        summary['bins'][str(bin_size)] = {'attempts': attempts.ravel().tolist(), 'makes': makes.ravel().tolist()}
+    return summary
+
+
+def _combine(base, other, sign):
+    if isinstance(base, dict):
+        return {key: value if key == 'format' else _combine(value, other[key], sign)
+                for key, value in base.items()}
+    if isinstance(base, list):
+        return (np.asarray(base) + sign * np.asarray(other)).tolist()
+    return base + sign * other
+
+
+def merge_summaries(base, added=None, removed=None):
+    """Resumen de base + added - removed (los tres de summarize_shots con los mismos tamaños de celda)."""
+    if added is not None:
+        base = _combine(base, added, 1)
+    if removed is not None:
+        base = _combine(base, removed, -1)
+    return base
+
+
+def summary_matches(summary, rows):
+    """Indica si un resumen guardado es del formato actual y corresponde a rows filas."""
+    return summary is not None and summary.get('format') == SUMMARY_FORMAT and summary['rows'] == rows
+
+
+def summary_zones(summary):
+    """(intentos, anotados) por zona oficial (BASIC_ZONES) de un resumen."""
+    zones = summary['zones']
+    return np.asarray(zones['attempts']), np.asarray(zones['makes'])
+
+
+def summary_bins(summary, bin_size=DEFAULT_BIN_SIZE):
+    """(intentos, anotados) por celda como matrices (ny, nx); None si ese tamaño no está precalculado."""
+    bins = summary['bins'].get(str(bin_size))
+    if bins is None:
+        return None
+    nx, ny = grid_shape(bin_size)
+    return np.asarray(bins['attempts']).reshape(ny, nx), np.asarray(bins['makes']).reshape(ny, nx)
+
+
+def zone_fg_pct(summary):
+    """FG% por zona oficial de un resumen (NaN en las zonas sin intentos)."""
+    attempts, makes = summary_zones(summary)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return makes / attempts
+
+
+def baseline_fg_pct(summary, bin_size, min_attempts=1):
+    """
+    FG% de referencia por celda (matriz (ny, nx)) a partir del resumen de la liga:
+    el de la propia celda si tiene al menos min_attempts intentos y si no el de
+    la zona oficial de su centro. None si ese tamaño de celda no está en el resumen.
+    """
+    binned = summary_bins(summary, bin_size)
+    if binned is None:
+        return None
+    attempts, makes = binned
+    x_centers, y_centers = bin_centers(bin_size)
+    x, y = np.meshgrid(x_centers, y_centers)
+    by_zone = zone_fg_pct(summary)[basic_zone_codes(x.ravel(), y.ravel())].reshape(attempts.shape)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(attempts >= max(min_attempts, 1), makes / attempts, by_zone)
@@ -4,6 +4,9 @@ import dash
 import dash_bootstrap_components as dbc
 from layout import layout
 from callbacks import register_callbacks
+from background import background_manager
+from routes import register_routes
+from payload import write_court_asset
 import os
 
 # Añadir FontAwesome para los iconos
@@ -12,13 +15,22 @@ external_stylesheets = [
     "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"
 ]
 
-app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
+# Plantillas de la cancha para el navegador, regeneradas si cambió la geometría
+write_court_asset()
+
+# Los gráficos se generan en jobs en segundo plano para no bloquear los workers web
+app = dash.Dash(
+    __name__,
+    external_stylesheets=external_stylesheets,
+    background_callback_manager=background_manager
+)
 app.title = "🏀 NBA Shooting Chart"
 app.layout = layout
 register_callbacks(app)
 
 # Required for Render: Expose the Flask server
 server = app.server
+register_routes(server)
 
 if __name__ == "__main__":
     # Use environment variables for port and host
@@ -0,0 +1,32 @@
+// court_render.js
+// Dibuja la cancha en el navegador: el servidor solo envía trazas y estadísticas,
+// y la plantilla de la cancha llega una vez como asset estático (court_templates.js).
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    court: {
+        render: function (payload) {
+            if (!payload) {
+                return window.dash_clientside.no_update;
+            }
+            // Las figuras generadas llegan como el JSON cacheado (texto); el resto, como objeto
+            if (typeof payload === 'string') {
+                payload = JSON.parse(payload);
+            }
+            var layout = payload.layout || {};
+            var meta = layout.meta || {};
+            var base = window.COURT_TEMPLATES[meta.court_theme || 'light'];
+
+            // Una cancha por subplot (mismo algoritmo que charts.court_template)
+            var court = {shapes: [], plot_bgcolor: base.plot_bgcolor};
+            (meta.court_axes || ['']).forEach(function (suffix) {
+                base.shapes.forEach(function (shape) {
+                    court.shapes.push(suffix ? Object.assign({}, shape, {xref: 'x' + suffix, yref: 'y' + suffix}) : shape);
+                });
+                court['xaxis' + suffix] = Object.assign({}, base.xaxis, {scaleanchor: 'y' + suffix});
+                court['yaxis' + suffix] = base.yaxis;
+            });
+            // Copia profunda: Plotly modifica el layout que recibe
+            court = JSON.parse(JSON.stringify(court));
+            return {data: payload.data || [], layout: Object.assign(court, layout)};
+        }
+    }
+});
@@ -0,0 +1,2 @@
+// Generado por payload.write_court_asset a partir de charts.court_template; no editar.
+window.COURT_TEMPLATES = {"light":{"shapes":[{"line":{"color":"#E74C3C","width":4},"type":"circle","x0":-7.5,"x1":7.5,"xref":"x","y0":-7.5,"y1":7.5,"yref":"y"},{"fillcolor":"rgba(44, 62, 80, 0.1)","line":{"color":"#2C3E50","width":3},"type":"rect","x0":-30,"x1":30,"y0":-7.5,"y1":-8.5},{"fillcolor":"rgba(52, 152, 219, 0.05)","line":{"color":"#2C3E50","width":3},"type":"rect","x0":-80,"x1":80,"y0":-47.5,"y1":142.5},{"line":{"color":"#2C3E50","width":3},"type":"rect","x0":-60,"x1":60,"y0":-47.5,"y1":142.5},{"line":{"color":"#2C3E50","width":3},"path":"M 60 142.5 L 59.6 149 L 58.6 155.4 L 56.9 161.7 L 54.5 167.7 L 51.4 173.4 L 47.8 178.8 L 43.6 183.8 L 38.8 188.2 L 33.7 192.2 L 28.1 195.5 L 22.2 198.2 L 16.1 200.3 L 9.7 201.7 L 3.2 202.4 L -3.2 202.4 L -9.7 201.7 L -16.1 200.3 L -22.2 198.2 L -28.1 195.5 L -33.7 192.2 L -38.8 188.2 L -43.6 183.8 L -47.8 178.8 L -51.4 173.4 L -54.5 167.7 L -56.9 161.7 L -58.6 155.4 L -59.6 149 L -60 142.5","type":"path"},{"line":{"color":"#2C3E50","dash":"dash","width":3},"path":"M -60 142.5 L -59.6 136 L -58.6 129.6 L -56.9 123.3 L -54.5 117.3 L -51.4 111.6 L -47.8 106.2 L -43.6 101.2 L -38.8 96.8 L -33.7 92.8 L -28.1 89.5 L -22.2 86.8 L -16.1 84.7 L -9.7 83.3 L -3.2 82.6 L 3.2 82.6 L 9.7 83.3 L 16.1 84.7 L 22.2 86.8 L 28.1 89.5 L 33.7 92.8 L 38.8 96.8 L 43.6 101.2 L 47.8 106.2 L 51.4 111.6 L 54.5 117.3 L 56.9 123.3 L 58.6 129.6 L 59.6 136 L 60 142.5","type":"path"},{"line":{"color":"#2C3E50","width":3},"path":"M 40 0 L 39.5 6.6 L 37.8 13 L 35.2 19 L 31.6 24.6 L 27.1 29.4 L 21.9 33.5 L 16.1 36.6 L 9.8 38.8 L 3.3 39.9 L -3.3 39.9 L -9.8 38.8 L -16.1 36.6 L -21.9 33.5 L -27.1 29.4 L -31.6 24.6 L -35.2 19 L -37.8 13 L -39.5 6.6 L -40 0","type":"path"},{"line":{"color":"#E67E22","width":4},"type":"line","x0":-220,"x1":-220,"y0":-47.5,"y1":92.5},{"line":{"color":"#E67E22","width":4},"type":"line","x0":220,"x1":220,"y0":-47.5,"y1":92.5},{"line":{"color":"#E67E22","width":4},"path":"M 218.7 92.5 L 214.1 102.8 L 208.9 113 L 203.3 122.8 L 197.2 132.4 L 190.6 141.6 L 183.7 150.6 L 176.3 159.2 L 168.5 167.4 L 160.3 175.3 L 151.7 182.7 L 142.8 189.8 L 133.6 196.4 L 124 202.5 L 114.2 208.2 L 104.2 213.4 L 93.8 218.2 L 83.3 222.4 L 72.6 226.1 L 61.7 229.3 L 50.7 232 L 39.5 234.2 L 28.3 235.8 L 17 236.9 L 5.7 237.4 L -5.7 237.4 L -17 236.9 L -28.3 235.8 L -39.5 234.2 L -50.7 232 L -61.7 229.3 L -72.6 226.1 L -83.3 222.4 L -93.8 218.2 L -104.2 213.4 L -114.2 208.2 L -124 202.5 L -133.6 196.4 L -142.8 189.8 L -151.7 182.7 L -160.3 175.3 L -168.5 167.4 L -176.3 159.2 L -183.7 150.6 L -190.6 141.6 L -197.2 132.4 L -203.3 122.8 L -208.9 113 L -214.1 102.8 L -218.7 92.5","type":"path"},{"line":{"color":"#2C3E50","width":3},"path":"M -60 422.5 L -59.6 416 L -58.6 409.6 L -56.9 403.3 L -54.5 397.3 L -51.4 391.6 L -47.8 386.2 L -43.6 381.2 L -38.8 376.8 L -33.7 372.8 L -28.1 369.5 L -22.2 366.8 L -16.1 364.7 L -9.7 363.3 L -3.2 362.6 L 3.2 362.6 L 9.7 363.3 L 16.1 364.7 L 22.2 366.8 L 28.1 369.5 L 33.7 372.8 L 38.8 376.8 L 43.6 381.2 L 47.8 386.2 L 51.4 391.6 L 54.5 397.3 L 56.9 403.3 L 58.6 409.6 L 59.6 416 L 60 422.5","type":"path"},{"line":{"color":"#2C3E50","width":3},"path":"M -20 422.5 L -19.7 419.2 L -18.9 416 L -17.6 413 L -15.8 410.2 L -13.5 407.8 L -10.9 405.8 L -8 404.2 L -4.9 403.1 L -1.7 402.6 L 1.7 402.6 L 4.9 403.1 L 8 404.2 L 10.9 405.8 L 13.5 407.8 L 15.8 410.2 L 17.6 413 L 18.9 416 L 19.7 419.2 L 20 422.5","type":"path"},{"line":{"color":"#2C3E50","width":3},"type":"line","x0":-250,"x1":250,"y0":-47.5,"y1":-47.5},{"line":{"color":"#2C3E50","width":3},"type":"line","x0":-250,"x1":-250,"y0":-47.5,"y1":422.5},{"line":{"color":"#2C3E50","width":3},"type":"line","x0":250,"x1":250,"y0":-47.5,"y1":422.5}],"plot_bgcolor":"#F8F9FA","xaxis":{"constrain":"domain","range":[-260,260],"scaleanchor":"y","scaleratio":1,"visible":false},"yaxis":{"constrain":"domain","range":[-60,440],"visible":false}},"dark":{"shapes":[{"line":{"color":"#E74C3C","width":4},"type":"circle","x0":-7.5,"x1":7.5,"xref":"x","y0":-7.5,"y1":7.5,"yref":"y"},{"fillcolor":"rgba(236, 240, 241, 0.15)","line":{"color":"#ECF0F1","width":3},"type":"rect","x0":-30,"x1":30,"y0":-7.5,"y1":-8.5},{"fillcolor":"rgba(52, 152, 219, 0.12)","line":{"color":"#ECF0F1","width":3},"type":"rect","x0":-80,"x1":80,"y0":-47.5,"y1":142.5},{"line":{"color":"#ECF0F1","width":3},"type":"rect","x0":-60,"x1":60,"y0":-47.5,"y1":142.5},{"line":{"color":"#ECF0F1","width":3},"path":"M 60 142.5 L 59.6 149 L 58.6 155.4 L 56.9 161.7 L 54.5 167.7 L 51.4 173.4 L 47.8 178.8 L 43.6 183.8 L 38.8 188.2 L 33.7 192.2 L 28.1 195.5 L 22.2 198.2 L 16.1 200.3 L 9.7 201.7 L 3.2 202.4 L -3.2 202.4 L -9.7 201.7 L -16.1 200.3 L -22.2 198.2 L -28.1 195.5 L -33.7 192.2 L -38.8 188.2 L -43.6 183.8 L -47.8 178.8 L -51.4 173.4 L -54.5 167.7 L -56.9 161.7 L -58.6 155.4 L -59.6 149 L -60 142.5","type":"path"},{"line":{"color":"#ECF0F1","dash":"dash","width":3},"path":"M -60 142.5 L -59.6 136 L -58.6 129.6 L -56.9 123.3 L -54.5 117.3 L -51.4 111.6 L -47.8 106.2 L -43.6 101.2 L -38.8 96.8 L -33.7 92.8 L -28.1 89.5 L -22.2 86.8 L -16.1 84.7 L -9.7 83.3 L -3.2 82.6 L 3.2 82.6 L 9.7 83.3 L 16.1 84.7 L 22.2 86.8 L 28.1 89.5 L 33.7 92.8 L 38.8 96.8 L 43.6 101.2 L 47.8 106.2 L 51.4 111.6 L 54.5 117.3 L 56.9 123.3 L 58.6 129.6 L 59.6 136 L 60 142.5","type":"path"},{"line":{"color":"#ECF0F1","width":3},"path":"M 40 0 L 39.5 6.6 L 37.8 13 L 35.2 19 L 31.6 24.6 L 27.1 29.4 L 21.9 33.5 L 16.1 36.6 L 9.8 38.8 L 3.3 39.9 L -3.3 39.9 L -9.8 38.8 L -16.1 36.6 L -21.9 33.5 L -27.1 29.4 L -31.6 24.6 L -35.2 19 L -37.8 13 L -39.5 6.6 L -40 0","type":"path"},{"line":{"color":"#F39C12","width":4},"type":"line","x0":-220,"x1":-220,"y0":-47.5,"y1":92.5},{"line":{"color":"#F39C12","width":4},"type":"line","x0":220,"x1":220,"y0":-47.5,"y1":92.5},{"line":{"color":"#F39C12","width":4},"path":"M 218.7 92.5 L 214.1 102.8 L 208.9 113 L 203.3 122.8 L 197.2 132.4 L 190.6 141.6 L 183.7 150.6 L 176.3 159.2 L 168.5 167.4 L 160.3 175.3 L 151.7 182.7 L 142.8 189.8 L 133.6 196.4 L 124 202.5 L 114.2 208.2 L 104.2 213.4 L 93.8 218.2 L 83.3 222.4 L 72.6 226.1 L 61.7 229.3 L 50.7 232 L 39.5 234.2 L 28.3 235.8 L 17 236.9 L 5.7 237.4 L -5.7 237.4 L -17 236.9 L -28.3 235.8 L -39.5 234.2 L -50.7 232 L -61.7 229.3 L -72.6 226.1 L -83.3 222.4 L -93.8 218.2 L -104.2 213.4 L -114.2 208.2 L -124 202.5 L -133.6 196.4 L -142.8 189.8 L -151.7 182.7 L -160.3 175.3 L -168.5 167.4 L -176.3 159.2 L -183.7 150.6 L -190.6 141.6 L -197.2 132.4 L -203.3 122.8 L -208.9 113 L -214.1 102.8 L -218.7 92.5","type":"path"},{"line":{"color":"#ECF0F1","width":3},"path":"M -60 422.5 L -59.6 416 L -58.6 409.6 L -56.9 403.3 L -54.5 397.3 L -51.4 391.6 L -47.8 386.2 L -43.6 381.2 L -38.8 376.8 L -33.7 372.8 L -28.1 369.5 L -22.2 366.8 L -16.1 364.7 L -9.7 363.3 L -3.2 362.6 L 3.2 362.6 L 9.7 363.3 L 16.1 364.7 L 22.2 366.8 L 28.1 369.5 L 33.7 372.8 L 38.8 376.8 L 43.6 381.2 L 47.8 386.2 L 51.4 391.6 L 54.5 397.3 L 56.9 403.3 L 58.6 409.6 L 59.6 416 L 60 422.5","type":"path"},{"line":{"color":"#ECF0F1","width":3},"path":"M -20 422.5 L -19.7 419.2 L -18.9 416 L -17.6 413 L -15.8 410.2 L -13.5 407.8 L -10.9 405.8 L -8 404.2 L -4.9 403.1 L -1.7 402.6 L 1.7 402.6 L 4.9 403.1 L 8 404.2 L 10.9 405.8 L 13.5 407.8 L 15.8 410.2 L 17.6 413 L 18.9 416 L 19.7 419.2 L 20 422.5","type":"path"},{"line":{"color":"#ECF0F1","width":3},"type":"line","x0":-250,"x1":250,"y0":-47.5,"y1":-47.5},{"line":{"color":"#ECF0F1","width":3},"type":"line","x0":-250,"x1":-250,"y0":-47.5,"y1":422.5},{"line":{"color":"#ECF0F1","width":3},"type":"line","x0":250,"x1":250,"y0":-47.5,"y1":422.5}],"plot_bgcolor":"#1E2A38","xaxis":{"constrain":"domain","range":[-260,260],"scaleanchor":"y","scaleratio":1,"visible":false},"yaxis":{"constrain":"domain","range":[-60,440],"visible":false}}};
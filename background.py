@@ -0,0 +1,88 @@
+# background.py
+
+import os
+import time
+from functools import partial
+
+import flask
+from dash import DiskcacheManager
+
+from cache import CACHE_DIR, CURRENT_SEASON_TTL, ForkSafeCache
+from profiling import requested_mode, run_with_profile_mode
+
+# Caché compartida por los workers web y los procesos de los jobs
+JOB_CACHE_DIR = os.environ.get(
+    "CHART_JOB_CACHE_DIR",
+    os.path.join(os.path.dirname(CACHE_DIR), "jobs")
+)
+job_cache = ForkSafeCache(JOB_CACHE_DIR)
+
+
+# Un resultado no reutilizable solo se conserva este tiempo (s), para los sondeos en curso de su misma clave
+UNCACHED_RESULT_TTL = 10
+
+
+def cacheable(result):
+    """
+    Indica si el resultado de un job se puede servir a las siguientes peticiones:
+    no los errores (excepciones del job o figuras con layout.meta.error) ni las
+    figuras con datos vencidos (layout.meta.stale), que se vuelven a pedir.
+    """
+    if isinstance(result, str):
+        # JSON de la caché de figuras (ver callbacks.chart_data): ni errores ni datos vencidos
+        return True
+    if isinstance(result, dict):
+        if 'long_callback_error' in result:
+            return False
+        meta = (result.get('layout') or {}).get('meta')
+    else:
+        # go.Figure
+        meta = getattr(getattr(result, 'layout', None), 'meta', None)
+    meta = meta or {}
+    return not (meta.get('error') or meta.get('stale'))
+
+
+def freshness_window():
+    """Ventana de tiempo para que las figuras de la temporada en curso se regeneren con el TTL."""
+    return int(time.time() // CURRENT_SEASON_TTL)
+
+
+class CachedFirstManager(DiskcacheManager):
+    """
+    DiskcacheManager que no lanza un proceso si el resultado ya está cacheado:
+    el worker web sirve la figura directamente en el primer sondeo. Con una
+    cabecera X-Profile válida el job se ejecuta siempre, perfilado. Los errores
+    y los datos vencidos no se reutilizan: solo se invalida su propia clave.
+    """
+
+    # PID inexistente: Dash lo trata como un job terminado y no hay nada que matar
+    NO_JOB = -1
+
+    def call_job_fn(self, key, job_fn, args, context):
+        # El job corre en otro proceso, sin la petición: el modo se lee aquí y viaja con job_fn
+        mode = requested_mode(flask.request.headers) if flask.has_request_context() else None
+        if mode:
+            # Sin el resultado previo: si no, Dash lo serviría y terminaría el job perfilado
+            self.clear_cache_entry(key)
+            return super().call_job_fn(key, partial(run_with_profile_mode, mode, job_fn), args, context)
+        result = self.handle.get(key)
+        if result is not None:
+            if cacheable(result):
+                return self.NO_JOB
+            self.clear_cache_entry(key)
+        return super().call_job_fn(key, job_fn, args, context)
+
+    def get_result(self, key, job):
+        result = super().get_result(key, job)
+        if result is not self.UNDEFINED and not cacheable(result):
+            # La próxima petición con esta clave lanza un job nuevo (ver call_job_fn)
+            self.handle.touch(key, expire=UNCACHED_RESULT_TTL)
+        return result
+
+
+# Las figuras ya generadas se sirven directamente desde el worker web, sin lanzar un job
+background_manager = CachedFirstManager(
+    job_cache,
+    cache_by=[freshness_window],
+    expire=CURRENT_SEASON_TTL,
+)
@@ -0,0 +1,192 @@
+# baselines.py
+"""
+Promedios de la liga por zona oficial y por celda de cada temporada, para el
+gráfico de eficiencia relativa (FG% del jugador frente al de la liga).
+
+Cada temporada se guarda como un artefacto JSON de unos KB con el resumen
+aditivo (intentos y anotados) de todos los tiros de la liga. Las
+actualizaciones solo descargan los partidos desde la última fecha incluida.
+La app solo lee los artefactos (load_baseline): se construyen y actualizan con
+este script o con warm_cache.py --baselines, programados fuera de las peticiones.
+
+Uso:
+    python baselines.py --seasons 2024-25 2023-24
+    python baselines.py --seasons 2024-25 --full     # descarga completa en vez de incremental
+    python baselines.py --seasons 2024-25 --replay recordings/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from aggregation import summarize_shots, merge_summaries, SUMMARY_FORMAT
+from cache import CACHE_DIR, current_season
+from get_data import fetch_shots
+from singleflight import file_lock
+
+BASELINE_DIR = os.environ.get(
+    "BASELINE_DIR",
+    os.path.join(os.path.dirname(CACHE_DIR), "baselines")
+)
+# La temporada en curso se actualiza como mucho cada BASELINE_TTL segundos; las terminadas no caducan
+BASELINE_TTL = int(os.environ.get("BASELINE_TTL", 12 * 60 * 60))
+# Celdas de 2 pies, como el gráfico de eficiencia
+BASELINE_BIN_SIZE = 20
+# Cambia cuando cambia el contenido del artefacto; los de otro formato se reconstruyen
+BASELINE_FORMAT = 1
+
+# PlayerID y TeamID 0: ShotChartDetail devuelve los tiros de toda la liga
+LEAGUE_PLAYER_ID = 0
+LEAGUE_TEAM_ID = 0
+
+
+def baseline_path(season, directory=BASELINE_DIR):
+    return os.path.join(directory, f"league_{season}.json")
+
+
+def _summarize(shots, rows=None):
+    if rows is not None:
+        shots = shots.take(rows)
+    return summarize_shots(shots['loc_x'], shots['loc_y'], shots['made'], bin_sizes=(BASELINE_BIN_SIZE,))
+
+
+def _artifact(season, summary, tail, latest_game_date):
+    """
+    Artefacto de una temporada. tail es el resumen de los tiros del último día
+    incluido: se descuenta en la siguiente actualización, que vuelve a pedir ese
+    día completo (pudo haber partidos en juego).
+    """
+    digest = hashlib.sha1(json.dumps(summary, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return {
+        'format': BASELINE_FORMAT,
+        'season': season,
+        'bin_size': BASELINE_BIN_SIZE,
+        'latest_game_date': latest_game_date,
+        'version': digest,
+        'summary': summary,
+        'tail': tail,
+    }
+
+
+def build_baseline(season, endpoint=None):
+    """Descarga todos los tiros de la liga de la temporada y calcula el artefacto."""
+    shots = fetch_shots(LEAGUE_PLAYER_ID, LEAGUE_TEAM_ID, season, endpoint=endpoint)
+    if shots.empty:
+        return _artifact(season, _summarize(shots), _summarize(shots), None)
+    latest = int(shots['game_date'].max())
+    return _artifact(season, _summarize(shots), _summarize(shots, shots['game_date'] == latest), latest)
+
+
+def update_baseline(baseline, endpoint=None):
+    """Añade al artefacto los tiros desde su última fecha (incluida) sin volver a descargar la temporada."""
+    latest = baseline['latest_game_date']
+    if latest is None:
+        return build_baseline(baseline['season'], endpoint)
+    new = fetch_shots(LEAGUE_PLAYER_ID, LEAGUE_TEAM_ID, baseline['season'], endpoint=endpoint, date_from=latest)
+    if new.empty:
+        return baseline
+    new_latest = int(new['game_date'].max())
+    # El último día se reemplaza entero: se resta su contribución anterior y se suma la nueva
+    summary = merge_summaries(baseline['summary'], added=_summarize(new), removed=baseline['tail'])
+    return _artifact(baseline['season'], summary, _summarize(new, new['game_date'] == new_latest), new_latest)
+
+
+def save_baseline(baseline, directory=BASELINE_DIR):
+    """Escribe el artefacto de forma atómica."""
+    os.makedirs(directory, exist_ok=True)
+    path = baseline_path(baseline['season'], directory)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return path
+
+
+_loaded = {}
+
+
+def load_baseline(season, directory=BASELINE_DIR):
+    """
+    Artefacto de la temporada (o None si no existe o es de otro formato). Se
+    lee de disco solo cuando cambia el archivo; el resto de veces es un dict en memoria.
+    """
+    path = baseline_path(season, directory)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if baseline.get('format') != BASELINE_FORMAT or baseline['summary'].get('format') != SUMMARY_FORMAT:
+        baseline = None
+    _loaded[path] = (mtime, baseline)
+    return baseline
+
+
+def is_fresh(season, directory=BASELINE_DIR):
+    """Indica si el artefacto existe y no necesita actualizarse."""
+    try:
+        updated_at = os.stat(baseline_path(season, directory)).st_mtime
+    except FileNotFoundError:
+        return False
+    return season != current_season() or time.time() - updated_at <= BASELINE_TTL
+
+
+def refresh_baseline(season, full=False, endpoint=None, directory=BASELINE_DIR):
+    """
+    Actualiza (o construye) y guarda el artefacto si no está fresco; con full lo
+    reconstruye siempre. Un solo proceso a la vez por temporada.
+    """
+    with file_lock(('baseline', season)):
+        baseline = None if full else load_baseline(season, directory)
+        # Otro proceso pudo actualizarlo mientras se esperaba el lock
+        if baseline is not None and is_fresh(season, directory):
+            return baseline
+        if baseline is None:
+            baseline = build_baseline(season, endpoint)
+        else:
+            baseline = update_baseline(baseline, endpoint)
+        save_baseline(baseline, directory)
+    return baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precalcula los promedios de la liga por zona y celda.")
+    parser.add_argument('--seasons', nargs='+', required=True, help="Temporadas 'YYYY-YY'")
+    parser.add_argument('--full', action='store_true', help="Descarga completa aunque ya exista el artefacto")
+    parser.add_argument('--directory', default=BASELINE_DIR)
+    parser.add_argument('--replay', help="Directorio con respuestas grabadas (sin red)")
+    args = parser.parse_args(argv)
+
+    endpoint = None
+    if args.replay:
+        from replay import replay_endpoint
+        endpoint = replay_endpoint(args.replay)
+
+    failed = 0
+    for season in args.seasons:
+        start = time.perf_counter()
+        try:
+            baseline = refresh_baseline(season, args.full, endpoint, args.directory)
+        except Exception as e:
+            failed += 1
+            print(f"✗ {season}: {e}", file=sys.stderr)
+            continue
+        attempts = sum(baseline['summary']['zones']['attempts'])
+        size = os.path.getsize(baseline_path(season, args.directory))
+        print(f"✓ {season}: {attempts} tiros hasta {baseline['latest_game_date']} "
+              f"({size / 1024:.1f} KB, {time.perf_counter() - start:.1f} s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+# benchmarks/loadtest.py
+"""
+Prueba de carga del callback show_shooting_chart: lanza peticiones concurrentes
+con el mismo protocolo que el navegador (POST a /_dash-update-component y
+sondeo con cacheKey/job hasta la respuesta) y reporta throughput y percentiles
+de latencia.
+
+Uso (desde la raíz del repositorio):
+    # En proceso, con la fuente local (sin red) y una caché vacía
+    python -m benchmarks.loadtest --local --latency-ms 400 --error-rate 0.02 --fresh-cache \\
+        --concurrency 8 --requests 200
+    # Contra un servidor ya levantado (p. ej. gunicorn con DATA_SOURCE=local)
+    DATA_SOURCE=local gunicorn app:server -w 4 &
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --concurrency 16 --duration 60
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+CHART_OUTPUT = 'chart-data.data'
+PERCENTILES = (50, 90, 95, 99)
+DEFAULT_TIMEOUT = 120
+
+
+class HTTPClient:
+    """Cliente contra un servidor en marcha (una sesión de requests por hilo)."""
+
+    def __init__(self, url):
+        import requests
+        self.url = url.rstrip('/')
+        self._requests = requests
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, 'session'):
+            self._local.session = self._requests.Session()
+        return self._local.session
+
+    def get_json(self, path):
+        response = self.session.get(self.url + path, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def post(self, path, body):
+        response = self.session.post(self.url + path, json=body, timeout=DEFAULT_TIMEOUT)
+        return response.status_code, response.content
+
+
+class FlaskClient:
+    """Cliente en proceso sobre app.server (un test_client por hilo); los jobs corren en sus propios procesos."""
+
+    def __init__(self, server):
+        self.server = server
+        self._local = threading.local()
+
+    @property
+    def client(self):
+        if not hasattr(self._local, 'client'):
+            self._local.client = self.server.test_client()
+        return self._local.client
+
+    def get_json(self, path):
+        return self.client.get(path).get_json()
+
+    def post(self, path, body):
+        response = self.client.post(path, json=body)
+        return response.status_code, response.data
+
+
+def callback_spec(client):
+    """Dependencia del callback del gráfico tal como la ve el navegador."""
+    for dependency in client.get_json('/_dash-dependencies'):
+        if dependency['output'] == CHART_OUTPUT:
+            return dependency
+    raise RuntimeError(f"No hay un callback con la salida {CHART_OUTPUT}")
+
+
+def request_body(spec, n_clicks, players, team, seasons, view, compare):
+    """Cuerpo del POST para una selección (los mismos valores que mandaría el layout)."""
+    values = {
+        'generate-chart-btn.n_clicks': n_clicks,
+        'player-dropdown.value': players,
+        'team-dropdown.value': team,
+        'season-dropdown.value': seasons,
+        'view-dropdown.value': view,
+        'compare-dropdown.value': compare,
+    }
+
+    def props(items):
+        return [dict(item, value=values.get(f"{item['id']}.{item['property']}")) for item in items]
+
+    output_id, output_property = spec['output'].rsplit('.', 1)
+    return {
+        'output': spec['output'],
+        'outputs': {'id': output_id, 'property': output_property},
+        'inputs': props(spec['inputs']),
+        'state': props(spec['state']),
+        'changedPropIds': ['generate-chart-btn.n_clicks'],
+    }
+
+
+def run_request(client, spec, body, timeout=DEFAULT_TIMEOUT):
+    """
+    Ejecuta un callback en segundo plano hasta su respuesta. Devuelve
+    (segundos, resultado, sondeos); resultado es 'ok', 'stale' (copia en caché
+    por fallo de la fuente), 'error' (HTTP o gráfico de error), 'incomplete' o 'timeout'.
+    """
+    interval = (spec.get('long') or {}).get('interval', 500) / 1000
+    start = time.perf_counter()
+    path = '/_dash-update-component'
+    polls = 0
+    while True:
+        status, content = client.post(path, body)
+        if status == 204:
+            # PreventUpdate o job cancelado
+            return time.perf_counter() - start, 'error', polls
+        if status != 200:
+            return time.perf_counter() - start, 'error', polls
+        data = json.loads(content) if content else {}
+        if 'response' in data:
+            text = json.dumps(data['response'], ensure_ascii=False)
+            # Gráficos de error, de selección incompleta y de datos vencidos (ver callbacks)
+            outcome = ('error' if '❌' in text else 'incomplete' if '⚠️' in text
+                       else 'stale' if '⏳' in text else 'ok')
+            return time.perf_counter() - start, outcome, polls
+        if time.perf_counter() - start > timeout:
+            return time.perf_counter() - start, 'timeout', polls
+        if 'cacheKey' in data and '?' not in path:
+            path = f"/_dash-update-component?cacheKey={data['cacheKey']}&job={data['job']}"
+        polls += 1
+        time.sleep(interval)
+
+
+def build_selections(players, teams, seasons, views, compare):
+    """Selecciones a repartir entre las peticiones: cada jugador por separado con cada equipo, temporada y vista."""
+    return [([player], team, [season], view, compare)
+            for player in players for team in teams for season in seasons for view in views]
+
+
+def run_load(client, selections, concurrency=4, requests=100, duration=None, seed=0, timeout=DEFAULT_TIMEOUT):
+    """
+    Reparte las peticiones entre concurrency hilos hasta completar requests (o
+    hasta que pasen duration segundos). Devuelve la lista de (segundos, resultado, sondeos).
+    """
+    spec = callback_spec(client)
+    rng = random.Random(seed)
+    counter = itertools.count(1)
+    lock = threading.Lock()
+    results = []
+    deadline = time.monotonic() + duration if duration else None
+
+    def worker():
+        while True:
+            with lock:
+                n = next(counter)
+                if (deadline is None and n > requests) or (deadline is not None and time.monotonic() > deadline):
+                    return
+                selection = rng.choice(selections)
+            # n_clicks no forma parte de la clave de la caché: la misma selección reutiliza la figura
+            result = run_request(client, spec, request_body(spec, n, *selection), timeout)
+            with lock:
+                results.append(result)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return results
+
+
+def summarize(results, elapsed):
+    latencies = np.array([seconds for seconds, _, _ in results])
+    outcomes = {}
+    for _, outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    summary = {
+        'requests': len(results),
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(results) / elapsed, 3) if elapsed else 0.0,
+        'outcomes': outcomes,
+        # Resueltas en el primer sondeo: con la figura ya cacheada no se lanza un job
+        'first_poll': sum(1 for _, _, polls in results if polls <= 1),
+    }
+    if len(latencies):
+        summary['latency_ms'] = {f"p{p}": round(float(np.percentile(latencies, p)) * 1000, 1)
+                                 for p in PERCENTILES}
+        summary['latency_ms']['mean'] = round(float(latencies.mean()) * 1000, 1)
+        summary['latency_ms']['max'] = round(float(latencies.max()) * 1000, 1)
+    return summary
+
+
+def print_summary(summary):
+    print(f"Peticiones: {summary['requests']} en {summary['seconds']:.1f} s "
+          f"({summary['throughput_rps']:.2f} req/s)")
+    print("Resultados: " + ", ".join(f"{k}={v}" for k, v in sorted(summary['outcomes'].items())) +
+          f" | en el primer sondeo: {summary['first_poll']}")
+    if 'latency_ms' in summary:
+        print("Latencia (ms): " + " | ".join(f"{k} {v:.1f}" for k, v in summary['latency_ms'].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del callback del gráfico de tiros.")
+    parser.add_argument('--url', help="Servidor en marcha; sin --url se usa app.server en proceso")
+    parser.add_argument('--concurrency', type=int, default=4, help="Clientes simultáneos")
+    parser.add_argument('--requests', type=int, default=100, help="Total de peticiones")
+    parser.add_argument('--duration', type=float, help="En vez de --requests, lanzar peticiones durante N segundos")
+    parser.add_argument('--players', nargs='+', help="Jugadores (por defecto, los --distinct primeros activos)")
+    parser.add_argument('--distinct', type=int, default=20, help="Jugadores distintos si no se pasan --players")
+    parser.add_argument('--teams', nargs='+', help="Equipos (por defecto, el primero de la lista)")
+    parser.add_argument('--seasons', nargs='+', default=['2024-25'])
+    parser.add_argument('--views', nargs='+', default=['shots'], choices=['shots', 'efficiency', 'relative'])
+    parser.add_argument('--compare', default='side', choices=['side', 'overlay'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="Máximo por petición (s)")
+    parser.add_argument('--output', help="Escribe el resumen en este archivo JSON")
+    local = parser.add_argument_group("fuente local (solo en proceso)")
+    local.add_argument('--local', action='store_true', help="Usa LocalSource en lugar de stats.nba.com")
+    local.add_argument('--latency-ms', type=float, default=300)
+    local.add_argument('--jitter-ms', type=float, default=100)
+    local.add_argument('--error-rate', type=float, default=0.0)
+    local.add_argument('--shots', type=int, default=1500, help="Tiros sintéticos por combinación")
+    local.add_argument('--recordings', help="Grabaciones de replay.py a servir antes que las sintéticas")
+    local.add_argument('--fresh-cache', action='store_true', help="Cachés en un directorio temporal (arranque en frío)")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        client = HTTPClient(args.url)
+    else:
+        # Antes de importar la app: los módulos leen la configuración al importarse
+        if args.local:
+            os.environ.update({
+                'DATA_SOURCE': 'local',
+                'LOCAL_SOURCE_LATENCY_MS': str(args.latency_ms),
+                'LOCAL_SOURCE_JITTER_MS': str(args.jitter_ms),
+                'LOCAL_SOURCE_ERROR_RATE': str(args.error_rate),
+                'LOCAL_SOURCE_SHOTS': str(args.shots),
+                'LOCAL_SOURCE_DIR': args.recordings or '',
+            })
+        if args.fresh_cache:
+            os.environ['SHOT_CACHE_DIR'] = os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'shots')
+        from app import server
+        client = FlaskClient(server)
+
+    from get_data import get_players_list, get_teams_list
+    players = args.players or get_players_list()[:args.distinct]
+    teams = args.teams or get_teams_list()[:1]
+    selections = build_selections(players, teams, args.seasons, args.views, args.compare)
+    print(f"{len(selections)} selecciones, {args.concurrency} clientes", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = run_load(client, selections, args.concurrency, args.requests, args.duration,
+                       args.seed, args.timeout)
+    summary = summarize(results, time.perf_counter() - start)
+    print_summary(summary)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 1 if summary['outcomes'].get('timeout') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+# benchmarks/run.py
+"""
+Benchmarks offline del pipeline de gráficos: tiempo y memoria pico por etapa
+(parseo de la respuesta, ShotStore, zonas, cancha, gráficos y serialización),
+comparados con una línea base guardada.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run                          # tamaños por defecto, compara con baselines.json
+    python -m benchmarks.run --sizes 100 10000 5000000 --stages zones shot_chart
+    python -m benchmarks.run --save-baseline          # guarda los resultados como nueva línea base
+
+Los datasets son sintéticos (benchmarks/synthetic.py) más las respuestas
+grabadas de ShotChartDetail que haya en benchmarks/fixtures, que se reproducen
+sin red. Para grabar nuevas:
+    python warm_cache.py --seasons 2024-25 --players "Luka Dončić" --record benchmarks/fixtures
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from charts import court_figure, plot_efficiency_chart, plot_shot_chart
+from payload import client_figure
+from plotly.utils import PlotlyJSONEncoder
+from replay import recording_name, replay_endpoint
+from shot_store import ShotStore
+from zones import classify_shots
+
+from benchmarks.synthetic import generate_shots, synthetic_response
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baselines.json')
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+# Por encima de este tamaño (una temporada de toda la liga) se omiten las etapas
+# que pasan por la respuesta JSON y el DataFrame completos
+MAX_PARSE_SHOTS = 250_000
+
+# Una etapa es más lenta (o usa más memoria) que la línea base si supera el umbral
+# relativo y además la diferencia absoluta supera el ruido de medición
+DEFAULT_THRESHOLD = 0.25
+MIN_TIME_DELTA_MS = 2.0
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+class Dataset:
+    """Un conjunto de tiros; cada representación se calcula una vez y fuera de las mediciones."""
+
+    def __init__(self, name, response_dir, params, store=None):
+        self.name = name
+        self.response_dir = response_dir
+        self.params = params
+        self._store = store
+        self._frame = None
+        self._figure = None
+
+    def endpoint(self):
+        player_id, team_id, season, context = self.params
+        return replay_endpoint(self.response_dir)(
+            team_id=team_id, player_id=player_id,
+            season_nullable=season, context_measure_simple=context,
+        )
+
+    def frame(self):
+        if self._frame is None:
+            self._frame = self.endpoint().shot_chart_detail.get_data_frame()
+        return self._frame
+
+    def store(self):
+        if self._store is None:
+            self._store = ShotStore.from_frame(self.frame())
+        return self._store
+
+    def figure(self):
+        if self._figure is None:
+            self._figure = plot_shot_chart(self.store())
+        return self._figure
+
+    def __len__(self):
+        return len(self.store())
+
+
+def synthetic_dataset(n, workdir, seed=0):
+    """Dataset sintético; la respuesta JSON se escribe solo si n permite las etapas de parseo."""
+    params = (0, 0, f'synthetic-{n}', 'FGA')
+    if n <= MAX_PARSE_SHOTS:
+        with open(os.path.join(workdir, recording_name(*params)), 'w', encoding='utf-8') as f:
+            f.write(synthetic_response(n, seed))
+    return Dataset(f'synthetic-{n}', workdir, params, store=generate_shots(n, seed))
+
+
+def recorded_datasets(directory=FIXTURES_DIR):
+    """Datasets a partir de las respuestas grabadas ({player}_{team}_{season}_{context}.json)."""
+    datasets = []
+    if not os.path.isdir(directory):
+        return datasets
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.json'):
+            continue
+        player_id, team_id, season, context = filename[:-len('.json')].split('_')
+        datasets.append(Dataset(f'recorded-{filename[:-5]}', directory,
+                                (int(player_id), int(team_id), season, context)))
+    return datasets
+
+
+# Cada etapa prepara sus entradas (sin medir) y devuelve la función a medir
+def stage_parse(dataset):
+    return lambda: dataset.endpoint().shot_chart_detail.get_data_frame()
+
+def stage_store(dataset):
+    frame = dataset.frame()
+    return lambda: ShotStore.from_frame(frame)
+
+def stage_zones(dataset):
+    store = dataset.store()
+    return lambda: classify_shots(store['loc_x'], store['loc_y'])
+
+def stage_court(dataset):
+    # Lo que cuesta la cancha en cada petición: court_figure ya trae las shapes
+    return court_figure
+
+def stage_shot_chart(dataset):
+    store = dataset.store()
+    return lambda: plot_shot_chart(store)
+
+def stage_efficiency_chart(dataset):
+    store = dataset.store()
+    return lambda: plot_efficiency_chart(store)
+
+def stage_serialize(dataset):
+    fig = dataset.figure()
+    return lambda: json.dumps(client_figure(fig), cls=PlotlyJSONEncoder, separators=(',', ':'))
+
+
+STAGES = {
+    'parse': stage_parse,
+    'store': stage_store,
+    'zones': stage_zones,
+    'court': stage_court,
+    'shot_chart': stage_shot_chart,
+    'efficiency_chart': stage_efficiency_chart,
+    'serialize': stage_serialize,
+}
+PARSE_STAGES = ('parse', 'store')
+
+
+def measure(fn, repeat):
+    """Mediana del tiempo (ms) de repeat ejecuciones y memoria pico (MB) de una ejecución adicional."""
+    fn()  # Calentamiento (imports, cachés)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    # La memoria se mide aparte: tracemalloc ralentiza la ejecución
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'time_ms': round(statistics.median(times), 3), 'peak_mb': round(peak / 2**20, 3)}
+
+
+def run(datasets, stages, repeat):
+    results = {}
+    for dataset in datasets:
+        for stage in stages:
+            if stage in PARSE_STAGES and not os.path.exists(
+                    os.path.join(dataset.response_dir, recording_name(*dataset.params))):
+                continue
+            fn = STAGES[stage](dataset)
+            # Menos repeticiones en los datasets grandes
+            result = measure(fn, repeat if len(dataset) <= 100_000 else max(1, repeat // 3))
+            results[f'{dataset.name}/{stage}'] = result
+            print(f"{dataset.name:>28} {stage:>17} {result['time_ms']:>11.2f} ms "
+                  f"{result['peak_mb']:>10.2f} MB", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Lista de regresiones frente a la línea base (solo para las entradas presentes en ambas)."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, min_delta in (('time_ms', MIN_TIME_DELTA_MS), ('peak_mb', MIN_MEMORY_DELTA_MB)):
+            current, reference = result[metric], base[metric]
+            if current > reference * (1 + threshold) and current - reference > min_delta:
+                regressions.append(f"{key} {metric}: {reference:.2f} -> {current:.2f} "
+                                   f"(+{(current / reference - 1) * 100 if reference else float('inf'):.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline de gráficos de tiro.")
+    parser.add_argument('--sizes', nargs='*', type=int, default=DEFAULT_SIZES,
+                        help="Cantidades de tiros sintéticos (de 100 a 5M)")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="Respuestas grabadas de ShotChartDetail")
+    parser.add_argument('--no-fixtures', action='store_true', help="Solo datasets sintéticos")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Guarda (y fusiona) los resultados como línea base")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Regresión relativa máxima permitida (0.25 = 25%%)")
+    parser.add_argument('--output', help="Escribe los resultados en este archivo JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        datasets = [synthetic_dataset(n, workdir, args.seed) for n in args.sizes]
+        if not args.no_fixtures:
+            datasets += recorded_datasets(args.fixtures)
+        results = run(datasets, args.stages, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Línea base guardada en {args.baseline}", file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESIÓN {regression}", file=sys.stderr)
+    print(f"{len(results)} mediciones, {len(regressions)} regresiones "
+          f"(umbral {args.threshold:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# benchmarks/synthetic.py
+"""
+Generador de tiros sintéticos con distribuciones realistas de LOC_X/LOC_Y
+(coordenadas en décimas de pie, canasta en (0, 0)).
+"""
+
+import json
+
+import numpy as np
+
+from shot_store import CATEGORICAL_COLUMNS, CODE_DTYPE, FRAME_COLUMNS, ShotStore
+
+# Tipos de tiro: (probabilidad, FG%) aproximados a una temporada NBA reciente
+SHOT_MIX = {
+    'rim': (0.30, 0.65),
+    'paint': (0.12, 0.43),
+    'mid_range': (0.14, 0.41),
+    'corner_three': (0.10, 0.39),
+    'above_break_three': (0.325, 0.35),
+    'heave': (0.015, 0.04),
+}
+
+ZONE_LABELS = {
+    'rim': ('Restricted Area', 'Less Than 8 ft.', '2PT Field Goal'),
+    'paint': ('In The Paint (Non-RA)', '8-16 ft.', '2PT Field Goal'),
+    'mid_range': ('Mid-Range', '16-24 ft.', '2PT Field Goal'),
+    'corner_three': ('Corner 3', '24+ ft.', '3PT Field Goal'),
+    'above_break_three': ('Above the Break 3', '24+ ft.', '3PT Field Goal'),
+    'heave': ('Backcourt', 'Back Court Shot', '3PT Field Goal'),
+}
+
+ACTION_TYPES = {
+    'rim': ['Layup Shot', 'Driving Layup Shot', 'Dunk Shot', 'Tip Layup Shot', 'Cutting Dunk Shot'],
+    'paint': ['Floating Jump shot', 'Driving Floating Jump Shot', 'Turnaround Hook Shot'],
+    'mid_range': ['Jump Shot', 'Pullup Jump shot', 'Turnaround Fadeaway shot'],
+    'corner_three': ['Jump Shot'],
+    'above_break_three': ['Jump Shot', 'Pullup Jump shot', 'Step Back Jump shot'],
+    'heave': ['Jump Shot'],
+}
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL',
+         'MEM', 'MIA', 'MIL', 'MIN', 'NOP', 'NYK', 'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR',
+         'UTA', 'WAS']
+
+SHOTS_PER_GAME = 18
+SEASON_DAYS = 170
+
+
+def _polar(rng, n, r_low, r_high, max_angle):
+    """Puntos con radio uniforme y ángulo (desde el eje Y) uniforme en ±max_angle grados."""
+    r = rng.uniform(r_low, r_high, n)
+    theta = np.radians(rng.uniform(-max_angle, max_angle, n))
+    return r * np.sin(theta), r * np.cos(theta)
+
+
+def _locations(rng, kind, n):
+    if kind == 'rim':
+        x, y = rng.normal(0, 18, n), np.abs(rng.normal(0, 22, n)) - 5
+    elif kind == 'paint':
+        x, y = _polar(rng, n, 40, 140, 75)
+    elif kind == 'mid_range':
+        x, y = _polar(rng, n, 140, 230, 80)
+    elif kind == 'corner_three':
+        x = rng.choice([-1, 1], n) * rng.uniform(221, 236, n)
+        y = rng.uniform(-40, 88, n)
+    elif kind == 'above_break_three':
+        # La mayoría justo detrás de la línea, con una cola de tiros lejanos
+        x, y = _polar(rng, n, 1, 1, 67)
+        r = 238 + rng.exponential(12, n)
+        x, y = x * r, y * r
+    else:
+        x, y = _polar(rng, n, 320, 420, 30)
+    return np.clip(np.rint(x), -250, 250), np.clip(np.rint(y), -47, 420)
+
+
+def _area(loc_x, loc_y):
+    """SHOT_ZONE_AREA según el ángulo respecto a la canasta (LOC_X negativo es el lado derecho)."""
+    angle = np.degrees(np.arctan2(loc_x, np.maximum(loc_y, 0)))
+    labels = np.array(['Right Side(R)', 'Right Side Center(RC)', 'Center(C)',
+                       'Left Side Center(LC)', 'Left Side(L)'])
+    return labels[np.digitize(angle, [-67.5, -22.5, 22.5, 67.5])]
+
+
+def generate_shots(n, seed=0, players=1):
+    """
+    ShotStore con n tiros sintéticos: mezcla de tipos de tiro según SHOT_MIX,
+    FG% por tipo y el resto de columnas (partidos, periodos, equipos) plausibles.
+    """
+    rng = np.random.default_rng(seed)
+    kinds = list(SHOT_MIX)
+    weights = np.array([SHOT_MIX[k][0] for k in kinds])
+    kind = rng.choice(len(kinds), n, p=weights / weights.sum())
+
+    loc_x = np.zeros(n, dtype=np.int16)
+    loc_y = np.zeros(n, dtype=np.int16)
+    made = np.zeros(n, dtype=np.bool_)
+    strings = []
+    string_ids = {}
+
+    def code(value):
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    categorical = {name: np.full(n, -1, dtype=CODE_DTYPE) for name in CATEGORICAL_COLUMNS}
+    for k, name in enumerate(kinds):
+        rows = np.flatnonzero(kind == k)
+        x, y = _locations(rng, name, len(rows))
+        loc_x[rows], loc_y[rows] = x, y
+        made[rows] = rng.random(len(rows)) < SHOT_MIX[name][1]
+
+        zone_basic, zone_range, shot_type = ZONE_LABELS[name]
+        if name == 'corner_three':
+            categorical['zone_basic'][rows] = np.where(x < 0, code('Right Corner 3'), code('Left Corner 3'))
+        else:
+            categorical['zone_basic'][rows] = code(zone_basic)
+        categorical['zone_range'][rows] = code(zone_range)
+        categorical['shot_type'][rows] = code(shot_type)
+        actions = np.array([code(a) for a in ACTION_TYPES[name]], dtype=CODE_DTYPE)
+        categorical['action_type'][rows] = actions[rng.integers(0, len(actions), len(rows))]
+
+    areas, area_index = np.unique(_area(loc_x, loc_y), return_inverse=True)
+    categorical['zone_area'] = np.array([code(a) for a in areas], dtype=CODE_DTYPE)[area_index]
+
+    player = rng.integers(0, players, n)
+    team = player % len(TEAMS)
+    opponent = (team + 1 + rng.integers(0, len(TEAMS) - 1, n)) % len(TEAMS)
+    team_codes = np.array([code(t) for t in TEAMS], dtype=CODE_DTYPE)
+    categorical['player_name'] = np.array([code(f"Synthetic Player {i}") for i in range(players)],
+                                          dtype=CODE_DTYPE)[player]
+    categorical['team_name'] = np.array([code(f"Synthetic {t}") for t in TEAMS], dtype=CODE_DTYPE)[team]
+    home = rng.random(n) < 0.5
+    categorical['home_team'] = np.where(home, team_codes[team], team_codes[opponent])
+    categorical['away_team'] = np.where(home, team_codes[opponent], team_codes[team])
+
+    # Tiros ordenados por partido, como en las respuestas de ShotChartDetail
+    game = np.sort(rng.integers(0, max(n // SHOTS_PER_GAME, 1), n))
+    season_days = np.datetime64('2024-10-22') + np.arange(SEASON_DAYS)
+    dates = np.array([d.replace('-', '') for d in np.datetime_as_string(season_days)], dtype=np.int32)
+    columns = {
+        'game_id': (22400001 + game).astype(np.int32),
+        'game_event_id': (np.arange(n) % 500 * 2 + 7).astype(np.int32),
+        'game_date': dates[game * SEASON_DAYS // max(n // SHOTS_PER_GAME, 1)],
+        'player_id': (1630000 + player).astype(np.int32),
+        'team_id': (1610612737 + team).astype(np.int32),
+        'period': rng.choice([1, 2, 3, 4, 5], n, p=[0.25, 0.25, 0.25, 0.24, 0.01]).astype(np.int8),
+        'minutes_remaining': rng.integers(0, 12, n).astype(np.int8),
+        'seconds_remaining': rng.integers(0, 60, n).astype(np.int8),
+        'loc_x': loc_x,
+        'loc_y': loc_y,
+        'made': made,
+    }
+    columns.update(categorical)
+    return ShotStore(columns, strings, {'synthetic': True, 'seed': seed})
+
+
+def synthetic_frame(n, seed=0, players=1):
+    """DataFrame con las columnas de ShotChartDetail."""
+    return generate_shots(n, seed, players).to_frame()
+
+
+def synthetic_response(n, seed=0, players=1):
+    """Texto JSON con el mismo formato que la respuesta de stats.nba.com para ShotChartDetail."""
+    frame = synthetic_frame(n, seed, players)
+    rows = frame.astype(object).values.tolist()
+    return json.dumps({
+        'resource': 'shotchartdetail',
+        'parameters': {},
+        'resultSets': [
+            {'name': 'Shot_Chart_Detail', 'headers': FRAME_COLUMNS, 'rowSet': rows},
+            {'name': 'LeagueAverages', 'headers': ['GRID_TYPE'], 'rowSet': []},
+        ],
+    })
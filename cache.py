@@ -0,0 +1,190 @@
+# cache.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+import diskcache
+
+from shot_store import ShotStore
+
+# Directorio de la caché (persiste entre reinicios de gunicorn)
+CACHE_DIR = os.environ.get(
+    "SHOT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "shots")
+)
+
+# TTL en segundos: temporada en curso corto, temporadas terminadas sin expiración
+CURRENT_SEASON_TTL = int(os.environ.get("SHOT_CACHE_CURRENT_TTL", 15 * 60))
+COMPLETED_SEASON_TTL = (int(os.environ["SHOT_CACHE_COMPLETED_TTL"])
+                        if os.environ.get("SHOT_CACHE_COMPLETED_TTL") else None)
+
+# Tamaño máximo total antes de expulsar entradas (LRU)
+MAX_CACHE_BYTES = int(os.environ.get("SHOT_CACHE_MAX_MB", 512)) * 1024 * 1024
+
+
+def current_season(today=None):
+    """Devuelve la temporada en curso en formato 'YYYY-YY'."""
+    today = today or date.today()
+    start = today.year if today.month >= 10 else today.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+class ShotCache:
+    """
+    Caché en disco de los tiros de ShotChartDetail en el formato columnar de
+    ShotStore (se leen con memory-map, sin copiar). Cada entrada es un archivo; el mtime marca cuándo se descargó y el atime
+    (actualizado explícitamente en cada lectura) el último acceso para el LRU.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES,
+                 current_ttl=CURRENT_SEASON_TTL, completed_ttl=COMPLETED_SEASON_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.current_ttl = current_ttl
+        self.completed_ttl = completed_ttl
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, player_id, team_id, season, context):
+        return os.path.join(self.directory, f"{player_id}_{team_id}_{season}_{context}.shots")
+
+    def ttl_for(self, season):
+        """TTL aplicable a una temporada (None = sin expiración)."""
+        if season == current_season():
+            return self.current_ttl
+        return self.completed_ttl
+
+    def _fresh_mtime(self, path, season, stale=False):
+        """mtime de la entrada si existe y no expiró (o aunque expiró con stale); None en caso contrario."""
+        try:
+            fetched_at = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+
+        ttl = self.ttl_for(season)
+        if not stale and ttl is not None and time.time() - fetched_at > ttl:
+            return None
+        return fetched_at
+
+    def contains(self, player_id, team_id, season, context):
+        """Indica si hay una entrada fresca sin leerla ni marcar el acceso."""
+        path = self._path(player_id, team_id, season, context)
+        return self._fresh_mtime(path, season) is not None
+
+    def get(self, player_id, team_id, season, context, stale=False):
+        """
+        Devuelve el ShotStore cacheado o None si no existe o expiró. Con stale=True
+        devuelve también las entradas expiradas (base de la actualización incremental).
+        """
+        path = self._path(player_id, team_id, season, context)
+        fetched_at = self._fresh_mtime(path, season, stale)
+        if fetched_at is None:
+            return None
+
+        try:
+            data = ShotStore.load(path)
+        except (OSError, ValueError):
+            # Entrada corrupta o borrada por otro worker: tratar como fallo
+            return None
+
+        # Marcar el acceso para el LRU conservando la fecha de descarga
+        try:
+            os.utime(path, (time.time(), fetched_at))
+        except OSError:
+            pass
+        return data
+
+    def set(self, player_id, team_id, season, context, data):
+        """Guarda un ShotStore de forma atómica y aplica la expulsión LRU."""
+        data.save(self._path(player_id, team_id, season, context))
+        self.evict()
+
+    def evict(self):
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".shots"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+shot_cache = ShotCache()
+
+
+# Ningún hilo está dentro de SQLite mientras el proceso hace fork (ver ForkSafeCache)
+_sqlite_lock = threading.RLock()
+
+
+def _reset_sqlite_lock():
+    global _sqlite_lock
+    _sqlite_lock = threading.RLock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=lambda: _sqlite_lock.acquire(),
+                        after_in_parent=lambda: _sqlite_lock.release(),
+                        after_in_child=_reset_sqlite_lock)
+
+
+class _LockedConnection:
+    """Conexión de SQLite cuyas sentencias se ejecutan (y leen completas) bajo _sqlite_lock."""
+
+    def __init__(self, con):
+        self._raw = con
+
+    def execute(self, *args):
+        with _sqlite_lock:
+            return _Rows(self._raw.execute(*args).fetchall())
+
+    def close(self):
+        with _sqlite_lock:
+            self._raw.close()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class _Rows(list):
+    def fetchall(self):
+        return self
+
+
+class ForkSafeCache(diskcache.Cache):
+    """
+    diskcache.Cache que se puede usar desde varios hilos de un proceso que hace
+    fork (los jobs de Dash se lanzan desde los hilos de gunicorn). Si un hilo
+    está dentro de SQLite durante el fork, el hijo hereda sus mutex tomados y se
+    bloquea al cerrar la conexión heredada; aquí el fork espera a que ningún
+    hilo esté ejecutando una sentencia ni una transacción.
+    """
+
+    @property
+    def _con(self):
+        with _sqlite_lock:
+            return _LockedConnection(diskcache.Cache._con.fget(self))
+
+    @contextmanager
+    def _transact(self, retry=False, filename=None):
+        with _sqlite_lock, super()._transact(retry, filename) as txn:
+            yield txn
@@ -1,74 +1,329 @@
-from get_data import get_player_id, get_team_id, get_shooting_chart_data
-from charts import plot_shot_chart
-from dash import Input, Output, State
-import plotly.graph_objects as go
+import json
+from get_data import (get_player_id, get_team_id, get_shooting_chart_data, get_cached_chart_data, get_comparison_data,
+                      player_index)
+from name_index import as_option
+from charts import (plot_shot_chart, plot_efficiency_chart, plot_relative_chart, plot_comparison_chart,
+                    create_error_chart, MAX_COMPARE_SERIES)
+from baselines import load_baseline
+from figure_cache import figure_cache
+from metrics import metrics
+from profiling import profiled
+from shot_index import normalize_filters, filter_key, filter_shots, shot_index, PERIOD_LABELS
+from payload import client_figure, empty_chart_payload, PAYLOAD_FORMAT
+from dash import ClientsideFunction, Input, Output, State
+from dash.exceptions import PreventUpdate
+from plotly.utils import PlotlyJSONEncoder
+
+# Controles de los filtros (ver shot_index.normalize_filters), en el orden de sus argumentos
+FILTER_CONTROLS = [
+    ('period-filter', 'value'),
+    ('clutch-filter', 'value'),
+    ('action-filter', 'value'),
+    ('opponent-filter', 'value'),
+    ('date-filter', 'start_date'),
+    ('date-filter', 'end_date'),
+]
 
 def register_callbacks(app):
+    # La cancha se dibuja en el navegador a partir del asset estático (assets/court_render.js)
+    app.clientside_callback(
+        ClientsideFunction(namespace='court', function_name='render'),
+        Output('shot-chart', 'figure'),
+        Input('chart-data', 'data')
+    )
+
+    @app.callback(
+        Output('player-dropdown', 'options'),
+        Input('player-dropdown', 'search_value'),
+        State('player-dropdown', 'value')
+    )
+    def search_players(search_value, value):
+        # Sin texto de búsqueda se conservan las opciones actuales
+        if not search_value:
+            raise PreventUpdate
+        
+        names = player_index().search(search_value)
+        # Mantener la selección actual (uno o varios jugadores) entre las opciones para no perderla
+        names += [name for name in as_list(value) if name not in names]
+        return [as_option(name) for name in names]
+
     @app.callback(
-        Output("shot-chart", 'figure'),
+        Output("chart-data", 'data'),
         [Input("generate-chart-btn", "n_clicks")],
         [
             State('player-dropdown', 'value'),
             State('team-dropdown', 'value'),
-            State('season-dropdown', 'value')
-        ]
+            State('season-dropdown', 'value'),
+            State('view-dropdown', 'value'),
+            State('compare-dropdown', 'value')
+        ] + [State(component, prop) for component, prop in FILTER_CONTROLS],
+        background=True,
+        interval=500,
+        progress=Output("chart-progress", "children"),
+        running=[(Output("generate-chart-btn", "disabled"), True, False)],
+        # Cambiar la selección cancela el job en curso
+        cancel=[
+            Input('player-dropdown', 'value'),
+            Input('team-dropdown', 'value'),
+            Input('season-dropdown', 'value'),
+            Input('view-dropdown', 'value'),
+            Input('compare-dropdown', 'value')
+        ],
+        # n_clicks no forma parte de la clave: la misma selección reutiliza la figura cacheada
+        cache_args_to_ignore=[0],
+        prevent_initial_call=True
     )
-    def show_shooting_chart(n_clicks, player, team, season):
-        # Si no se ha hecho clic en el botón, mostrar gráfico vacío
-        if not n_clicks:
-            return create_empty_chart()
-        
-        # Validar que todos los campos estén seleccionados
-        if not all([player, team, season]):
-            return create_empty_chart("⚠️ Por favor, selecciona jugador, equipo y temporada")
+    def show_shooting_chart(set_progress, n_clicks, players, team, seasons, view, compare, *filter_values):
+        players = as_list(players)
+        seasons = as_list(seasons)
+        comparing = len(players) > 1 or len(seasons) > 1
+        view = f'compare-{compare}' if comparing else view
+        # Validar que todos los campos estén seleccionados (en una comparación el equipo es opcional)
+        if not players or not seasons or not (team or comparing):
+            metrics.inc('chart_requests_total', view=view, outcome='incomplete')
+            return empty_chart_payload("⚠️ Por favor, selecciona jugador, equipo y temporada")
         
         try:
-            player_id = get_player_id(player)
-            team_id = get_team_id(team)
-            data = get_shooting_chart_data(player_id, team_id, season)
-            fig = plot_shot_chart(data)
-            return fig
+            # Perfilado opcional (PROFILE_MODE con muestreo 1 de N, o cabecera X-Profile)
+            with profiled(dict(player=players, team=team, season=seasons, view=view)), metrics.timed('total'):
+                chart = selection_chart(players, team, seasons, view, compare, normalize_filters(*filter_values),
+                                        set_progress)
+            # Solo las figuras con datos vencidos llegan como dict (ver chart_data): no se reutilizan
+            stale = isinstance(chart, dict) and chart['layout'].get('meta', {}).get('stale', False)
+            metrics.inc('chart_requests_total', view=view, outcome='stale' if stale else 'ok')
+            return chart
         except Exception as e:
-            return create_error_chart(f"Error al cargar datos: {str(e)}")
+            metrics.inc('chart_requests_total', view=view, outcome='error')
+            # create_error_chart marca layout.meta.error: el error no queda cacheado
+            return client_figure(create_error_chart(f"Error al cargar datos: {str(e)}"))
+        finally:
+            set_progress("")
+            # El proceso del job termina al devolver: volcar sus métricas ya
+            metrics.flush()
 
-def create_empty_chart(message="🏀 Haz clic en 'Generar Gráfico' para comenzar"):
-    """Crea un gráfico vacío con mensaje"""
-    fig = go.Figure()
-    fig.add_annotation(
-        text=message,
-        xref="paper", yref="paper",
-        x=0.5, y=0.5,
-        xanchor='center', yanchor='middle',
-        font=dict(size=20, color="#667eea"),
-        showarrow=False
+    @app.callback(
+        Output("chart-data", 'data', allow_duplicate=True),
+        [Input(component, prop) for component, prop in FILTER_CONTROLS],
+        [
+            State('player-dropdown', 'value'),
+            State('team-dropdown', 'value'),
+            State('season-dropdown', 'value'),
+            State('view-dropdown', 'value'),
+            State('compare-dropdown', 'value')
+        ],
+        prevent_initial_call=True
     )
-    fig.update_layout(
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        height=600,
-        margin=dict(l=0, r=0, t=50, b=0)
+    def filter_shooting_chart(*values):
+        """
+        Aplica los filtros sobre los tiros ya cacheados en el propio worker web:
+        sin job en segundo plano y sin llamar a stats.nba.com.
+        """
+        filter_values = values[:len(FILTER_CONTROLS)]
+        players, team, seasons, view, compare = values[len(FILTER_CONTROLS):]
+        players = as_list(players)
+        seasons = as_list(seasons)
+        comparing = len(players) > 1 or len(seasons) > 1
+        if not players or not seasons or not (team or comparing):
+            raise PreventUpdate
+        try:
+            with metrics.timed('filter'):
+                chart = selection_chart(players, team, seasons, view, compare, normalize_filters(*filter_values),
+                                        cached_only=True)
+        except LookupError:
+            # La selección todavía no se generó: los filtros se aplicarán al pulsar el botón
+            raise PreventUpdate
+        metrics.inc('chart_requests_total', view=f'compare-{compare}' if comparing else view, outcome='filtered')
+        return chart
+
+    @app.callback(
+        [
+            Output('period-filter', 'options'),
+            Output('action-filter', 'options'),
+            Output('opponent-filter', 'options'),
+            Output('date-filter', 'min_date_allowed'),
+            Output('date-filter', 'max_date_allowed'),
+        ],
+        Input('chart-data', 'data'),
+        [
+            State('player-dropdown', 'value'),
+            State('team-dropdown', 'value'),
+            State('season-dropdown', 'value'),
+        ],
+        prevent_initial_call=True
     )
-    return fig
+    def update_filter_options(_, players, team, seasons):
+        """Opciones de los filtros a partir de los índices de los datos cacheados de la selección."""
+        try:
+            options = filter_options(as_list(players), team, as_list(seasons))
+        except LookupError:
+            raise PreventUpdate
+        dates = options['dates']
+        return (
+            [{'label': PERIOD_LABELS.get(p, str(p)), 'value': p} for p in options['periods']],
+            options['action_types'],
+            options['opponents'],
+            iso_date(dates[0]) if dates else None,
+            iso_date(dates[1]) if dates else None,
+        )
+
+def as_list(value):
+    """Valor de un dropdown (simple o multi) como lista."""
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value] if value else []
+
+def iso_date(value):
+    """Fecha YYYYMMDD (int) en formato ISO, como la usa DatePickerRange."""
+    return f"{value // 10000}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+def resolve_ids(players, team):
+    """IDs de los jugadores y del equipo (sin equipo se piden los tiros con cualquier equipo: TeamID 0)."""
+    with metrics.timed('lookup'):
+        return [get_player_id(player) for player in players], get_team_id(team) if team else 0
+
+def selection_chart(players, team, seasons, view, compare, filters=None, set_progress=None, cached_only=False):
+    """
+    Payload (sin cancha) de la selección del formulario con los filtros aplicados:
+    un gráfico o, con varios jugadores o temporadas, una comparación. Con
+    cached_only solo se leen datos ya cacheados (LookupError si faltan).
+    """
+    if set_progress:
+        set_progress("🔎 Buscando jugador y equipo...")
+    player_ids, team_id = resolve_ids(players, team)
+    if len(players) > 1 or len(seasons) > 1:
+        selections = comparison_selections(players, player_ids, team_id, seasons)
+        return build_comparison_chart(selections, compare, set_progress, filters, cached_only)
+    player_id, season = player_ids[0], seasons[0]
+    return build_chart(player_id, team_id, season, view, set_progress, filters, cached_only)
+
+def filter_options(players, team, seasons):
+    """Valores presentes en los datos cacheados de la selección (unión de todas las series)."""
+    player_ids, team_id = resolve_ids(players, team)
+    options = {'periods': set(), 'action_types': set(), 'opponents': set(), 'dates': None}
+    for player_id in player_ids:
+        for season in seasons:
+            data = get_cached_chart_data(player_id, team_id, season)
+            if data is None:
+                raise LookupError(f"{player_id} {season}: sin datos en caché")
+            if data.empty:
+                continue
+            series = shot_index(data).options()
+            for key in ('periods', 'action_types', 'opponents'):
+                options[key].update(series[key])
+            low, high = series['dates']
+            options['dates'] = (min(low, options['dates'][0]), max(high, options['dates'][1])) \
+                if options['dates'] else (low, high)
+    return {key: sorted(value) if isinstance(value, set) else value for key, value in options.items()}
 
-def create_error_chart(error_message):
-    """Crea un gráfico de error"""
-    fig = go.Figure()
+def build_chart(player_id, team_id, season, view, set_progress=None, filters=None, cached_only=False):
+    """Descarga (o lee de la caché) los tiros y construye el payload (sin cancha) de la vista pedida."""
+    _, payload, stale = chart_payload(player_id, team_id, season, view, set_progress, filters, cached_only)
+    return chart_data(payload, stale)
+
+def chart_data(payload, stale=False):
+    """
+    Valor del Store 'chart-data': el JSON cacheado tal cual, como texto. court.render
+    lo parsea en el navegador, así el servidor no lo decodifica ni lo vuelve a codificar.
+    Con datos vencidos se devuelve parseado, para que background.cacheable vea
+    layout.meta.stale y no reutilice el resultado.
+    """
+    return json.loads(payload) if stale else payload.decode('utf-8')
+
+def chart_payload(player_id, team_id, season, view, set_progress=None, filters=None, cached_only=False):
+    """
+    Devuelve (etag, JSON en bytes, datos vencidos) de la figura sin la cancha (ver payload.with_court).
+    Si los datos no cambiaron desde la última vez se reutiliza la figura ya
+    serializada, sin volver a construirla. Los filtros se resuelven con los
+    índices de shot_index sobre los datos cacheados.
+    """
+    if cached_only:
+        data = get_cached_chart_data(player_id, team_id, season)
+        if data is None:
+            raise LookupError(f"{player_id} {season}: sin datos en caché")
+    else:
+        if set_progress:
+            set_progress("📡 Descargando tiros...")
+        data = get_shooting_chart_data(player_id, team_id, season)
+    data = filter_shots(data, filters)
+    version = figure_version(data)
+    
+    baseline = None
+    if view == 'relative':
+        # Solo lectura del artefacto precalculado (baselines.py): nunca se descarga la liga en una petición
+        with metrics.timed('baseline'):
+            baseline = load_baseline(season)
+        version = f"{version}-{baseline['version'] if baseline else 'sin-promedios'}"
+    
+    def render():
+        if view == 'efficiency':
+            return render_payload(lambda: with_stale_notice(plot_efficiency_chart(data), data), len(data), set_progress)
+        if view == 'relative':
+            return render_payload(lambda: with_stale_notice(plot_relative_chart(data, baseline), data), len(data),
+                                  set_progress)
+        return render_payload(lambda: with_stale_notice(plot_shot_chart(data), data), len(data), set_progress)
+    
+    selection = (player_id, team_id, season, view) + filter_key(filters)
+    etag, payload = figure_cache.get_or_build(selection, version, render)
+    return etag, payload, bool(data.meta.get('stale'))
+
+def comparison_selections(players, player_ids, team_id, seasons):
+    """(etiqueta, player_id, team_id, temporada) de cada serie: todas las combinaciones jugador × temporada."""
+    selections = []
+    for player, player_id in zip(players, player_ids):
+        for season in seasons:
+            if len(players) == 1:
+                label = season
+            elif len(seasons) == 1:
+                label = player
+            else:
+                label = f"{player} {season}"
+            selections.append((label, player_id, team_id, season))
+    return selections[:MAX_COMPARE_SERIES]
+
+def build_comparison_chart(selections, mode, set_progress=None, filters=None, cached_only=False):
+    """Descarga en paralelo las series y construye el payload (sin cancha) de la comparación."""
+    if set_progress:
+        set_progress(f"📡 Descargando {len(selections)} series...")
+    data = get_comparison_data(selections, filters=filters, cached_only=cached_only)
+    
+    def render():
+        return render_payload(lambda: with_stale_notice(plot_comparison_chart(data, mode=mode), data),
+                              len(data), set_progress)
+    
+    selection = ('compare', tuple(selections), mode) + filter_key(filters)
+    _, payload = figure_cache.get_or_build(selection, figure_version(data), render)
+    return chart_data(payload, data.meta.get('stale'))
+
+def figure_version(data):
+    """Versión de la figura en la caché: la de los datos, el formato del payload y si los datos son una copia vencida."""
+    version = f"{data.version}-{PAYLOAD_FORMAT}"
+    return f"{version}-stale" if data.meta.get('stale') else version
+
+def with_stale_notice(fig, data):
+    """Marca la figura (layout.meta.stale) y avisa si los datos son la última copia en caché."""
+    if not data.meta.get('stale'):
+        return fig
+    latest = data.meta.get('latest_game_date')
+    since = f" (partidos hasta el {latest % 100:02d}/{latest // 100 % 100:02d}/{latest // 10000})" if latest else ""
+    fig.layout.meta = {**(fig.layout.meta or {}), 'stale': True}
     fig.add_annotation(
-        text=f"❌ {error_message}",
+        text=f"⏳ stats.nba.com no responde: mostrando los últimos datos guardados{since}",
         xref="paper", yref="paper",
-        x=0.5, y=0.5,
-        xanchor='center', yanchor='middle',
-        font=dict(size=16, color="#d32f2f"),
+        x=0.5, y=0,
+        xanchor='center', yanchor='top',
+        font=dict(size=12, color="#ef6c00"),
         showarrow=False
     )
-    fig.update_layout(
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        height=600,
-        margin=dict(l=0, r=0, t=50, b=0)
-    )
-    return fig
\ No newline at end of file
+    return fig
+
+def render_payload(build_figure, n_shots, set_progress=None):
+    """Construye la figura y la serializa sin la cancha (JSON en bytes), midiendo cada etapa."""
+    if set_progress:
+        set_progress("🎨 Generando gráfico...")
+    metrics.observe('chart_shots', n_shots)
+    with metrics.timed('figure'):
+        fig = build_figure()
+    with metrics.timed('serialize'):
+        payload = json.dumps(client_figure(fig), cls=PlotlyJSONEncoder, separators=(',', ':')).encode('utf-8')
+    metrics.observe('chart_payload_bytes', len(payload))
+    return payload
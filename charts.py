@@ -1,10 +1,19 @@
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle, Rectangle, Arc
 import plotly.graph_objects as go
 import math
 import numpy as np
+from functools import lru_cache
+from zones import (classify_shots, group_counts, basic_zone_codes, BASIC_ZONES, ZONE_NAMES, PAINT, THREE, MID_RANGE,
+                   BASELINE_Y, HALF_COURT_Y, SIDELINE_X, PAINT_HALF_WIDTH, PAINT_TOP, RESTRICTED_RADIUS,
+                   THREE_PT_RADIUS, CORNER_THREE_X, CORNER_THREE_TOP)
+from aggregation import (grid_counts, bin_centers, aggregate_shots, fg_percentage, summary_bins,
+                         summary_matches, summary_zones, baseline_fg_pct, DEFAULT_BIN_SIZE)
+from shot_store import as_shot_store
 
 def draw_court(ax=None, color='black', lw=2, outer_lines=False):
+    # matplotlib solo se usa aquí (exportación), así que se importa bajo demanda
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Circle, Rectangle, Arc
+
     # If no axis is provided, get current one
     if ax is None:
         ax = plt.gca()
@@ -48,346 +57,262 @@ def draw_court(ax=None, color='black', lw=2, outer_lines=False):
 
     return ax
 
-def create_arc_path(radius, center, start_angle, end_angle):
-    """Crea un path SVG para un arco."""
-    cx, cy = center
-    
-    # Convertir ángulos a radianes
-    start_rad = math.radians(start_angle)
-    end_rad = math.radians(end_angle)
-    
-    # Calcular puntos inicial y final
-    x1 = cx + radius * math.cos(start_rad)
-    y1 = cy + radius * math.sin(start_rad)
-    x2 = cx + radius * math.cos(end_rad)
-    y2 = cy + radius * math.sin(end_rad)
-    
-    # Determinar si el arco es mayor a 180 grados
-    large_arc = 1 if abs(end_angle - start_angle) > 180 else 0
-    
-    return f"M {x1},{y1} A {radius},{radius} 0 {large_arc},1 {x2},{y2}"
+# Estilos de la cancha por tema (cada variante se construye y cachea por separado)
+COURT_THEMES = {
+    'light': dict(
+        court_color='#2C3E50',  # Azul oscuro elegante
+        hoop_color='#E74C3C',  # Rojo para el aro
+        three_color='#E67E22',  # Naranja para línea de 3
+        backboard_fill='rgba(44, 62, 80, 0.1)',
+        paint_fill='rgba(52, 152, 219, 0.05)',
+        background='#F8F9FA',  # Fondo gris claro
+        line_width=3
+    ),
+    'dark': dict(
+        court_color='#ECF0F1',
+        hoop_color='#E74C3C',
+        three_color='#F39C12',
+        backboard_fill='rgba(236, 240, 241, 0.15)',
+        paint_fill='rgba(52, 152, 219, 0.12)',
+        background='#1E2A38',
+        line_width=3
+    ),
+}
 
-def create_semicircle_path(radius, center, top_half=True):
-    """Crea un path SVG para una semicircunferencia completa."""
-    cx, cy = center
-    
-    if top_half:
-        # Semicircunferencia superior (de izquierda a derecha)
-        x1, y1 = cx - radius, cy
-        x2, y2 = cx + radius, cy
-        sweep_flag = 0  # Dirección antihoraria para semicírculo superior
-    else:
-        # Semicircunferencia inferior (de izquierda a derecha)
-        x1, y1 = cx - radius, cy
-        x2, y2 = cx + radius, cy
-        sweep_flag = 1  # Dirección horaria para semicírculo inferior
-    
-    return f"M {x1} {y1} A {radius} {radius} 0 0 {sweep_flag} {x2} {y2}"
+# Nivel de detalle de los arcos: decimales de las coordenadas y puntos por arco.
+# 'lean' (payload optimizado) redondea a la unidad de LOC y usa menos puntos.
+COURT_DETAIL = {
+    'full': dict(precision=1, free_throw=30, restricted=20, three=50, center_outer=30, center_inner=20),
+    'lean': dict(precision=0, free_throw=12, restricted=8, three=20, center_outer=12, center_inner=8),
+}
 
-def add_court_shapes(fig):
-    """Añade todas las líneas de la cancha de basketball como shapes de Plotly."""
-    shapes = []
-    
-    # Configuración de colores y estilos
-    court_color = '#2C3E50'  # Azul oscuro elegante
-    line_width = 3
-    
-    # === ARO Y TABLERO ===
-    # Aro (círculo)
-    shapes.append(dict(
-        type='circle',
-        xref='x', yref='y',
-        x0=-7.5, y0=-7.5, x1=7.5, y1=7.5,
-        line=dict(color='#E74C3C', width=line_width + 1)  # Rojo para el aro
-    ))
-    
-    # Tablero
-    shapes.append(dict(
-        type='rect',
-        x0=-30, y0=-7.5, x1=30, y1=-8.5,
-        line=dict(color=court_color, width=line_width),
-        fillcolor='rgba(44, 62, 80, 0.1)'
-    ))
-    
-    # === ÁREA DE PINTURA ===
-    # Caja exterior (paint)
-    shapes.append(dict(
-        type='rect',
-        x0=-80, y0=-47.5, x1=80, y1=142.5,
-        line=dict(color=court_color, width=line_width),
-        fillcolor='rgba(52, 152, 219, 0.05)'
-    ))
-    
-    # Caja interior
-    shapes.append(dict(
-        type='rect',
-        x0=-60, y0=-47.5, x1=60, y1=142.5,
-        line=dict(color=court_color, width=line_width)
-    ))
-    
-    # === TIROS LIBRES ===
-    # Generar puntos para semicircunferencia superior de tiros libres
-    ft_radius = 60
-    ft_center = (0, 142.5)
-    
-    # Semicircunferencia superior (línea sólida)
-    ft_upper_points_x = []
-    ft_upper_points_y = []
-    for angle in np.linspace(0, np.pi, 30):
-        x = ft_center[0] + ft_radius * np.cos(angle)
-        y = ft_center[1] + ft_radius * np.sin(angle)
-        ft_upper_points_x.append(x)
-        ft_upper_points_y.append(y)
-    
-    shapes.append(dict(
-        type='path',
-        path=' '.join([f"{'M' if i == 0 else 'L'} {x} {y}" for i, (x, y) in enumerate(zip(ft_upper_points_x, ft_upper_points_y))]),
-        line=dict(color=court_color, width=line_width)
-    ))
-    
-    # Semicircunferencia inferior (línea punteada)
-    ft_lower_points_x = []
-    ft_lower_points_y = []
-    for angle in np.linspace(np.pi, 2*np.pi, 30):
-        x = ft_center[0] + ft_radius * np.cos(angle)
-        y = ft_center[1] + ft_radius * np.sin(angle)
-        ft_lower_points_x.append(x)
-        ft_lower_points_y.append(y)
-    
-    shapes.append(dict(
-        type='path',
-        path=' '.join([f"{'M' if i == 0 else 'L'} {x} {y}" for i, (x, y) in enumerate(zip(ft_lower_points_x, ft_lower_points_y))]),
-        line=dict(color=court_color, width=line_width, dash='dash')
-    ))
-    
-    # === ÁREA RESTRINGIDA ===
-    # Generar puntos para semicircunferencia del área restringida
-    restricted_radius = 40
-    restricted_points_x = []
-    restricted_points_y = []
-    
-    for angle in np.linspace(0, np.pi, 20):
-        x = restricted_radius * np.cos(angle)
-        y = restricted_radius * np.sin(angle)
-        restricted_points_x.append(x)
-        restricted_points_y.append(y)
-    
-    shapes.append(dict(
-        type='path',
-        path=' '.join([f"{'M' if i == 0 else 'L'} {x} {y}" for i, (x, y) in enumerate(zip(restricted_points_x, restricted_points_y))]),
-        line=dict(color=court_color, width=line_width)
-    ))
-    
-    # === LÍNEA DE 3 PUNTOS ===
-    # Calcular los puntos donde el arco se conecta con las líneas rectas
-    three_pt_radius = 237.5
-    corner_y = 92.5  # Altura donde terminan las líneas de las esquinas
-    
-    # Esquinas izquierda y derecha
-    shapes.append(dict(
-        type='line',
-        x0=-220, y0=-47.5, x1=-220, y1=corner_y,
-        line=dict(color='#E67E22', width=line_width + 1)  # Naranja para línea de 3
-    ))
-    shapes.append(dict(
-        type='line',
-        x0=220, y0=-47.5, x1=220, y1=corner_y,
-        line=dict(color='#E67E22', width=line_width + 1)
-    ))
-    
-    # Arco de 3 puntos - usando múltiples puntos para crear el arco
-    three_pt_points_x = []
-    three_pt_points_y = []
-    
-    # Generar puntos del arco desde -220 hasta 220 en X
-    for angle in np.linspace(-np.arcsin(corner_y/three_pt_radius), np.arcsin(corner_y/three_pt_radius), 50):
-        x = three_pt_radius * np.sin(angle)
-        y = three_pt_radius * np.cos(angle)
-        three_pt_points_x.append(x)
-        three_pt_points_y.append(y)
-    
-    # Añadir el arco como una línea que conecta todos los puntos
-    shapes.append(dict(
-        type='path',
-        path=' '.join([f"{'M' if i == 0 else 'L'} {x} {y}" for i, (x, y) in enumerate(zip(three_pt_points_x, three_pt_points_y))]),
-        line=dict(color='#E67E22', width=line_width + 1)
-    ))
-    
-    # === CENTRO DE CANCHA ===
-    # Semicircunferencia exterior del centro
-    center_outer_points_x = []
-    center_outer_points_y = []
-    center_y = 422.5
-    
-    for angle in np.linspace(np.pi, 2*np.pi, 30):
-        x = 60 * np.cos(angle)
-        y = center_y + 60 * np.sin(angle)
-        center_outer_points_x.append(x)
-        center_outer_points_y.append(y)
-    
-    shapes.append(dict(
-        type='path',
-        path=' '.join([f"{'M' if i == 0 else 'L'} {x} {y}" for i, (x, y) in enumerate(zip(center_outer_points_x, center_outer_points_y))]),
-        line=dict(color=court_color, width=line_width)
-    ))
-    
-    # Semicircunferencia interior del centro
-    center_inner_points_x = []
-    center_inner_points_y = []
-    
-    for angle in np.linspace(np.pi, 2*np.pi, 20):
-        x = 20 * np.cos(angle)
-        y = center_y + 20 * np.sin(angle)
-        center_inner_points_x.append(x)
-        center_inner_points_y.append(y)
-    
-    shapes.append(dict(
-        type='path',
-        path=' '.join([f"{'M' if i == 0 else 'L'} {x} {y}" for i, (x, y) in enumerate(zip(center_inner_points_x, center_inner_points_y))]),
-        line=dict(color=court_color, width=line_width)
-    ))
-    
-    # === LÍNEAS EXTERIORES ===
-    # Línea de fondo
-    shapes.append(dict(
-        type='line',
-        x0=-250, y0=-47.5, x1=250, y1=-47.5,
-        line=dict(color=court_color, width=line_width)
-    ))
-    # Líneas laterales
-    shapes.append(dict(
-        type='line',
-        x0=-250, y0=-47.5, x1=-250, y1=422.5,
-        line=dict(color=court_color, width=line_width)
-    ))
-    shapes.append(dict(
-        type='line',
-        x0=250, y0=-47.5, x1=250, y1=422.5,
-        line=dict(color=court_color, width=line_width)
-    ))
+def _arc_path(cx, cy, radius, start, end, n_points, precision=1):
+    """Genera de forma vectorizada el path SVG (M/L) de un arco con coordenadas redondeadas."""
+    angles = np.linspace(start, end, n_points)
+    xs = np.round(cx + radius * np.cos(angles), precision) + 0.0
+    ys = np.round(cy + radius * np.sin(angles), precision) + 0.0
+    points = [f"{x:g} {y:g}" for x, y in zip(xs.tolist(), ys.tolist())]
+    return 'M ' + ' L '.join(points)
 
-    fig.update_layout(shapes=shapes)
-    return fig
+@lru_cache(maxsize=None)
+def court_shapes(theme='light', detail='full'):
+    """Construye una sola vez (por tema y detalle) las líneas de la cancha como shapes de Plotly."""
+    style = COURT_THEMES[theme]
+    points = COURT_DETAIL[detail]
+    precision = points['precision']
+    court_color = style['court_color']
+    line_width = style['line_width']
+    court_line = dict(color=court_color, width=line_width)
+    three_line = dict(color=style['three_color'], width=line_width + 1)
 
-def calculate_shot_zones(data):
-    """Calcula estadísticas por zonas de tiro."""
-    zones = {
-        'Pintura': 0,
-        'Tiros libres': 0,
-        'Triples': 0,
-        'Medio rango': 0
-    }
-    
-    for _, shot in data.iterrows():
-        x, y = shot['LOC_X'], shot['LOC_Y']
-        distance = math.sqrt(x**2 + y**2)
-        
-        # Clasificar por zona
-        if abs(x) <= 80 and y <= 142.5:  # Pintura
-            zones['Pintura'] += 1
-        elif distance > 237.5:  # Triples
-            zones['Triples'] += 1
-        elif y > 142.5 and y < 200:  # Zona de tiros libres
-            zones['Tiros libres'] += 1
-        else:  # Medio rango
-            zones['Medio rango'] += 1
-    
-    return zones
+    # Misma geometría que la rejilla de zonas (zones.build_zone_grid)
+    three_angle = np.arcsin(CORNER_THREE_TOP / THREE_PT_RADIUS)
+
+    shapes = (
+        # === ARO Y TABLERO ===
+        dict(type='circle', xref='x', yref='y', x0=-7.5, y0=-7.5, x1=7.5, y1=7.5,
+             line=dict(color=style['hoop_color'], width=line_width + 1)),
+        dict(type='rect', x0=-30, y0=-7.5, x1=30, y1=-8.5,
+             line=court_line, fillcolor=style['backboard_fill']),
+
+        # === ÁREA DE PINTURA ===
+        dict(type='rect', x0=-PAINT_HALF_WIDTH, y0=BASELINE_Y, x1=PAINT_HALF_WIDTH, y1=PAINT_TOP,
+             line=court_line, fillcolor=style['paint_fill']),
+        dict(type='rect', x0=-60, y0=BASELINE_Y, x1=60, y1=PAINT_TOP, line=court_line),
+
+        # === TIROS LIBRES === (superior sólida, inferior punteada)
+        dict(type='path', path=_arc_path(0, PAINT_TOP, 60, 0, np.pi, points['free_throw'], precision),
+             line=court_line),
+        dict(type='path', path=_arc_path(0, PAINT_TOP, 60, np.pi, 2 * np.pi, points['free_throw'], precision),
+             line=dict(court_line, dash='dash')),
+
+        # === ÁREA RESTRINGIDA ===
+        dict(type='path', path=_arc_path(0, 0, RESTRICTED_RADIUS, 0, np.pi, points['restricted'], precision),
+             line=court_line),
+
+        # === LÍNEA DE 3 PUNTOS ===
+        dict(type='line', x0=-CORNER_THREE_X, y0=BASELINE_Y, x1=-CORNER_THREE_X, y1=CORNER_THREE_TOP,
+             line=three_line),
+        dict(type='line', x0=CORNER_THREE_X, y0=BASELINE_Y, x1=CORNER_THREE_X, y1=CORNER_THREE_TOP,
+             line=three_line),
+        dict(type='path', line=three_line,
+             path=_arc_path(0, 0, THREE_PT_RADIUS, three_angle, np.pi - three_angle,
+                            points['three'], precision)),
+
+        # === CENTRO DE CANCHA ===
+        dict(type='path', path=_arc_path(0, HALF_COURT_Y, 60, np.pi, 2 * np.pi, points['center_outer'], precision),
+             line=court_line),
+        dict(type='path', path=_arc_path(0, HALF_COURT_Y, 20, np.pi, 2 * np.pi, points['center_inner'], precision),
+             line=court_line),
+
+        # === LÍNEAS EXTERIORES ===
+        dict(type='line', x0=-SIDELINE_X, y0=BASELINE_Y, x1=SIDELINE_X, y1=BASELINE_Y, line=court_line),
+        dict(type='line', x0=-SIDELINE_X, y0=BASELINE_Y, x1=-SIDELINE_X, y1=HALF_COURT_Y, line=court_line),
+        dict(type='line', x0=SIDELINE_X, y0=BASELINE_Y, x1=SIDELINE_X, y1=HALF_COURT_Y, line=court_line),
+    )
+    return shapes
+
+@lru_cache(maxsize=None)
+def _court_layout(theme='light'):
+    """Plantilla de layout de la cancha (shapes, ejes y fondo), validada una sola vez por tema."""
+    layout = go.Layout(
+        shapes=court_shapes(theme),
+        xaxis=dict(
+            range=[-260, 260],
+            visible=False,
+            scaleanchor="y",
+            scaleratio=1,
+            constrain='domain'
+        ),
+        yaxis=dict(
+            range=[-60, 440],
+            visible=False,
+            constrain='domain'
+        ),
+        plot_bgcolor=COURT_THEMES[theme]['background'],
+        meta=dict(court_theme=theme),  # Permite reconstruir la cancha en otro nivel de detalle
+    )
+    # Se congela como dict ya validado; Plotly copia sus valores al crear cada figura
+    return layout.to_plotly_json()
 
-def plot_shot_chart(data, title="Shot Chart"):
+# Claves del layout que aporta la plantilla de la cancha
+COURT_LAYOUT_KEYS = ('shapes', 'xaxis', 'yaxis', 'plot_bgcolor')
+
+@lru_cache(maxsize=None)
+def court_template(theme='light', axes=('',)):
     """
-    Crea un shot chart mejorado usando Plotly con mejor visualización.
-    Nota: Los datos solo incluyen tiros anotados.
+    Parte del layout que corresponde a la cancha; es la que se envía al navegador como asset estático.
+    axes: sufijos de los ejes ('', '2', ...) en los que se dibuja la cancha (un subplot por eje).
+    Mismo algoritmo que court.render en assets/court_render.js.
     """
-    
-    # Crear figura
-    fig = go.Figure()
-    
-    if data is not None and not data.empty:
-        # Calcular distancia para cada tiro
-        data = data.copy()
-        data['DISTANCE'] = np.sqrt(data['LOC_X']**2 + data['LOC_Y']**2)
-        
-        # Clasificar tiros por tipo
-        paint_shots = data[(abs(data['LOC_X']) <= 80) & (data['LOC_Y'] <= 142.5)]
-        three_pt_shots = data[data['DISTANCE'] > 237.5]
-        mid_range_shots = data[(data['DISTANCE'] <= 237.5) & 
-                              ~((abs(data['LOC_X']) <= 80) & (data['LOC_Y'] <= 142.5))]
-        
-        # Añadir tiros por categoría con diferentes colores y tamaños
-        if not paint_shots.empty:
-            fig.add_trace(go.Scatter(
-                x=paint_shots['LOC_X'],
-                y=paint_shots['LOC_Y'],
-                mode='markers',
-                name='Pintura',
-                marker=dict(
-                    color='#27AE60',  # Verde
-                    size=12,
-                    line=dict(color='white', width=2),
-                    opacity=0.8,
-                    symbol='circle'
-                ),
-                hovertemplate='<b>Tiro en la Pintura</b><br>' +
-                             'Distancia: %{customdata:.1f} pies<br>' +
-                             '<extra></extra>',
-                customdata=paint_shots['DISTANCE'] / 10,
-                showlegend=True
-            ))
-        
-        if not three_pt_shots.empty:
-            fig.add_trace(go.Scatter(
-                x=three_pt_shots['LOC_X'],
-                y=three_pt_shots['LOC_Y'],
-                mode='markers',
-                name='Triples',
-                marker=dict(
-                    color='#E74C3C',  # Rojo
-                    size=14,
-                    line=dict(color='white', width=2),
-                    opacity=0.8,
-                    symbol='star'
-                ),
-                hovertemplate='<b>Triple Anotado</b><br>' +
-                             'Distancia: %{customdata:.1f} pies<br>' +
-                             '<extra></extra>',
-                customdata=three_pt_shots['DISTANCE'] / 10,
-                showlegend=True
-            ))
-        
-        if not mid_range_shots.empty:
-            fig.add_trace(go.Scatter(
-                x=mid_range_shots['LOC_X'],
-                y=mid_range_shots['LOC_Y'],
-                mode='markers',
-                name='Medio Rango',
-                marker=dict(
-                    color='#3498DB',  # Azul
-                    size=10,
-                    line=dict(color='white', width=2),
-                    opacity=0.8,
-                    symbol='diamond'
-                ),
-                hovertemplate='<b>Tiro de Medio Rango</b><br>' +
-                             'Distancia: %{customdata:.1f} pies<br>' +
-                             '<extra></extra>',
-                customdata=mid_range_shots['DISTANCE'] / 10,
-                showlegend=True
-            ))
+    layout = _court_layout(theme)
+    template = {'shapes': [], 'plot_bgcolor': layout['plot_bgcolor']}
+    for suffix in axes:
+        # En los ejes principales las shapes se dejan tal cual (algunas usan los ejes por defecto)
+        template['shapes'] += layout['shapes'] if not suffix else \
+            [dict(shape, xref=f'x{suffix}', yref=f'y{suffix}') for shape in layout['shapes']]
+        template[f'xaxis{suffix}'] = dict(layout['xaxis'], scaleanchor=f'y{suffix}')
+        template[f'yaxis{suffix}'] = dict(layout['yaxis'])
+    return template
+
+def court_figure(theme='light'):
+    """Crea una figura nueva con la cancha ya aplicada, sin reconstruir ni revalidar la plantilla."""
+    return go.Figure(layout=_court_layout(theme), _validate=False)
+
+def add_court_shapes(fig, theme='light'):
+    """Añade todas las líneas de la cancha de basketball como shapes de Plotly."""
+    fig.update_layout(shapes=court_shapes(theme))
+    return fig
+
+def create_empty_chart(message="🏀 Haz clic en 'Generar Gráfico' para comenzar"):
+    """Crea un gráfico vacío con mensaje"""
+    fig = court_figure()
+    fig.add_annotation(
+        text=message,
+        xref="paper", yref="paper",
+        x=0.5, y=0.5,
+        xanchor='center', yanchor='middle',
+        font=dict(size=20, color="#667eea"),
+        showarrow=False
+    )
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=600,
+        margin=dict(l=0, r=0, t=50, b=0)
+    )
+    return fig
+
+def create_error_chart(error_message):
+    """Crea un gráfico de error"""
+    fig = court_figure()
+    fig.add_annotation(
+        text=f"❌ {error_message}",
+        xref="paper", yref="paper",
+        x=0.5, y=0.5,
+        xanchor='center', yanchor='middle',
+        font=dict(size=16, color="#d32f2f"),
+        showarrow=False
+    )
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=600,
+        margin=dict(l=0, r=0, t=50, b=0),
+        meta={'error': True}
+    )
+    return fig
+
+# Umbrales de puntos para elegir la estrategia de renderizado
+SVG_MAX_POINTS = 3000
+WEBGL_MAX_POINTS = 30000
+
+# Estilo de cada categoría: (nombre, zonas, color, tamaño, símbolo, etiqueta del hover)
+# La franja de tiros libres se muestra junto con el medio rango
+SHOT_TRACE_STYLES = (
+    ('Pintura', (PAINT,), '#27AE60', 12, 'circle', 'Tiro en la Pintura'),  # Verde
+    ('Triples', (THREE,), '#E74C3C', 14, 'star', 'Triple Anotado'),  # Rojo
+    ('Medio Rango', (MID_RANGE,), '#3498DB', 10, 'diamond', 'Tiro de Medio Rango'),  # Azul
+)
+
+def pick_render_mode(n_points):
+    """Elige la estrategia de renderizado según la cantidad de tiros."""
+    if n_points <= SVG_MAX_POINTS:
+        return 'svg'
+    if n_points <= WEBGL_MAX_POINTS:
+        return 'webgl'
+    return 'binned'
+
+def add_shot_traces(fig, loc_x, loc_y, distance, zone, webgl=False):
+    """Añade un trace de marcadores por categoría (SVG o WebGL)."""
+    trace_class = go.Scattergl if webgl else go.Scatter
+    for name, zone_ids, color, size, symbol, label in SHOT_TRACE_STYLES:
+        mask = np.isin(zone, zone_ids)
+        if not mask.any():
+            continue
         
-        # Calcular estadísticas
-        total_shots = len(data)
-        zones = calculate_shot_zones(data)
+        marker = dict(color=color, size=size, opacity=0.8, symbol=symbol)
+        if webgl:
+            # Sin contorno y marcadores más pequeños para volúmenes medianos
+            marker['size'] = size * 0.6
+        else:
+            marker['line'] = dict(color='white', width=2)
         
-        # Crear título dinámico con estadísticas
-        title = f"🏀 {title}<br><sub>Total de Canastas: {total_shots} | " + \
-                f"Pintura: {zones['Pintura']} | Triples: {zones['Triples']} | " + \
-                f"Medio Rango: {zones['Medio rango']}</sub>"
-    
-    # Añadir la cancha
-    fig = add_court_shapes(fig)
-    
-    # Layout mejorado
+        fig.add_trace(trace_class(
+            x=loc_x[mask],
+            y=loc_y[mask],
+            mode='markers',
+            name=name,
+            marker=marker,
+            hovertemplate=f'<b>{label}</b><br>' +
+                          'Distancia: %{customdata:.1f} pies<br>' +
+                          '<extra></extra>',
+            customdata=distance[mask] / 10,
+            showlegend=True
+        ))
+    return fig
+
+def add_binned_trace(fig, loc_x, loc_y, bin_size=DEFAULT_BIN_SIZE, counts=None):
+    """Añade un Heatmap con el número de tiros por celda de la rejilla (o con counts ya agregados)."""
+    if counts is None:
+        counts = grid_counts(loc_x, loc_y, bin_size)
+    x_centers, y_centers = bin_centers(bin_size)
+    
+    # Las celdas vacías se dejan transparentes para que se vea la cancha
+    z = np.where(counts > 0, counts, np.nan)
+    fig.add_trace(go.Heatmap(
+        x=x_centers,
+        y=y_centers,
+        z=z,
+        name='Tiros',
+        colorscale='YlOrRd',
+        opacity=0.85,
+        hoverongaps=False,
+        hovertemplate='Tiros: %{z:.0f}<extra></extra>',
+        colorbar=dict(title='Tiros', thickness=12, len=0.6)
+    ))
+    return fig
+
+def style_chart_layout(fig, title):
+    """Aplica el estilo común (título, tamaño y leyenda) a los gráficos de tiro."""
     fig.update_layout(
         title=dict(
             text=title,
@@ -397,19 +322,8 @@ def plot_shot_chart(data, title="Shot Chart"):
             yanchor='top',
             font=dict(size=20, color='#2C3E50', family='Arial Black')
         ),
-        xaxis=dict(
-            range=[-260, 260],
-            visible=False,
-            scaleanchor="y",
-            scaleratio=1
-        ),
-        yaxis=dict(
-            range=[-60, 440],
-            visible=False
-        ),
         height=700,
         width=600,
-        plot_bgcolor='#F8F9FA',  # Fondo gris claro
         paper_bgcolor='white',
         showlegend=True,
         legend=dict(
@@ -426,8 +340,328 @@ def plot_shot_chart(data, title="Shot Chart"):
         margin=dict(l=20, r=20, t=80, b=60),
     )
     
-    # Configurar aspectos para mantener proporciones de cancha real
-    fig.update_xaxes(constrain='domain')
-    fig.update_yaxes(constrain='domain')
+    return fig
+
+def shot_summary(shots):
+    """Resumen precalculado por la caché (meta['summary']) si corresponde a estas filas; None si no."""
+    summary = shots.meta.get('summary') if shots is not None else None
+    return summary if summary_matches(summary, len(shots)) else None
+
+def plot_shot_chart(data, title="Shot Chart", theme='light', render_mode='auto'):
+    """
+    Crea un shot chart mejorado usando Plotly con mejor visualización.
+    data puede ser un ShotStore o un DataFrame de ShotChartDetail.
+    Nota: Solo se dibujan los tiros anotados (SHOT_MADE_FLAG == 1).
+    render_mode: 'svg', 'webgl', 'binned' o 'auto' (según la cantidad de tiros).
+    """
+    
+    # Crear figura sobre la plantilla precalculada de la cancha
+    fig = court_figure(theme)
+    
+    shots = as_shot_store(data)
+    summary = shot_summary(shots)
+    if shots is not None:
+        shots = shots.take(shots['made'])
+    
+    if shots is not None and not shots.empty:
+        loc_x = shots['loc_x']
+        loc_y = shots['loc_y']
+        mode = render_mode if render_mode != 'auto' else pick_render_mode(len(shots))
+        if mode == 'binned' and summary is not None:
+            # Rejilla y zonas precalculadas en la caché: no hace falta recorrer los tiros
+            add_binned_trace(fig, loc_x, loc_y, counts=summary_bins(summary)[1])
+            counts = group_counts(summary_zones(summary)[1])
+        else:
+            # Clasificar todos los tiros en una sola pasada
+            distance, zone, counts = classify_shots(loc_x, loc_y)
+            if mode == 'binned':
+                # Agregación en el servidor: el tamaño del payload depende de la rejilla, no de los tiros
+                add_binned_trace(fig, loc_x, loc_y)
+            else:
+                add_shot_traces(fig, loc_x, loc_y, distance, zone, webgl=(mode == 'webgl'))
+        
+        # Calcular estadísticas
+        total_shots = len(shots)
+        # Crear título dinámico con estadísticas
+        title = f"🏀 {title}<br><sub>Total de Canastas: {total_shots} | " + \
+                f"Pintura: {counts[PAINT]} | Triples: {counts[THREE]} | " + \
+                f"Medio Rango: {counts[MID_RANGE]}</sub>"
+    
+    # Layout mejorado
+    style_chart_layout(fig, title)
+    
+    return fig
+
+# Celdas de 2 pies y al menos 3 intentos para mostrar el FG% de una celda
+EFFICIENCY_BIN_SIZE = 20
+EFFICIENCY_MIN_ATTEMPTS = 3
+
+def plot_efficiency_chart(data, title="Shot Chart", theme='light',
+                          bin_size=EFFICIENCY_BIN_SIZE, min_attempts=EFFICIENCY_MIN_ATTEMPTS):
+    """
+    Crea un gráfico de eficiencia por celdas: el tamaño indica los intentos
+    y el color el FG%. Requiere tiros anotados y fallados (ShotStore o DataFrame).
+    """
+    fig = court_figure(theme)
+    
+    shots = as_shot_store(data)
+    if shots is not None and not shots.empty:
+        summary = shot_summary(shots)
+        binned = summary_bins(summary, bin_size) if summary is not None else None
+        if binned is not None:
+            attempts, makes = binned
+            fg_pct = fg_percentage(attempts, makes, min_attempts)
+        else:
+            attempts, makes, fg_pct = aggregate_shots(
+                shots['loc_x'], shots['loc_y'], shots['made'], bin_size, min_attempts
+            )
+        add_efficiency_trace(fig, attempts, makes, fg_pct, bin_size)
+        
+        total_attempts = len(shots)
+        total_makes = int(summary_zones(summary)[1].sum()) if summary is not None else int(shots['made'].sum())
+        title = f"🏀 {title}<br><sub>Intentos: {total_attempts} | Anotados: {total_makes} | " + \
+                f"FG%: {100 * total_makes / total_attempts:.1f}%</sub>"
     
-    return fig
\ No newline at end of file
+    style_chart_layout(fig, title)
+    return fig
+
+def add_efficiency_trace(fig, attempts, makes, fg_pct, bin_size=EFFICIENCY_BIN_SIZE, axes=''):
+    """
+    Añade las celdas con muestra suficiente como marcadores cuadrados (tamaño = intentos, color = FG%).
+    axes: sufijo de los ejes del subplot ('', '2', ...); todos comparten la escala de color.
+    """
+    x_centers, y_centers = bin_centers(bin_size)
+    iy, ix = np.nonzero(~np.isnan(fg_pct))
+    if len(ix) == 0:
+        return fig
+    
+    cell_attempts = attempts[iy, ix]
+    # Escala de tamaño por raíz cuadrada para que las celdas con muchos intentos no tapen el resto
+    sizes = 4 + 14 * np.sqrt(cell_attempts / cell_attempts.max())
+    
+    fig.add_trace(go.Scatter(
+        x=x_centers[ix],
+        y=y_centers[iy],
+        mode='markers',
+        name='FG% por zona',
+        xaxis=f'x{axes}',
+        yaxis=f'y{axes}',
+        marker=dict(
+            symbol='square',
+            size=np.round(sizes, 1),
+            color=np.round(fg_pct[iy, ix], 3),
+            colorscale='RdYlGn',
+            cmin=0.25,
+            cmax=0.65,
+            opacity=0.9,
+            showscale=not axes,
+            colorbar=dict(title='FG%', tickformat='.0%', thickness=12, len=0.6)
+        ),
+        customdata=np.column_stack([cell_attempts, makes[iy, ix]]),
+        hovertemplate='FG%: %{marker.color:.1%}<br>' +
+                      'Intentos: %{customdata[0]}<br>' +
+                      'Anotados: %{customdata[1]}<extra></extra>',
+        showlegend=False
+    ))
+    return fig
+
+# Vista relativa: intentos mínimos de la liga para usar el FG% de la propia celda
+# (si no, el de su zona) y diferencia en puntos de FG% de los extremos de la escala
+LEAGUE_MIN_ATTEMPTS = 50
+RELATIVE_RANGE = 0.15
+
+def plot_relative_chart(data, baseline, title="Shot Chart", theme='light', min_attempts=EFFICIENCY_MIN_ATTEMPTS):
+    """
+    Eficiencia relativa a la liga: FG% del jugador en cada celda menos el de la
+    liga en la misma celda (artefacto de baselines.py, ya agregado: solo se
+    indexa). El tamaño indica los intentos del jugador y el color la diferencia.
+    Sin artefacto (baseline None) solo se muestra un aviso.
+    """
+    fig = court_figure(theme)
+    
+    shots = as_shot_store(data)
+    if shots is not None and not shots.empty and baseline is not None:
+        bin_size = baseline['bin_size']
+        summary = shot_summary(shots)
+        binned = summary_bins(summary, bin_size) if summary is not None else None
+        if binned is not None:
+            attempts, makes = binned
+            zone_attempts, zone_makes = summary_zones(summary)
+        else:
+            attempts, makes, _ = aggregate_shots(shots['loc_x'], shots['loc_y'], shots['made'], bin_size)
+            zone = basic_zone_codes(shots['loc_x'], shots['loc_y'])
+            zone_attempts = np.bincount(zone, minlength=len(BASIC_ZONES))
+            zone_makes = np.bincount(zone[shots['made']], minlength=len(BASIC_ZONES))
+        fg_pct = fg_percentage(attempts, makes, min_attempts)
+        league_pct = baseline_fg_pct(baseline['summary'], bin_size, LEAGUE_MIN_ATTEMPTS)
+        add_relative_trace(fig, attempts, makes, fg_pct, league_pct, bin_size)
+        
+        # Diferencia por grupo de zonas, con los intentos y anotados de la liga de cada grupo
+        league_attempts, league_makes = summary_zones(baseline['summary'])
+        player_group = group_counts(zone_makes) / np.maximum(group_counts(zone_attempts), 1)
+        league_group = group_counts(league_makes) / np.maximum(group_counts(league_attempts), 1)
+        stats = [
+            f"{ZONE_NAMES[group]}: {100 * (player_group[group] - league_group[group]):+.1f}"
+            for group in (PAINT, MID_RANGE, THREE) if group_counts(zone_attempts)[group]
+        ]
+        title = f"🏀 {title}<br><sub>FG% vs. liga {baseline['season']} (puntos): {' | '.join(stats)}</sub>"
+    elif baseline is None:
+        # Los promedios se precalculan fuera de las peticiones (baselines.py)
+        fig.add_annotation(
+            text="📊 Sin promedios de la liga para esta temporada",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5,
+            xanchor='center', yanchor='middle',
+            font=dict(size=16, color="#667eea"),
+            showarrow=False
+        )
+    
+    style_chart_layout(fig, title)
+    return fig
+
+def add_relative_trace(fig, attempts, makes, fg_pct, league_pct, bin_size=EFFICIENCY_BIN_SIZE):
+    """Celdas con muestra suficiente: tamaño = intentos, color = FG% del jugador menos el de la liga."""
+    x_centers, y_centers = bin_centers(bin_size)
+    iy, ix = np.nonzero(~np.isnan(fg_pct) & ~np.isnan(league_pct))
+    if len(ix) == 0:
+        return fig
+    
+    cell_attempts = attempts[iy, ix]
+    sizes = 4 + 14 * np.sqrt(cell_attempts / cell_attempts.max())
+    
+    fig.add_trace(go.Scatter(
+        x=x_centers[ix],
+        y=y_centers[iy],
+        mode='markers',
+        name='FG% vs. liga',
+        marker=dict(
+            symbol='square',
+            size=np.round(sizes, 1),
+            color=np.round(fg_pct[iy, ix] - league_pct[iy, ix], 3),
+            colorscale='RdBu',
+            reversescale=True,
+            cmin=-RELATIVE_RANGE,
+            cmax=RELATIVE_RANGE,
+            opacity=0.9,
+            colorbar=dict(title='vs. liga', tickformat='+.0%', thickness=12, len=0.6)
+        ),
+        customdata=np.column_stack([
+            np.round(fg_pct[iy, ix], 3), np.round(league_pct[iy, ix], 3), cell_attempts, makes[iy, ix]
+        ]),
+        hovertemplate='Diferencia: %{marker.color:+.1%}<br>' +
+                      'FG%: %{customdata[0]:.1%} (liga %{customdata[1]:.1%})<br>' +
+                      'Intentos: %{customdata[2]}<br>' +
+                      'Anotados: %{customdata[3]}<extra></extra>',
+        showlegend=False
+    ))
+    return fig
+
+# Comparación: como mucho MAX_COMPARE_SERIES series, en una rejilla de COMPARE_COLUMNS columnas
+MAX_COMPARE_SERIES = 8
+COMPARE_COLUMNS = 2
+COMPARE_ROW_HEIGHT = 330
+COMPARE_GAP = 0.02
+SERIES_COLORS = ('#E74C3C', '#3498DB', '#2ECC71', '#F39C12', '#9B59B6', '#1ABC9C', '#E67E22', '#34495E')
+
+def series_slices(shots):
+    """(etiqueta, slice de filas) de cada serie de un ShotStore combinado (meta['series'])."""
+    start = 0
+    slices = []
+    for series in shots.meta.get('series') or [{'label': '', 'count': len(shots)}]:
+        slices.append((series['label'], slice(start, start + series['count'])))
+        start += series['count']
+    return slices
+
+def plot_comparison_chart(data, title="Comparación", theme='light', mode='side',
+                          bin_size=EFFICIENCY_BIN_SIZE, min_attempts=EFFICIENCY_MIN_ATTEMPTS):
+    """
+    Compara varias series (jugadores y/o temporadas) de un ShotStore combinado.
+    mode='side': una cancha por serie con el FG% por celdas (escala de color común).
+    mode='overlay': una sola cancha con el volumen de tiros por celda, un color por serie.
+    """
+    shots = as_shot_store(data)
+    slices = series_slices(shots)[:MAX_COMPARE_SERIES]
+    if mode == 'overlay':
+        fig = court_figure(theme)
+        add_overlay_traces(fig, shots, slices, bin_size)
+    else:
+        fig = comparison_figure(theme, [label for label, _ in slices])
+        for i, (label, rows) in enumerate(slices):
+            series = shots.take(rows)
+            if series.empty:
+                continue
+            attempts, makes, fg_pct = aggregate_shots(
+                series['loc_x'], series['loc_y'], series['made'], bin_size, min_attempts
+            )
+            add_efficiency_trace(fig, attempts, makes, fg_pct, bin_size, axes=_axes_suffix(i))
+
+    made = shots['made']
+    stats = [
+        f"{label}: {made[rows].mean():.1%} ({rows.stop - rows.start})" if rows.stop > rows.start
+        else f"{label}: sin tiros"
+        for label, rows in slices
+    ]
+    # FG% e intentos de cada serie, COMPARE_COLUMNS por línea
+    summary = '<br>'.join(' | '.join(stats[i:i + COMPARE_COLUMNS]) for i in range(0, len(stats), COMPARE_COLUMNS))
+    style_chart_layout(fig, f"🏀 {title}<br><sub>{summary}</sub>")
+    if mode != 'overlay':
+        n_rows = math.ceil(len(slices) / COMPARE_COLUMNS)
+        fig.update_layout(height=140 + COMPARE_ROW_HEIGHT * n_rows)
+    return fig
+
+def _axes_suffix(i):
+    return '' if i == 0 else str(i + 1)
+
+def comparison_figure(theme, labels):
+    """Figura con un subplot de cancha por serie en una rejilla de COMPARE_COLUMNS columnas."""
+    fig = court_figure(theme)
+    n_cols = min(len(labels), COMPARE_COLUMNS) or 1
+    n_rows = math.ceil(len(labels) / n_cols) or 1
+    axes = [_axes_suffix(i) for i in range(len(labels))] or ['']
+
+    layout = dict(court_template(theme, tuple(axes)))
+    annotations = []
+    for i, (suffix, label) in enumerate(zip(axes, labels)):
+        row, col = divmod(i, n_cols)
+        x_domain = [col / n_cols + COMPARE_GAP, (col + 1) / n_cols - COMPARE_GAP]
+        y_domain = [1 - (row + 1) / n_rows + COMPARE_GAP, 1 - row / n_rows - 3 * COMPARE_GAP]
+        layout[f'xaxis{suffix}'] = dict(layout[f'xaxis{suffix}'], domain=x_domain, anchor=f'y{suffix}')
+        layout[f'yaxis{suffix}'] = dict(layout[f'yaxis{suffix}'], domain=y_domain, anchor=f'x{suffix}')
+        annotations.append(dict(
+            text=f"<b>{label}</b>", showarrow=False,
+            xref='paper', yref='paper', x=sum(x_domain) / 2, y=y_domain[1],
+            xanchor='center', yanchor='bottom', font=dict(size=13, color='#2C3E50')
+        ))
+    layout['annotations'] = annotations
+    # court_axes permite reconstruir la cancha de cada subplot en el navegador
+    layout['meta'] = dict(court_theme=theme, court_axes=axes)
+    fig.update_layout(layout)
+    return fig
+
+def add_overlay_traces(fig, shots, slices, bin_size=EFFICIENCY_BIN_SIZE):
+    """Una capa de marcadores por serie: tamaño = % de los intentos de la serie en la celda."""
+    x_centers, y_centers = bin_centers(bin_size)
+    for i, (label, rows) in enumerate(slices):
+        series = shots.take(rows)
+        if series.empty:
+            continue
+        attempts, makes, fg_pct = aggregate_shots(series['loc_x'], series['loc_y'], series['made'], bin_size)
+        iy, ix = np.nonzero(attempts)
+        share = attempts[iy, ix] / len(series)
+        fig.add_trace(go.Scatter(
+            x=x_centers[ix],
+            y=y_centers[iy],
+            mode='markers',
+            name=label,
+            marker=dict(
+                color=SERIES_COLORS[i % len(SERIES_COLORS)],
+                size=np.round(3 + 30 * np.sqrt(share / share.max()), 1),
+                opacity=0.55,
+                line=dict(width=0)
+            ),
+            customdata=np.column_stack([attempts[iy, ix], makes[iy, ix]]),
+            hovertemplate=f'<b>{label}</b><br>' +
+                          'Intentos: %{customdata[0]}<br>' +
+                          'Anotados: %{customdata[1]}<extra></extra>',
+        ))
+    return fig
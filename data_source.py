@@ -0,0 +1,148 @@
+# data_source.py
+
+import os
+import random
+import time
+import zlib
+
+from upstream import ensure_session, upstream_timeout
+
+# 'nba' (stats.nba.com a través de nba_api) o 'local' (respuestas grabadas o sintéticas, sin red)
+DATA_SOURCE = os.environ.get("DATA_SOURCE", "nba")
+# Configuración de la fuente local
+LOCAL_SOURCE_DIR = os.environ.get("LOCAL_SOURCE_DIR", "")  # grabaciones de replay.py; vacío = solo sintéticas
+LOCAL_SOURCE_LATENCY = float(os.environ.get("LOCAL_SOURCE_LATENCY_MS", 0)) / 1000
+LOCAL_SOURCE_JITTER = float(os.environ.get("LOCAL_SOURCE_JITTER_MS", 0)) / 1000
+LOCAL_SOURCE_ERROR_RATE = float(os.environ.get("LOCAL_SOURCE_ERROR_RATE", 0))
+LOCAL_SOURCE_SHOTS = int(os.environ.get("LOCAL_SOURCE_SHOTS", 1500))
+
+
+def _date_param(date_from):
+    """Fecha YYYYMMDD (int) en el formato MM/DD/YYYY de stats.nba.com."""
+    return f"{date_from // 100 % 100:02d}/{date_from % 100:02d}/{date_from // 10000}"
+
+
+class DataSource:
+    """
+    Origen de los datos de get_data: tiros de ShotChartDetail como DataFrame y
+    las listas estáticas de jugadores y equipos (mismas claves que nba_api).
+    """
+
+    def shot_chart(self, player_id, team_id, season, context_measure='FGA', date_from=None):
+        raise NotImplementedError
+
+    def players(self):
+        from nba_api.stats.static import players
+        return players.get_players()
+
+    def teams(self):
+        from nba_api.stats.static import teams
+        return teams.get_teams()
+
+    def find_player(self, full_name):
+        from nba_api.stats.static import players
+        return players.find_players_by_full_name(full_name)
+
+    def find_team(self, full_name):
+        from nba_api.stats.static import teams
+        return teams.find_teams_by_full_name(full_name)
+
+
+class NBAApiSource(DataSource):
+    """stats.nba.com a través de ShotChartDetail (o una clase compatible, p. ej. las de replay.py)."""
+
+    def __init__(self, endpoint=None):
+        self.endpoint = endpoint
+
+    def shot_chart(self, player_id, team_id, season, context_measure='FGA', date_from=None):
+        endpoint = self.endpoint
+        if endpoint is None:
+            # Imported lazily: nba_api.stats.endpoints loads every endpoint module
+            from nba_api.stats.endpoints import shotchartdetail
+            endpoint = shotchartdetail.ShotChartDetail
+        # Sesión keep-alive compartida y timeouts explícitos: una respuesta lenta no bloquea el worker
+        ensure_session()
+        kwargs = {'timeout': upstream_timeout()}
+        if date_from is not None:
+            kwargs['date_from_nullable'] = _date_param(date_from)
+        shot_chart = endpoint(
+            team_id=team_id,
+            player_id=player_id,
+            season_nullable=season,    # NBA season format: 'YYYY-YY'
+            context_measure_simple=context_measure,
+            **kwargs,
+        )
+        return shot_chart.shot_chart_detail.get_data_frame()
+
+
+class LocalSource(DataSource):
+    """
+    Sustituto local de stats.nba.com para pruebas de carga: sirve las grabaciones
+    de directory si existen y si no tiros sintéticos deterministas por combinación,
+    con una latencia (más jitter) y una tasa de errores configurables.
+    """
+
+    def __init__(self, directory=LOCAL_SOURCE_DIR, latency=LOCAL_SOURCE_LATENCY, jitter=LOCAL_SOURCE_JITTER,
+                 error_rate=LOCAL_SOURCE_ERROR_RATE, shots=LOCAL_SOURCE_SHOTS):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.shots = shots
+
+    def _simulate_network(self):
+        # Generador global de random: se vuelve a sembrar en cada proceso hijo (los jobs son forks)
+        time.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0))
+        if random.random() < self.error_rate:
+            import requests
+            raise requests.exceptions.ReadTimeout("local data source: simulated upstream timeout")
+
+    def _recorded(self, player_id, team_id, season, context_measure):
+        from replay import recording_name, replay_endpoint
+        if not self.directory or not os.path.exists(os.path.join(
+                self.directory, recording_name(player_id, team_id, season, context_measure))):
+            return None
+        return NBAApiSource(replay_endpoint(self.directory)).shot_chart(player_id, team_id, season, context_measure)
+
+    def _synthetic(self, player_id, team_id, season, context_measure):
+        from benchmarks.synthetic import synthetic_frame
+        seed = zlib.crc32(f"{player_id}_{team_id}_{season}_{context_measure}".encode())
+        frame = synthetic_frame(self.shots, seed=seed)
+        frame['PLAYER_ID'] = player_id
+        if team_id:
+            frame['TEAM_ID'] = team_id
+        return frame
+
+    def shot_chart(self, player_id, team_id, season, context_measure='FGA', date_from=None):
+        self._simulate_network()
+        frame = self._recorded(player_id, team_id, season, context_measure)
+        if frame is None:
+            frame = self._synthetic(player_id, team_id, season, context_measure)
+        if date_from is not None and not frame.empty:
+            frame = frame[frame['GAME_DATE'].astype(int) >= date_from]
+        return frame
+
+
+def create_source(name=DATA_SOURCE):
+    if name == 'local':
+        return LocalSource()
+    if name == 'nba':
+        return NBAApiSource()
+    raise ValueError(f"DATA_SOURCE desconocido: {name!r} (usar 'nba' o 'local')")
+
+
+_source = None
+
+
+def get_source():
+    """Fuente de datos activa (la de DATA_SOURCE salvo que se cambie con set_source)."""
+    global _source
+    if _source is None:
+        _source = create_source()
+    return _source
+
+
+def set_source(source):
+    """Sustituye la fuente de datos del proceso (p. ej. por una LocalSource en pruebas de carga)."""
+    global _source
+    _source = source
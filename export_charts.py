@@ -0,0 +1,295 @@
+# export_charts.py
+"""
+Exporta en lote los gráficos de tiros a archivos: PNG/SVG con matplotlib
+(draw_court) y HTML interactivo con Plotly (plot_shot_chart / plot_efficiency_chart).
+
+Uso:
+    python export_charts.py --seasons 2024-25 --teams "Dallas Mavericks" --formats png html
+    python export_charts.py --seasons 2024-25 --workers 8 --out exports/ --replay recordings/
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from aggregation import aggregate_shots, bin_centers, fg_percentage, summary_bins
+from cache import CACHE_DIR
+from charts import (COURT_THEMES, SHOT_TRACE_STYLES, EFFICIENCY_BIN_SIZE, EFFICIENCY_MIN_ATTEMPTS,
+                    court_template, draw_court, plot_efficiency_chart, plot_shot_chart,
+                    shot_summary)
+from get_data import get_players_list, get_player_id, get_team_id, get_shooting_chart_data
+from zones import classify_shots
+
+EXPORT_DIR = os.environ.get(
+    "EXPORT_DIR",
+    os.path.join(os.path.dirname(CACHE_DIR), "exports")
+)
+FORMATS = ('png', 'svg', 'html')
+VIEWS = ('shots', 'efficiency')
+MANIFEST_NAME = 'manifest.json'
+
+# Marcadores de matplotlib equivalentes a los de Plotly
+MPL_MARKERS = {'circle': 'o', 'star': '*', 'diamond': 'D'}
+RASTER_SIZE = (6, 7)  # pulgadas, misma proporción que los gráficos de Plotly (600x700)
+RASTER_DPI = 150
+
+# Estado de cada proceso del pool (se crea una vez en _init_worker)
+_worker = {}
+
+
+class RasterCourt:
+    """
+    Figura de matplotlib con la cancha ya dibujada. Cada gráfico añade sus
+    artistas, se guarda y los quita, así la cancha se dibuja una sola vez por proceso.
+    """
+
+    def __init__(self, theme='light'):
+        import matplotlib.pyplot as plt
+
+        style = COURT_THEMES[theme]
+        self.figure, self.ax = plt.subplots(figsize=RASTER_SIZE)
+        self.figure.patch.set_facecolor('white')
+        self.ax.set_facecolor(style['background'])
+        draw_court(self.ax, color=style['court_color'], lw=1.5, outer_lines=True)
+        self.ax.set_xlim(-250, 250)
+        self.ax.set_ylim(-47.5, 422.5)
+        self.ax.set_aspect('equal')
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        self._base = (set(self.ax.patches), set(self.ax.collections))
+        # Eje fijo para la barra de color de la vista de eficiencia (oculto en el resto)
+        self.colorbar_ax = self.figure.add_axes([0.92, 0.3, 0.025, 0.4])
+        self.colorbar_ax.set_visible(False)
+
+    def reset(self):
+        """Quita lo añadido por el gráfico anterior y deja solo la cancha."""
+        patches, collections = self._base
+        for artist in [a for a in self.ax.collections if a not in collections] + \
+                      [a for a in self.ax.patches if a not in patches]:
+            artist.remove()
+        if self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        self.colorbar_ax.clear()
+        self.colorbar_ax.set_visible(False)
+
+    def draw_shots(self, data):
+        """Tiros anotados por zona, con los mismos colores que plot_shot_chart."""
+        made = data.take(data['made'])
+        if made.empty:
+            return
+        loc_x, loc_y = made['loc_x'], made['loc_y']
+        _, zone, _ = classify_shots(loc_x, loc_y)
+        for name, zone_ids, color, size, symbol, _ in SHOT_TRACE_STYLES:
+            mask = np.isin(zone, zone_ids)
+            if mask.any():
+                self.ax.scatter(loc_x[mask], loc_y[mask], s=size ** 2 * 0.5, c=color,
+                                marker=MPL_MARKERS[symbol], edgecolors='white', linewidths=0.8,
+                                alpha=0.8, label=name)
+        self.ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.01), ncol=3, frameon=False)
+
+    def draw_efficiency(self, data, bin_size=EFFICIENCY_BIN_SIZE, min_attempts=EFFICIENCY_MIN_ATTEMPTS):
+        """Celdas con tamaño = intentos y color = FG%, como plot_efficiency_chart."""
+        summary = shot_summary(data)
+        binned = summary_bins(summary, bin_size) if summary is not None else None
+        if binned is not None:
+            attempts, makes = binned
+            fg_pct = fg_percentage(attempts, makes, min_attempts)
+        else:
+            attempts, _, fg_pct = aggregate_shots(data['loc_x'], data['loc_y'], data['made'],
+                                                  bin_size, min_attempts)
+        iy, ix = np.nonzero(~np.isnan(fg_pct))
+        if len(ix) == 0:
+            return
+        x_centers, y_centers = bin_centers(bin_size)
+        cell_attempts = attempts[iy, ix]
+        sizes = 4 + 14 * np.sqrt(cell_attempts / cell_attempts.max())
+        points = self.ax.scatter(x_centers[ix], y_centers[iy], s=sizes ** 2 * 0.5, c=fg_pct[iy, ix],
+                                 cmap='RdYlGn', vmin=0.25, vmax=0.65, marker='s', alpha=0.9)
+        from matplotlib.ticker import PercentFormatter
+        self.colorbar_ax.set_visible(True)
+        colorbar = self.figure.colorbar(points, cax=self.colorbar_ax, format=PercentFormatter(1.0, decimals=0))
+        colorbar.set_label('FG%')
+
+    def save(self, path, title, view, data):
+        self.reset()
+        if view == 'efficiency':
+            self.draw_efficiency(data)
+        else:
+            self.draw_shots(data)
+        self.ax.set_title(title, fontsize=12, fontweight='bold')
+        self.figure.savefig(path, dpi=RASTER_DPI, bbox_inches='tight')
+
+
+def _init_worker(replay_dir, theme):
+    """Inicializa cada proceso: backend sin pantalla, endpoint y plantillas de la cancha."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+    _worker['theme'] = theme
+    _worker['endpoint'] = None
+    if replay_dir:
+        from replay import replay_endpoint
+        _worker['endpoint'] = replay_endpoint(replay_dir)
+    court_template(theme)
+    _worker['raster'] = RasterCourt(theme)
+
+
+def slugify(value):
+    return re.sub(r'[^A-Za-z0-9]+', '-', value).strip('-').lower()
+
+
+def output_paths(job, views, formats):
+    """Rutas relativas (vista, formato) -> archivo de una combinación."""
+    player, player_id, team_id, season = job
+    base = f"{slugify(player)}_{player_id}_{team_id}"
+    return {f"{view}.{fmt}": os.path.join(season, f"{base}_{view}.{fmt}")
+            for view in views for fmt in formats}
+
+
+def export_job(job, views, formats, out_dir, previous=None):
+    """
+    Exporta todas las vistas y formatos de una combinación con una sola lectura
+    de los datos. Si la versión de los datos coincide con la del manifiesto
+    anterior y los archivos existen, no se vuelve a dibujar.
+    """
+    start = time.perf_counter()
+    player, player_id, team_id, season = job
+    data = get_shooting_chart_data(player_id, team_id, season, endpoint=_worker['endpoint'])
+    files = output_paths(job, views, formats)
+    entry = {
+        'player': player, 'player_id': player_id, 'team_id': team_id, 'season': season,
+        'shots': len(data), 'version': data.version, 'files': files,
+    }
+    if (previous and previous.get('version') == data.version and previous.get('files') == files
+            and all(os.path.exists(os.path.join(out_dir, path)) for path in files.values())):
+        return dict(entry, status='unchanged', seconds=time.perf_counter() - start)
+
+    title = f"{player} · {season}"
+    for view in views:
+        if 'html' in formats:
+            if view == 'efficiency':
+                fig = plot_efficiency_chart(data, title=title, theme=_worker['theme'])
+            else:
+                fig = plot_shot_chart(data, title=title, theme=_worker['theme'])
+            # plotly.min.js se copia una vez por directorio antes de arrancar el pool
+            fig.write_html(os.path.join(out_dir, files[f"{view}.html"]), include_plotlyjs='directory')
+        for fmt in formats:
+            if fmt != 'html':
+                _worker['raster'].save(os.path.join(out_dir, files[f"{view}.{fmt}"]), title, view, data)
+    return dict(entry, status='exported', seconds=time.perf_counter() - start)
+
+
+def build_jobs(player_names, team_names, seasons):
+    """Combinaciones (jugador, player_id, team_id, temporada); sin equipos se usa team_id 0 (cualquiera)."""
+    team_ids = [get_team_id(name) for name in team_names] if team_names else [0]
+    return [(name, get_player_id(name), team_id, season)
+            for season in seasons
+            for name in player_names
+            for team_id in team_ids]
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'charts': {}}
+
+
+def write_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def export_charts(jobs, views=VIEWS, formats=('png',), out_dir=EXPORT_DIR, workers=None,
+                  theme='light', replay_dir=None, force=False):
+    """
+    Exporta las combinaciones en un pool de procesos (uno por núcleo por defecto).
+    Los procesos comparten la caché de tiros en disco; el manifiesto registra
+    cada combinación con su versión de datos, archivos y tiempo. Devuelve (exportadas, sin cambios, fallidas).
+    """
+    # Con force se vuelve a dibujar todo, pero el manifiesto conserva las combinaciones que no se piden ahora
+    charts = load_manifest(out_dir).get('charts', {})
+
+    if 'html' in formats:
+        from plotly.offline import get_plotlyjs
+        bundle = get_plotlyjs()
+    for season in sorted({job[3] for job in jobs}):
+        os.makedirs(os.path.join(out_dir, season), exist_ok=True)
+        bundle_path = os.path.join(out_dir, season, 'plotly.min.js')
+        if 'html' in formats and not os.path.exists(bundle_path):
+            with open(bundle_path, 'w', encoding='utf-8') as f:
+                f.write(bundle)
+
+    exported = unchanged = failed = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(replay_dir, theme)) as pool:
+        futures = {}
+        for job in jobs:
+            key = f"{job[1]}_{job[2]}_{job[3]}"
+            previous = None if force else charts.get(key)
+            futures[pool.submit(export_job, job, views, formats, out_dir, previous)] = (key, job)
+        for future in as_completed(futures):
+            key, job = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"✗ {job[0]} {job[3]}: {e}", file=sys.stderr)
+                continue
+            charts[key] = entry
+            if entry['status'] == 'unchanged':
+                unchanged += 1
+            else:
+                exported += 1
+            print(f"✓ {job[0]} {job[3]}: {entry['status']} ({entry['seconds']:.2f}s, "
+                  f"{exported + unchanged + failed}/{len(jobs)})", file=sys.stderr)
+
+    write_manifest(out_dir, {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'views': list(views),
+        'formats': list(formats),
+        'theme': theme,
+        'seconds': round(time.perf_counter() - started, 3),
+        'charts': charts,
+    })
+    return exported, unchanged, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta gráficos de tiros a PNG/SVG/HTML.")
+    parser.add_argument('--seasons', nargs='+', required=True, help="Temporadas 'YYYY-YY'")
+    parser.add_argument('--players', nargs='*', help="Nombres de jugadores (por defecto, todos los activos)")
+    parser.add_argument('--teams', nargs='*', help="Nombres de equipos (por defecto, cualquier equipo)")
+    parser.add_argument('--views', nargs='+', default=list(VIEWS), choices=VIEWS)
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=FORMATS)
+    parser.add_argument('--theme', default='light', choices=sorted(COURT_THEMES))
+    parser.add_argument('--out', default=EXPORT_DIR, help="Directorio de salida")
+    parser.add_argument('--workers', type=int, help="Procesos (por defecto, uno por núcleo)")
+    parser.add_argument('--force', action='store_true', help="Vuelve a dibujar aunque los datos no cambiaran")
+    parser.add_argument('--replay', help="Directorio con respuestas grabadas (sin red)")
+    args = parser.parse_args(argv)
+
+    jobs = build_jobs(args.players or get_players_list(), args.teams, args.seasons)
+    print(f"{len(jobs)} combinaciones en {args.out}", file=sys.stderr)
+
+    exported, unchanged, failed = export_charts(
+        jobs, views=args.views, formats=args.formats, out_dir=args.out, workers=args.workers,
+        theme=args.theme, replay_dir=args.replay, force=args.force
+    )
+    print(f"Exportadas: {exported} | Sin cambios: {unchanged} | Fallidas: {failed}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
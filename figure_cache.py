@@ -0,0 +1,76 @@
+# figure_cache.py
+
+import hashlib
+import os
+
+from cache import CACHE_DIR, ForkSafeCache
+from metrics import metrics
+from singleflight import file_lock, shared_failure
+
+FIGURE_CACHE_DIR = os.environ.get(
+    "FIGURE_CACHE_DIR",
+    os.path.join(os.path.dirname(CACHE_DIR), "figures")
+)
+MAX_FIGURE_CACHE_BYTES = int(os.environ.get("FIGURE_CACHE_MAX_MB", 128)) * 1024 * 1024
+
+
+def content_etag(payload):
+    """ETag fuerte a partir del hash del JSON serializado."""
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+class FigureCache:
+    """
+    Caché de figuras ya serializadas (JSON en bytes) compartida entre procesos,
+    con expulsión LRU por tamaño total. La clave incluye la versión de los datos,
+    así que refrescar la entrada de tiros genera una figura nueva; la anterior de
+    la misma selección se borra al guardar la nueva.
+    """
+
+    def __init__(self, directory=FIGURE_CACHE_DIR, max_bytes=MAX_FIGURE_CACHE_BYTES):
+        self.cache = ForkSafeCache(
+            directory,
+            size_limit=max_bytes,
+            eviction_policy='least-recently-used',
+        )
+
+    def get(self, selection, version):
+        """Devuelve (etag, payload) o None."""
+        return self.cache.get(('figure',) + tuple(selection) + (version,))
+
+    def set(self, selection, version, payload):
+        """Guarda el JSON de la figura e invalida la versión anterior de la selección."""
+        selection = tuple(selection)
+        etag = content_etag(payload)
+        with self.cache.transact():
+            previous = self.cache.get(('current',) + selection)
+            if previous is not None and previous != version:
+                self.cache.delete(('figure',) + selection + (previous,))
+            self.cache.set(('figure',) + selection + (version,), (etag, payload))
+            self.cache.set(('current',) + selection, version)
+        return etag
+
+    def get_or_build(self, selection, version, build):
+        """
+        Devuelve (etag, payload) de la caché o lo construye con build() -> bytes.
+        Las peticiones idénticas concurrentes (hilos de un worker o jobs en procesos
+        distintos) construyen la figura una sola vez: las demás esperan el lock y la
+        leen, o reciben el error del primero (ver singleflight.shared_failure).
+        """
+        cached = self.get(selection, version)
+        if cached is not None:
+            metrics.inc('figure_cache_requests_total', result='hit')
+            return cached
+        name = ('figure',) + tuple(selection) + (version,)
+        with file_lock(name):
+            cached = self.get(selection, version)
+            if cached is not None:
+                metrics.inc('figure_cache_requests_total', result='coalesced')
+                return cached
+            metrics.inc('figure_cache_requests_total', result='miss')
+            with shared_failure(name):
+                payload = build()
+            return self.set(selection, version, payload), payload
+
+
+figure_cache = FigureCache()
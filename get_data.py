@@ -1,41 +1,213 @@
-from nba_api.stats.static import players
-from nba_api.stats.static import teams
-from nba_api.stats.endpoints import shotchartdetail
-import pandas as pd
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.metadata import version
+
+from aggregation import summarize_shots, merge_summaries, summary_matches
+from data_source import NBAApiSource, get_source
+from cache import shot_cache, current_season, CACHE_DIR
+from name_index import NameIndex
+from shot_index import filter_shots
+from shot_store import ShotStore
+from singleflight import file_lock, shared_failure
+from metrics import metrics
+from upstream import UPSTREAM_ERRORS, call_upstream
+
+# First season with shot location data in stats.nba.com
+FIRST_SHOT_CHART_SEASON = 1996
+# Concurrent ShotChartDetail requests for comparison charts
+COMPARE_MAX_WORKERS = int(os.environ.get("COMPARE_MAX_WORKERS", 6))
+
+# Compact [id, full_name] index used by the dropdowns, built once and loaded at startup
+DROPDOWN_INDEX_PATH = os.environ.get(
+    "DROPDOWN_INDEX_PATH",
+    os.path.join(os.path.dirname(CACHE_DIR), "dropdown_index.json")
+)
+
+def build_dropdown_index(path=DROPDOWN_INDEX_PATH):
+    """Function to build the dropdown index from the data source static lists and save it to disk"""
+    index = {
+        'nba_api': version('nba_api'),
+        'players': [[p['id'], p['full_name']] for p in get_source().players() if p['is_active']],
+        'teams': [[t['id'], t['full_name']] for t in get_source().teams()],
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return index
+
+@lru_cache(maxsize=1)
+def load_dropdown_index(path=DROPDOWN_INDEX_PATH):
+    """Function to load the dropdown index, rebuilding it if missing or built by another nba_api version"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('nba_api') == version('nba_api'):
+            return index
+    except (OSError, ValueError):
+        pass
+    return build_dropdown_index(path)
 
 def get_players_list():
-    """Function to return all NBA players full names"""
-    nba_players = players.get_players()
-    nba_players_df = pd.DataFrame(nba_players)
-    nba_active_players = nba_players_df[nba_players_df['is_active']== True]
-    players_list = nba_active_players['full_name'].tolist()
-    return players_list
+    """Function to return all active NBA players full names"""
+    return [name for _, name in load_dropdown_index()['players']]
 
 def get_teams_list():
     """Function to return all NBA teams full names"""
-    nba_teams = teams.get_teams()
-    nba_teams_df = pd.DataFrame(nba_teams)
-    teams_list = nba_teams_df['full_name'].tolist()
-    return teams_list
+    return [name for _, name in load_dropdown_index()['teams']]
+
+@lru_cache(maxsize=1)
+def player_index():
+    """Function to return the in-memory name index of active players"""
+    return NameIndex(load_dropdown_index()['players'])
+
+@lru_cache(maxsize=1)
+def team_index():
+    """Function to return the in-memory name index of teams"""
+    return NameIndex(load_dropdown_index()['teams'])
+
+def get_seasons_list(today=None):
+    """Function to return every season with shot chart data, newest first ('2024-25', '2023-24', ...)"""
+    last = int(current_season(today)[:4])
+    return [f"{year}-{(year + 1) % 100:02d}" for year in range(last, FIRST_SHOT_CHART_SEASON - 1, -1)]
 
 def get_player_id(player_full_name):
-    player_info = players.find_players_by_full_name(player_full_name)
+    player_id = player_index().lookup(player_full_name)
+    if player_id is not None:
+        return player_id
+    # Not an active player: fall back to the full static list scan
+    player_info = get_source().find_player(player_full_name)
     return player_info[0].get('id')
 
 def get_team_id (team_full_name):
-    team_info = teams.find_teams_by_full_name(team_full_name)
+    team_id = team_index().lookup(team_full_name)
+    if team_id is not None:
+        return team_id
+    team_info = get_source().find_team(team_full_name)
     return team_info[0].get('id')
 
-def get_shooting_chart_data(player_id, team_id, season_nullable):
-    """Function to get shooting chart data"""
-    shot_chart = shotchartdetail.ShotChartDetail(
-        team_id=team_id,
-        player_id=player_id,
-        season_nullable=season_nullable,    # NBA season format: 'YYYY-YY'
-    )
-    return shot_chart.shot_chart_detail.get_data_frame()
+def fetch_shots(player_id, team_id, season_nullable, context_measure='FGA', endpoint=None, date_from=None):
+    """
+    Function to fetch shots from the active data source (or from a ShotChartDetail-compatible endpoint class)
+    as a ShotStore; date_from (a YYYYMMDD int) limits the request to games since that day.
+    Transient errors are retried with backoff behind the shared circuit breaker
+    """
+    source = NBAApiSource(endpoint) if endpoint is not None else get_source()
+    with metrics.timed('fetch'):
+        # Inclusive: games still in progress on that day are fetched again and deduplicated
+        frame = call_upstream(
+            lambda: source.shot_chart(player_id, team_id, season_nullable, context_measure, date_from=date_from),
+            endpoint='shotchartdetail'
+        )
+    # Keep only the compact columnar form (int16 coordinates, shared string dictionary)
+    with metrics.timed('transform'):
+        return ShotStore.from_frame(frame)
+
+def summarize_store(data):
+    """Function to compute the additive per-zone / per-bin summary of a ShotStore"""
+    return summarize_shots(data['loc_x'], data['loc_y'], data['made'])
+
+def with_summary(data, summary):
+    """Function to store the summary and the latest game date in the ShotStore meta"""
+    data.meta['summary'] = summary
+    data.meta['latest_game_date'] = int(data['game_date'].max()) if not data.empty else None
+    data.version  # Content hash stored in the header, identifies this refresh
+    return data
+
+def merge_new_shots(stale, new):
+    """
+    Function to append newly fetched shots to a cached ShotStore. Rows are deduplicated by
+    (game_id, game_event_id) keeping the new copy, and the summary is updated with only the
+    added and replaced rows instead of re-aggregating the whole season
+    """
+    summary = stale.meta.get('summary')
+    if not summary_matches(summary, len(stale)):
+        summary = summarize_store(stale)  # Entries cached before this summary format
+    merged = ShotStore.concat([stale, new])
+    keep = merged.last_occurrence()
+    replaced = ~keep[:len(stale)]
+    added = keep[len(stale):]
+    if not replaced.any() and added.all():
+        merged_summary = merge_summaries(summary, added=summarize_store(new))
+    else:
+        merged = merged.take(keep)
+        merged_summary = merge_summaries(summary, added=summarize_store(new.take(added)),
+                                         removed=summarize_store(stale.take(replaced)))
+    return with_summary(merged, merged_summary)
+
+def get_shooting_chart_data(player_id, team_id, season_nullable, context_measure='FGA', endpoint=None):
+    """
+    Function to get shooting chart data, made and missed shots, as a ShotStore (served from the on-disk cache when fresh).
+    An expired entry is refreshed incrementally: only games since its latest game date are fetched and merged.
+    If stats.nba.com is failing (or the circuit breaker is open) the expired entry is served as is, with meta['stale']
+    """
+    key = (player_id, team_id, season_nullable, context_measure)
+    data = shot_cache.get(*key)
+    if data is not None:
+        metrics.inc('shot_cache_requests_total', result='hit')
+        return data
+
+    # Only one worker fetches each key; the others wait and then read the cache
+    with file_lock(key):
+        data = shot_cache.get(*key)
+        if data is not None:
+            metrics.inc('shot_cache_requests_total', result='hit')
+            return data
 
+        # If the leader just failed, shared_failure raises its error instead of fetching again
+        stale = shot_cache.get(*key, stale=True)
+        if stale is not None and not stale.empty:
+            metrics.inc('shot_cache_requests_total', result='refresh')
+            latest = stale.meta.get('latest_game_date') or int(stale['game_date'].max())
+            try:
+                with shared_failure(key):
+                    new = fetch_shots(*key, endpoint=endpoint, date_from=latest)
+            except UPSTREAM_ERRORS:
+                # Not saved: the next request tries the refresh again
+                metrics.inc('shot_cache_requests_total', result='stale')
+                stale.meta['stale'] = True
+                return stale
+            with metrics.timed('merge'):
+                data = merge_new_shots(stale, new)
+        else:
+            metrics.inc('shot_cache_requests_total', result='miss')
+            with shared_failure(key):
+                data = fetch_shots(*key, endpoint=endpoint)
+            data = with_summary(data, summarize_store(data))
+        shot_cache.set(*key, data)
+    return data
 
+def get_cached_chart_data(player_id, team_id, season_nullable, context_measure='FGA'):
+    """Function to read the cached ShotStore (even if expired) without calling the data source; None if not cached"""
+    return shot_cache.get(player_id, team_id, season_nullable, context_measure, stale=True)
 
+def get_comparison_data(selections, context_measure='FGA', max_workers=COMPARE_MAX_WORKERS, endpoint=None,
+                        filters=None, cached_only=False):
+    """
+    Function to fetch several (label, player_id, team_id, season) slices concurrently through a bounded
+    thread pool and merge them into one ShotStore; meta['series'] keeps each slice's label and row count.
+    filters are applied to each slice (see shot_index.normalize_filters); with cached_only the slices are
+    read from the cache and a missing one raises LookupError
+    """
+    def fetch(selection):
+        label, player_id, team_id, season = selection
+        if cached_only:
+            store = get_cached_chart_data(player_id, team_id, season, context_measure)
+            if store is None:
+                raise LookupError(f"{label}: sin datos en caché")
+        else:
+            store = get_shooting_chart_data(player_id, team_id, season, context_measure, endpoint=endpoint)
+        return filter_shots(store, filters)
 
+    # Latency is bounded by the slowest fetch instead of the sum of all of them
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(selections)))) as pool:
+        stores = list(pool.map(fetch, selections))
 
+    series = [{'label': label, 'count': len(store)} for (label, *_), store in zip(selections, stores)]
+    meta = {'series': series}
+    if any(store.meta.get('stale') for store in stores):
+        meta['stale'] = True
+    return ShotStore.concat(stores, meta=meta)
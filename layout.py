@@ -2,7 +2,9 @@
 
 import dash_bootstrap_components as dbc
 from dash import dcc, html
-from get_data import get_players_list, get_teams_list
+from get_data import get_teams_list, get_seasons_list
+from name_index import as_option
+from payload import empty_chart_payload
 
 layout = dbc.Container([
     # Header mejorado con gradiente y sombra
@@ -40,16 +42,19 @@ layout = dbc.Container([
                              style={'fontWeight': 'bold', 'color': '#555'}),
                     dcc.Dropdown(
                         id='player-dropdown',
-                        options=get_players_list(),  
-                        value='Luka Dončić',
-                        placeholder="Selecciona un jugador",
+                        # Solo la opción inicial: el resto se busca en el servidor al escribir
+                        options=[as_option('Luka Dončić')],
+                        value=['Luka Dončić'],
+                        # Varios jugadores (o temporadas) activan el modo comparación
+                        multi=True,
+                        placeholder="Escribe para buscar uno o varios jugadores",
                         className="mb-3",
                         style={
                             'borderRadius': '10px',
                             'border': '2px solid #e3f2fd'
                         }
                     ),
-                ], md=4),
+                ], md=3),
 
                 dbc.Col([
                     html.Label("🏆 Equipo", 
@@ -59,14 +64,14 @@ layout = dbc.Container([
                         id='team-dropdown',
                         options=get_teams_list(),  
                         value='Dallas Mavericks',
-                        placeholder="Selecciona un equipo",
+                        placeholder="Selecciona un equipo (opcional al comparar)",
                         className="mb-3",
                         style={
                             'borderRadius': '10px',
                             'border': '2px solid #e8f5e8'
                         }
                     ),
-                ], md=4),
+                ], md=3),
 
                 dbc.Col([
                     html.Label("📅 Temporada", 
@@ -74,16 +79,125 @@ layout = dbc.Container([
                              style={'fontWeight': 'bold', 'color': '#555'}),
                     dcc.Dropdown(
                         id='season-dropdown',
-                        options=['2024-25', '2023-24'],
-                        value='2024-25',
-                        placeholder="Selecciona una temporada",
+                        options=get_seasons_list(),
+                        # La temporada más reciente (la lista va de la más nueva a la más antigua)
+                        value=[get_seasons_list()[0]],
+                        multi=True,
+                        placeholder="Selecciona una o varias temporadas",
                         className="mb-3",
                         style={
                             'borderRadius': '10px',
                             'border': '2px solid #fff3e0'
                         }
                     ),
-                ], md=4),
+                ], md=3),
+
+                dbc.Col([
+                    html.Label("📈 Vista", 
+                             className="mb-2",
+                             style={'fontWeight': 'bold', 'color': '#555'}),
+                    dcc.Dropdown(
+                        id='view-dropdown',
+                        options=[
+                            {'label': 'Tiros anotados', 'value': 'shots'},
+                            {'label': 'Eficiencia (FG%)', 'value': 'efficiency'},
+                            {'label': 'Eficiencia vs. liga', 'value': 'relative'},
+                        ],
+                        value='shots',
+                        clearable=False,
+                        className="mb-3",
+                        style={
+                            'borderRadius': '10px',
+                            'border': '2px solid #f3e5f5'
+                        }
+                    ),
+                    # Solo se usa con varios jugadores o temporadas
+                    dcc.Dropdown(
+                        id='compare-dropdown',
+                        options=[
+                            {'label': '🆚 Lado a lado', 'value': 'side'},
+                            {'label': '🆚 Superpuestos', 'value': 'overlay'},
+                        ],
+                        value='side',
+                        clearable=False,
+                        className="mb-3",
+                        style={
+                            'borderRadius': '10px',
+                            'border': '2px solid #f3e5f5'
+                        }
+                    ),
+                ], md=3),
+            ]),
+
+            # Filtros: se aplican sobre los tiros ya descargados, sin volver a llamar a stats.nba.com
+            dbc.Row([
+                dbc.Col([
+                    html.Label("⏱️ Periodo", 
+                             className="mb-2",
+                             style={'fontWeight': 'bold', 'color': '#555'}),
+                    dcc.Checklist(
+                        id='period-filter',
+                        options=[],
+                        value=[],
+                        inline=True,
+                        inputClassName="me-1",
+                        labelClassName="me-3"
+                    ),
+                    dbc.Switch(
+                        id='clutch-filter',
+                        label="Clutch (últimos 5 min.)",
+                        value=False,
+                        className="mt-2"
+                    ),
+                ], md=3),
+
+                dbc.Col([
+                    html.Label("🏹 Tipo de tiro", 
+                             className="mb-2",
+                             style={'fontWeight': 'bold', 'color': '#555'}),
+                    dcc.Dropdown(
+                        id='action-filter',
+                        options=[],
+                        multi=True,
+                        placeholder="Todos",
+                        className="mb-3",
+                        style={
+                            'borderRadius': '10px',
+                            'border': '2px solid #e3f2fd'
+                        }
+                    ),
+                ], md=3),
+
+                dbc.Col([
+                    html.Label("🆚 Rival", 
+                             className="mb-2",
+                             style={'fontWeight': 'bold', 'color': '#555'}),
+                    dcc.Dropdown(
+                        id='opponent-filter',
+                        options=[],
+                        multi=True,
+                        placeholder="Todos",
+                        className="mb-3",
+                        style={
+                            'borderRadius': '10px',
+                            'border': '2px solid #e8f5e8'
+                        }
+                    ),
+                ], md=3),
+
+                dbc.Col([
+                    html.Label("🗓️ Fechas", 
+                             className="mb-2",
+                             style={'fontWeight': 'bold', 'color': '#555'}),
+                    dcc.DatePickerRange(
+                        id='date-filter',
+                        display_format='DD/MM/YYYY',
+                        start_date_placeholder_text="Desde",
+                        end_date_placeholder_text="Hasta",
+                        clearable=True,
+                        className="mb-3"
+                    ),
+                ], md=3),
             ]),
 
             # Botón centrado con diseño atractivo
@@ -109,7 +223,11 @@ layout = dbc.Container([
                             'transition': 'all 0.3s ease',
                             'transform': 'translateY(0px)'
                         }
-                    )
+                    ),
+                    # Progreso del job en segundo plano
+                    html.Div(id="chart-progress",
+                             className="mt-2",
+                             style={'color': '#667eea', 'fontWeight': 'bold', 'minHeight': '1.5rem'})
                 ], className="text-center")
             ])
         ])
@@ -134,6 +252,8 @@ layout = dbc.Container([
                 color="#667eea",
                 style={'height': '60px'},
                 children=[
+                    # Payload del gráfico sin la cancha; court.render compone la figura en el navegador
+                    dcc.Store(id="chart-data", data=empty_chart_payload()),
                     dcc.Graph(
                         id="shot-chart",
                         style={
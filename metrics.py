@@ -0,0 +1,165 @@
+# metrics.py
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from cache import CACHE_DIR, ForkSafeCache
+
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR",
+    os.path.join(os.path.dirname(CACHE_DIR), "metrics")
+)
+# Cada proceso acumula en memoria y vuelca a la caché compartida como mucho cada FLUSH_INTERVAL segundos
+FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SHOTS_BUCKETS = (0, 100, 250, 500, 1000, 2000, 5000, 10000, 50000, 250000)
+BYTES_BUCKETS = (1e3, 5e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 5e6)
+
+# Métricas publicadas: nombre -> (tipo, ayuda, buckets)
+METRICS = {
+    'chart_stage_seconds': ('histogram', 'Duración de cada etapa de la generación de un gráfico.', LATENCY_BUCKETS),
+    'chart_requests_total': ('counter', 'Gráficos pedidos por vista y resultado.', None),
+    'chart_shots': ('histogram', 'Tiros por gráfico generado.', SHOTS_BUCKETS),
+    'chart_payload_bytes': ('histogram', 'Tamaño del JSON de cada figura serializada.', BYTES_BUCKETS),
+    'shot_cache_requests_total': ('counter', 'Lecturas de la caché de tiros (hit/miss/refresh/stale).', None),
+    'figure_cache_requests_total': ('counter', 'Lecturas de la caché de figuras (hit/coalesced/miss).', None),
+    'upstream_errors_total': ('counter', 'Errores al llamar a stats.nba.com (por intento).', None),
+    'upstream_retries_total': ('counter', 'Reintentos de llamadas a stats.nba.com tras un fallo transitorio.', None),
+    'upstream_breaker_opened_total': ('counter', 'Veces que se abrió el circuit breaker de stats.nba.com.', None),
+}
+
+
+class Registry:
+    """
+    Contadores e histogramas con etiquetas. Registrar una observación solo toca
+    un dict en memoria bajo un lock; los deltas se suman a la caché compartida
+    (workers web y procesos de los jobs) en flush(), así /metrics agrega todos
+    los procesos.
+    """
+
+    def __init__(self, directory=METRICS_DIR, flush_interval=FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._store = None
+        self._lock = threading.Lock()
+        # Funciones (etapa, segundos) llamadas al terminar cada bloque timed (p. ej. el perfilado)
+        self.stage_hooks = []
+        self._reset()
+
+    def _after_fork(self):
+        # Los deltas pendientes son del proceso padre y el lock pudo copiarse tomado
+        self._lock = threading.Lock()
+        self._store = None
+        self._reset()
+
+    def _reset(self):
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = time.monotonic()
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = ForkSafeCache(self.directory)
+        return self._store
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            # Buckets no acumulados (el último es +Inf) y la suma al final
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    break
+            else:
+                i = len(buckets)
+            histogram[i] += 1
+            histogram[-1] += value
+        self._maybe_flush()
+
+    @contextmanager
+    def timed(self, stage, **labels):
+        """Mide la duración del bloque en chart_stage_seconds{stage=...}, también si lanza una excepción."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('chart_stage_seconds', elapsed, stage=stage, **labels)
+            for hook in self.stage_hooks:
+                hook(stage, elapsed)
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Suma los deltas de este proceso a los totales compartidos."""
+        with self._lock:
+            counters, histograms = self._counters, self._histograms
+            self._reset()
+        if not counters and not histograms:
+            return
+
+        with self.store.transact():
+            totals = self.store.get('totals', {})
+            for key, value in counters.items():
+                totals[key] = totals.get(key, 0) + value
+            for key, histogram in histograms.items():
+                current = totals.get(key)
+                totals[key] = histogram if current is None else [a + b for a, b in zip(current, histogram)]
+            self.store.set('totals', totals)
+
+    def render(self):
+        """Totales de todos los procesos en el formato de texto de Prometheus."""
+        self.flush()
+        totals = self.store.get('totals', {})
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            series = sorted((labels, value) for (metric, labels), value in totals.items() if metric == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind == 'counter':
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (math.inf,), value[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound == math.inf else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+metrics = Registry()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=metrics._after_fork)
@@ -0,0 +1,66 @@
+# name_index.py
+
+import bisect
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_name(name):
+    """Forma normalizada de un nombre: sin acentos, en minúsculas y sin puntuación ('Luka Dončić' -> 'luka doncic')."""
+    folded = unicodedata.normalize('NFKD', name)
+    folded = ''.join(c for c in folded if not unicodedata.combining(c)).casefold()
+    folded = _NON_ALNUM.sub('', folded.replace('-', ' '))
+    return _SPACES.sub(' ', folded).strip()
+
+
+def as_option(name):
+    """Opción de dcc.Dropdown con clave de búsqueda sin acentos para el filtrado del navegador."""
+    return {'label': name, 'value': name, 'search': f"{name} {normalize_name(name)}"}
+
+
+class NameIndex:
+    """
+    Índice en memoria de nombres completos -> id.
+    Las búsquedas exactas (con o sin acentos) son O(1) con un dict; la búsqueda
+    por prefijo usa una lista ordenada de claves (nombre completo y cada apellido)
+    con bisect.
+    """
+
+    def __init__(self, entries):
+        self.ids = {}
+        prefix_keys = set()
+        for entity_id, full_name in entries:
+            key = normalize_name(full_name)
+            self.ids.setdefault(full_name, entity_id)
+            self.ids.setdefault(key, entity_id)
+
+            # Prefijos desde cada palabra: 'doncic' también encuentra 'Luka Dončić'
+            words = key.split(' ')
+            for i in range(len(words)):
+                prefix_keys.add((' '.join(words[i:]), full_name))
+        self.prefix_keys = sorted(prefix_keys)
+
+    def lookup(self, full_name):
+        """Id para un nombre completo (exacto o normalizado); None si no existe."""
+        entity_id = self.ids.get(full_name)
+        if entity_id is None:
+            entity_id = self.ids.get(normalize_name(full_name))
+        return entity_id
+
+    def search(self, query, limit=20):
+        """Nombres cuyo nombre completo o alguna de sus palabras empieza por query."""
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+
+        names = []
+        start = bisect.bisect_left(self.prefix_keys, (prefix,))
+        for key, full_name in self.prefix_keys[start:]:
+            if not key.startswith(prefix) or len(names) >= limit:
+                break
+            if full_name not in names:
+                names.append(full_name)
+        return names
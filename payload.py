@@ -0,0 +1,163 @@
+# payload.py
+
+import base64
+import json
+import os
+
+import numpy as np
+
+from charts import COURT_THEMES, court_shapes, court_template, create_empty_chart
+
+# Versión del formato del payload; forma parte de la clave de la caché de figuras
+PAYLOAD_FORMAT = 'client1'
+
+# Asset estático con las plantillas de la cancha; Dash sirve y carga assets/ automáticamente
+COURT_ASSET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'court_templates.js')
+
+# Claves de los traces que pueden viajar como typed arrays de plotly.js (>= 2.28)
+TYPED_ARRAY_KEYS = ('x', 'y', 'z', 'customdata', 'size', 'color')
+
+# Códigos de dtype de la especificación de typed arrays de plotly.js
+_DTYPE_CODES = {
+    np.dtype('<i1'): 'i1', np.dtype('<u1'): 'u1',
+    np.dtype('<i2'): 'i2', np.dtype('<u2'): 'u2',
+    np.dtype('<i4'): 'i4', np.dtype('<u4'): 'u4',
+    np.dtype('<f4'): 'f4', np.dtype('<f8'): 'f8',
+}
+
+# Plantilla mínima para sustituir a la plantilla 'plotly' (varios KB de JSON por figura)
+LEAN_TEMPLATE = dict(layout=dict(font=dict(color='#2a3f5f'), hovermode='closest'))
+
+
+def _smallest_int_dtype(values):
+    low, high = (int(values.min()), int(values.max())) if values.size else (0, 0)
+    for dtype in ('<i1', '<u1', '<i2', '<u2', '<i4', '<u4'):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return None
+
+
+def typed_array(values):
+    """
+    Codifica un array NumPy como typed array base64 ({dtype, bdata, shape}).
+    Enteros con el tipo más pequeño que los contiene, flotantes como float32.
+    Devuelve None si el array no admite esta codificación (p. ej. strings).
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'b':
+        values = values.astype('<u1')
+    elif values.dtype.kind in 'iu':
+        dtype = _smallest_int_dtype(values)
+        if dtype is None:
+            return None
+        values = values.astype(dtype)
+    elif values.dtype.kind == 'f':
+        values = values.astype('<f4')
+    else:
+        return None
+
+    encoded = {
+        'dtype': _DTYPE_CODES[values.dtype],
+        'bdata': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii'),
+    }
+    if values.ndim > 1:
+        encoded['shape'] = ','.join(str(n) for n in values.shape)
+    return encoded
+
+
+def _encode_arrays(obj):
+    """Sustituye recursivamente los arrays NumPy de un trace por typed arrays."""
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            _encode_arrays(value)
+        elif key in TYPED_ARRAY_KEYS and isinstance(value, np.ndarray):
+            encoded = typed_array(value)
+            obj[key] = encoded if encoded is not None else value.tolist()
+    return obj
+
+
+def _court_theme(layout):
+    return (layout.get('meta') or {}).get('court_theme')
+
+
+def _court_axes(layout):
+    return tuple((layout.get('meta') or {}).get('court_axes') or ('',))
+
+
+def strip_court(figure):
+    """
+    Quita del layout la parte que aporta la plantilla de la cancha (el navegador
+    la tiene como asset estático). Solo se quitan las claves que coinciden con la
+    plantilla, así with_court reconstruye exactamente la misma figura.
+    """
+    layout = figure['layout']
+    theme = _court_theme(layout)
+    if theme is None:
+        return figure
+    for key, value in court_template(theme, _court_axes(layout)).items():
+        if key in layout and layout[key] == value:
+            del layout[key]
+    return figure
+
+
+def with_court(figure):
+    """Fallback en Python de court.render (assets/court_render.js): vuelve a añadir la cancha al payload."""
+    layout = figure.get('layout') or {}
+    theme = _court_theme(layout) or 'light'
+    template = court_template(theme, _court_axes(layout))
+    return {'data': figure.get('data') or [], 'layout': {**template, **layout}}
+
+
+def lean_figure(fig, court='lean'):
+    """
+    Versión del figure optimizada para el tamaño del payload: arrays de marcadores
+    como typed arrays binarios y una plantilla mínima en lugar de la plantilla 'plotly'.
+    court: 'lean' sustituye la cancha por paths decimados y redondeados a la unidad
+    de LOC, 'client' la quita (la dibuja el navegador) y 'full' la deja intacta.
+    """
+    figure = fig.to_plotly_json()
+    layout = figure['layout']
+    layout['template'] = LEAN_TEMPLATE
+
+    theme = _court_theme(layout)
+    if court == 'client':
+        strip_court(figure)
+    elif court == 'lean' and theme is not None:
+        layout['shapes'] = list(court_shapes(theme, 'lean'))
+
+    for trace in figure['data']:
+        _encode_arrays(trace)
+    return figure
+
+
+def client_figure(fig):
+    """Payload que se envía al navegador: solo trazas, estadísticas y estilo, sin la cancha."""
+    return lean_figure(fig, court='client')
+
+
+def empty_chart_payload(message="🏀 Haz clic en 'Generar Gráfico' para comenzar"):
+    """Payload del gráfico vacío para el navegador (la cancha la añade court.render)"""
+    return client_figure(create_empty_chart(message))
+
+
+def write_court_asset(path=COURT_ASSET_PATH):
+    """
+    Genera el asset con las plantillas de la cancha a partir de la geometría de
+    Python. Solo reescribe el archivo si cambió (varios workers pueden llamarla).
+    """
+    templates = {theme: court_template(theme) for theme in COURT_THEMES}
+    content = ("// Generado por payload.write_court_asset a partir de charts.court_template; no editar.\n"
+               f"window.COURT_TEMPLATES = {json.dumps(templates, separators=(',', ':'))};\n")
+    try:
+        with open(path, encoding='utf-8') as f:
+            if f.read() == content:
+                return path
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,163 @@
+# profiling.py
+
+import cProfile
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from cache import CACHE_DIR
+from metrics import metrics
+
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR",
+    os.path.join(os.path.dirname(CACHE_DIR), "profiles")
+)
+# 'sample' (muestreo de pilas, apto para producción) o 'cprofile' (traza completa); vacío = desactivado
+PROFILE_MODE = os.environ.get("PROFILE_MODE", "")
+# Se perfila 1 de cada N peticiones cuando PROFILE_MODE está activo
+PROFILE_SAMPLE_RATE = max(int(os.environ.get("PROFILE_SAMPLE_RATE", 100)), 1)
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL_MS", 5)) / 1000
+# Sin token no se aceptan las cabeceras X-Profile
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+
+MODES = ('sample', 'cprofile')
+
+# Modo pedido para el job actual (lo fija el manager de callbacks en segundo plano)
+forced_mode = None
+
+_active = threading.local()
+
+
+def requested_mode(headers):
+    """Modo pedido con las cabeceras X-Profile y X-Profile-Token; None si no hay o el token no es válido."""
+    mode = headers.get('X-Profile', '').strip().lower()
+    if mode not in MODES or not PROFILE_TOKEN:
+        return None
+    if not hmac.compare_digest(headers.get('X-Profile-Token', ''), PROFILE_TOKEN):
+        return None
+    return mode
+
+
+def choose_mode(mode=None):
+    """Modo de perfilado para esta petición: el pedido explícitamente o, por muestreo, PROFILE_MODE."""
+    mode = mode or forced_mode
+    if mode:
+        return mode
+    if PROFILE_MODE in MODES and random.randrange(PROFILE_SAMPLE_RATE) == 0:
+        return PROFILE_MODE
+    return None
+
+
+def run_with_profile_mode(mode, job_fn, *args):
+    """Ejecuta el job de Dash (en su propio proceso) con el modo de perfilado pedido."""
+    global forced_mode
+    forced_mode = mode
+    return job_fn(*args)
+
+
+class StackSampler:
+    """
+    Perfilador por muestreo: un hilo lee cada interval segundos la pila del hilo
+    perfilado con sys._current_frames y cuenta las pilas en formato 'folded'
+    (frames separados por ';'), el de flamegraph.pl y speedscope.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def write(self, path, root):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{root};{stack} {count}\n")
+
+
+def _record_stage(stage, seconds):
+    stages = getattr(_active, 'stages', None)
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0) + seconds
+
+
+metrics.stage_hooks.append(_record_stage)
+
+
+def _slug(tags):
+    return re.sub(r'[^A-Za-z0-9.-]+', '-', '_'.join(str(v) for v in tags.values())).strip('-')
+
+
+@contextmanager
+def profiled(tags, mode=None):
+    """
+    Perfila el bloque si choose_mode lo decide. Escribe en PROFILE_DIR el perfil
+    ('.folded' con muestreo, '.prof' de pstats con cProfile) y un '.json' con las
+    etiquetas de la selección y la duración de cada etapa.
+    """
+    mode = choose_mode(mode)
+    if mode is None:
+        yield
+        return
+
+    _active.stages = {}
+    profiler = StackSampler() if mode == 'sample' else cProfile.Profile()
+    started = time.time()
+    start = time.perf_counter()
+    if mode == 'sample':
+        profiler.start()
+    else:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        stages, _active.stages = _active.stages, None
+        if mode == 'sample':
+            profiler.stop()
+        else:
+            profiler.disable()
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(started))}"
+                                         f"_{_slug(tags)}_{os.getpid()}")
+        if mode == 'sample':
+            # La raíz de cada pila identifica la selección en el flame graph
+            profiler.write(f"{base}.folded", f"chart[{' '.join(str(v) for v in tags.values())}]")
+        else:
+            profiler.dump_stats(f"{base}.prof")
+        with open(f"{base}.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                'tags': tags,
+                'mode': mode,
+                'started': started,
+                'duration': duration,
+                'stages': stages,
+                'interval': PROFILE_INTERVAL if mode == 'sample' else None,
+            }, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,64 @@
+# replay.py
+
+import os
+
+from nba_api.stats.endpoints import shotchartdetail
+from nba_api.stats.library.http import NBAStatsResponse
+
+
+def recording_name(player_id, team_id, season, context, date_from=''):
+    """
+    Nombre del archivo con la respuesta grabada de una combinación. Las descargas
+    incrementales (con DateFrom) se graban aparte para no pisar la temporada completa.
+    """
+    suffix = f"_from_{date_from.replace('/', '-')}" if date_from else ''
+    return f"{player_id}_{team_id}_{season}_{context}{suffix}.json"
+
+
+def record_response(endpoint, directory):
+    """Guarda la respuesta JSON cruda de un ShotChartDetail ya ejecutado."""
+    params = endpoint.parameters
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, recording_name(
+        params['PlayerID'], params['TeamID'], params['Season'], params['ContextMeasure'],
+        params['DateFrom']
+    ))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(endpoint.get_response())
+    return path
+
+
+class ReplayShotChartDetail(shotchartdetail.ShotChartDetail):
+    """
+    Sustituto offline de ShotChartDetail: mismos parámetros y misma interfaz,
+    pero lee las respuestas grabadas con record_response en lugar de llamar
+    a stats.nba.com.
+    """
+
+    replay_dir = os.environ.get("SHOT_REPLAY_DIR", "recordings")
+
+    def get_request(self):
+        params = self.parameters
+        key = (params['PlayerID'], params['TeamID'], params['Season'], params['ContextMeasure'])
+        path = os.path.join(self.replay_dir, recording_name(*key, params['DateFrom']))
+        if not os.path.exists(path):
+            # Sin grabación incremental: la temporada completa (merge_new_shots descarta los repetidos)
+            path = os.path.join(self.replay_dir, recording_name(*key))
+        with open(path, encoding='utf-8') as f:
+            self.nba_response = NBAStatsResponse(response=f.read(), status_code=200, url=path)
+        self.load_response()
+
+
+def replay_endpoint(directory):
+    """Devuelve una clase de reemplazo que lee las grabaciones de directory."""
+    return type('ReplayShotChartDetail', (ReplayShotChartDetail,), {'replay_dir': directory})
+
+
+def recording_endpoint(directory):
+    """Devuelve un ShotChartDetail que además graba cada respuesta en directory."""
+    class RecordingShotChartDetail(shotchartdetail.ShotChartDetail):
+        def get_request(self):
+            super().get_request()
+            record_response(self, directory)
+
+    return RecordingShotChartDetail
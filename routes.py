@@ -0,0 +1,42 @@
+# routes.py
+
+from flask import Response, abort, jsonify, request
+
+from callbacks import chart_payload
+from metrics import metrics
+from profiling import profiled, requested_mode
+
+VIEWS = ('shots', 'efficiency', 'relative')
+
+
+def register_routes(server):
+    """Registra las rutas HTTP adicionales en el servidor Flask de Dash."""
+
+    @server.route('/api/shot-chart/<int:player_id>/<int:team_id>/<season>/<view>')
+    def shot_chart_json(player_id, team_id, season, view):
+        """
+        Figura serializada (sin la cancha, ver payload.with_court) con ETag: las
+        peticiones repetidas reciben 304 sin recalcular nada. Solo lee tiros ya
+        cacheados; si faltan responde 404.
+        """
+        if view not in VIEWS:
+            abort(404)
+        try:
+            tags = dict(player=player_id, team=team_id, season=season, view=view)
+            with profiled(tags, requested_mode(request.headers)):
+                etag, payload, _ = chart_payload(player_id, team_id, season, view, cached_only=True)
+        except LookupError:
+            # Nunca se descarga en el worker web: la selección se genera desde la app o con warm_cache.py
+            return jsonify(error="Sin datos en caché para esta selección"), 404
+        except Exception as e:
+            return jsonify(error=f"Error al cargar datos: {str(e)}"), 502
+
+        response = Response(payload, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'  # Revalidar siempre con If-None-Match
+        return response.make_conditional(request)
+
+    @server.route('/metrics')
+    def prometheus_metrics():
+        """Métricas de todos los procesos (workers y jobs) en formato de texto de Prometheus."""
+        return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,181 @@
+# shot_index.py
+
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+from shot_store import MISSING_CODE
+
+# Las prórrogas (PERIOD >= 5) se agrupan en un solo valor
+OVERTIME = 5
+PERIOD_LABELS = {1: '1C', 2: '2C', 3: '3C', 4: '4C', OVERTIME: 'Prórroga'}
+# Clutch: últimos 5 minutos del último cuarto y de las prórrogas. ShotChartDetail no
+# trae el marcador, así que no se puede exigir además la diferencia de 5 puntos.
+CLUTCH_PERIOD = 4
+CLUTCH_SECONDS = 5 * 60
+
+# Índices de los últimos stores filtrados en este proceso (clave: versión de los datos)
+MAX_CACHED_INDEXES = 32
+
+
+def _bitmaps(codes):
+    """Bitmap (bits empaquetados) de las filas de cada valor de una columna."""
+    n = len(codes)
+    order = np.argsort(codes, kind='stable')
+    values, starts = np.unique(codes[order], return_index=True)
+    bounds = np.append(starts, n)
+    bitmaps = {}
+    for value, start, stop in zip(values.tolist(), bounds[:-1], bounds[1:]):
+        rows = np.zeros(n, dtype=bool)
+        rows[order[start:stop]] = True
+        bitmaps[value] = np.packbits(rows)
+    return bitmaps
+
+
+def opponent_codes(shots):
+    """
+    Código (en el diccionario del store) del rival de cada tiro a partir de HTM y VTM.
+    El equipo del jugador es, para cada TEAM_ID, la abreviatura que aparece en todos sus partidos.
+    """
+    home, away, team_id = shots['home_team'], shots['away_team'], shots['team_id']
+    own = np.full(len(shots), MISSING_CODE, dtype=home.dtype)
+    for team in np.unique(team_id):
+        rows = team_id == team
+        codes, counts = np.unique(np.concatenate([home[rows], away[rows]]), return_counts=True)
+        own[rows] = codes[np.argmax(counts)]
+    return np.where(home == own, away, home)
+
+
+def clutch_rows(shots):
+    """Tiros en los últimos CLUTCH_SECONDS del cuarto CLUTCH_PERIOD o de una prórroga."""
+    remaining = shots['minutes_remaining'].astype(np.int32) * 60 + shots['seconds_remaining']
+    return (shots['period'] >= CLUTCH_PERIOD) & (remaining <= CLUTCH_SECONDS)
+
+
+class ShotIndex:
+    """
+    Índices por columna de un ShotStore para filtrar sin recorrer los tiros:
+    bitmaps por valor de PERIOD, ACTION_TYPE y rival, el bitmap de clutch y las
+    filas ordenadas por GAME_DATE (un rango de fechas son dos búsquedas binarias).
+    Cualquier combinación de filtros se resuelve con operaciones sobre n/8 bytes.
+    """
+
+    def __init__(self, shots):
+        self.rows = len(shots)
+        self.strings = shots.strings
+        self.string_ids = {value: code for code, value in enumerate(shots.strings)}
+        self.periods = _bitmaps(np.minimum(shots['period'], OVERTIME))
+        self.action_types = _bitmaps(shots['action_type'])
+        self.opponents = _bitmaps(opponent_codes(shots))
+        self.clutch = np.packbits(clutch_rows(shots))
+        self.date_order = np.argsort(shots['game_date'], kind='stable')
+        self.sorted_dates = np.asarray(shots['game_date'])[self.date_order]
+
+    def _values(self, bitmaps):
+        return sorted(self.strings[code] for code in bitmaps if code != MISSING_CODE)
+
+    def options(self):
+        """Valores presentes en los datos: periodos, tipos de tiro, rivales y rango de fechas."""
+        return {
+            'periods': sorted(self.periods),
+            'action_types': self._values(self.action_types),
+            'opponents': self._values(self.opponents),
+            'dates': (int(self.sorted_dates[0]), int(self.sorted_dates[-1])) if self.rows else None,
+        }
+
+    def _union(self, bitmaps, values):
+        bits = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if value in bitmaps:
+                bits |= bitmaps[value]
+        return bits
+
+    def _codes(self, names):
+        return [self.string_ids[name] for name in names if name in self.string_ids]
+
+    def _date_range(self, date_from, date_to):
+        low = np.searchsorted(self.sorted_dates, date_from, 'left') if date_from else 0
+        high = np.searchsorted(self.sorted_dates, date_to, 'right') if date_to else self.rows
+        rows = np.zeros(self.rows, dtype=bool)
+        rows[self.date_order[low:high]] = True
+        return np.packbits(rows)
+
+    def mask(self, filters):
+        """Máscara booleana de las filas que cumplen todos los filtros (ver normalize_filters)."""
+        selected = []
+        if filters.get('periods'):
+            selected.append(self._union(self.periods, filters['periods']))
+        if filters.get('clutch'):
+            selected.append(self.clutch)
+        if filters.get('action_types'):
+            selected.append(self._union(self.action_types, self._codes(filters['action_types'])))
+        if filters.get('opponents'):
+            selected.append(self._union(self.opponents, self._codes(filters['opponents'])))
+        if filters.get('date_from') or filters.get('date_to'):
+            selected.append(self._date_range(filters.get('date_from'), filters.get('date_to')))
+        bits = None
+        for bitmap in selected:
+            bits = bitmap if bits is None else bits & bitmap
+        if bits is None:
+            return np.ones(self.rows, dtype=bool)
+        return np.unpackbits(bits, count=self.rows).view(bool)
+
+
+_indexes = OrderedDict()
+# Los hilos de un worker web comparten el LRU
+_indexes_lock = threading.Lock()
+
+
+def shot_index(shots):
+    """Índice del store, construido una vez por versión de los datos y proceso."""
+    key = shots.version
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    # Se construye fuera del lock: si dos hilos coinciden, se queda el primero
+    index = ShotIndex(shots)
+    with _indexes_lock:
+        index = _indexes.setdefault(key, index)
+        _indexes.move_to_end(key)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def _date_int(value):
+    """Fecha ISO ('YYYY-MM-DD', como la devuelve DatePickerRange) a YYYYMMDD (int)."""
+    if not value:
+        return None
+    return int(date.fromisoformat(str(value)[:10]).strftime('%Y%m%d'))
+
+
+def normalize_filters(periods=None, clutch=False, action_types=None, opponents=None, date_from=None,
+                      date_to=None):
+    """Filtros a partir de los valores de los controles; solo se incluyen los activos (dict vacío = sin filtros)."""
+    filters = {
+        'periods': sorted(int(p) for p in periods or []),
+        'clutch': bool(clutch),
+        'action_types': sorted(action_types or []),
+        'opponents': sorted(opponents or []),
+        'date_from': _date_int(date_from),
+        'date_to': _date_int(date_to),
+    }
+    return {key: value for key, value in filters.items() if value}
+
+
+def filter_key(filters):
+    """Filtros como tupla ordenada y hashable (parte de las claves de caché)."""
+    return tuple((key, tuple(value) if isinstance(value, list) else value)
+                 for key, value in sorted((filters or {}).items()))
+
+
+def filter_shots(shots, filters):
+    """Subconjunto del store que cumple los filtros; sin filtros se devuelve el mismo store."""
+    if not filters or shots.empty:
+        return shots
+    # take conserva el meta no derivado del contenido (p. ej. stale y latest_game_date)
+    return shots.take(shot_index(shots).mask(filters))
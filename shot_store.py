@@ -0,0 +1,274 @@
+# shot_store.py
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Columnas numéricas: nombre compacto -> (columna de ShotChartDetail, dtype)
+NUMERIC_COLUMNS = {
+    'game_id': ('GAME_ID', np.int32),
+    'game_event_id': ('GAME_EVENT_ID', np.int32),
+    'game_date': ('GAME_DATE', np.int32),  # YYYYMMDD
+    'player_id': ('PLAYER_ID', np.int32),
+    'team_id': ('TEAM_ID', np.int32),
+    'period': ('PERIOD', np.int8),
+    'minutes_remaining': ('MINUTES_REMAINING', np.int8),
+    'seconds_remaining': ('SECONDS_REMAINING', np.int8),
+    'loc_x': ('LOC_X', np.int16),
+    'loc_y': ('LOC_Y', np.int16),
+    'made': ('SHOT_MADE_FLAG', np.bool_),
+}
+
+# Columnas categóricas: códigos int16 sobre un diccionario de strings compartido
+CATEGORICAL_COLUMNS = {
+    'player_name': 'PLAYER_NAME',
+    'team_name': 'TEAM_NAME',
+    'action_type': 'ACTION_TYPE',
+    'shot_type': 'SHOT_TYPE',
+    'zone_basic': 'SHOT_ZONE_BASIC',
+    'zone_area': 'SHOT_ZONE_AREA',
+    'zone_range': 'SHOT_ZONE_RANGE',
+    'home_team': 'HTM',
+    'away_team': 'VTM',
+}
+
+CODE_DTYPE = np.int16
+MISSING_CODE = -1
+
+# Orden de columnas del DataFrame original de ShotChartDetail
+FRAME_COLUMNS = [
+    'GRID_TYPE', 'GAME_ID', 'GAME_EVENT_ID', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_NAME',
+    'PERIOD', 'MINUTES_REMAINING', 'SECONDS_REMAINING', 'EVENT_TYPE', 'ACTION_TYPE', 'SHOT_TYPE',
+    'SHOT_ZONE_BASIC', 'SHOT_ZONE_AREA', 'SHOT_ZONE_RANGE', 'SHOT_DISTANCE', 'LOC_X', 'LOC_Y',
+    'SHOT_ATTEMPTED_FLAG', 'SHOT_MADE_FLAG', 'GAME_DATE', 'HTM', 'VTM',
+]
+
+# Claves del meta derivadas del contenido: no son válidas para un subconjunto de filas
+DERIVED_META = ('version', 'summary')
+
+# Formato de archivo: MAGIC + longitud de la cabecera (uint32) + cabecera JSON + columnas alineadas
+MAGIC = b'SHOTS01\0'
+ALIGNMENT = 8
+
+
+def _column_dtypes():
+    dtypes = {name: np.dtype(dtype) for name, (_, dtype) in NUMERIC_COLUMNS.items()}
+    dtypes.update({name: np.dtype(CODE_DTYPE) for name in CATEGORICAL_COLUMNS})
+    return dtypes
+
+
+COLUMN_DTYPES = _column_dtypes()
+
+
+class ShotStore:
+    """
+    Representación columnar compacta de los tiros: un array NumPy por columna
+    (coordenadas int16, acierto bool, ids y fechas int32) y las columnas de texto
+    como códigos int16 sobre un diccionario de strings compartido.
+    """
+
+    def __init__(self, columns, strings, meta=None):
+        self.columns = columns
+        self.strings = list(strings)
+        self.meta = dict(meta or {})
+        self._string_ids = None
+
+    def __len__(self):
+        return len(self.columns['loc_x'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def version(self):
+        """Hash del contenido; identifica la versión de los datos (p. ej. para invalidar figuras)."""
+        if 'version' not in self.meta:
+            digest = hashlib.sha1()
+            for name in COLUMN_DTYPES:
+                digest.update(np.ascontiguousarray(self.columns[name]).tobytes())
+            digest.update(json.dumps(self.strings, ensure_ascii=False).encode('utf-8'))
+            self.meta['version'] = digest.hexdigest()[:16]
+        return self.meta['version']
+
+    def string_id(self, value):
+        """Código del string en el diccionario compartido (MISSING_CODE si no aparece)."""
+        if self._string_ids is None:
+            self._string_ids = {s: i for i, s in enumerate(self.strings)}
+        return self._string_ids.get(value, MISSING_CODE)
+
+    def decode(self, name):
+        """Valores de texto de una columna categórica."""
+        lookup = np.array(self.strings + [None], dtype=object)
+        return lookup[self.columns[name]]
+
+    def take(self, selector):
+        """Subconjunto de filas (máscara booleana o índices) que comparte el diccionario."""
+        meta = {key: value for key, value in self.meta.items() if key not in DERIVED_META}
+        return ShotStore({name: column[selector] for name, column in self.columns.items()},
+                         self.strings, meta)
+
+    def last_occurrence(self):
+        """
+        Máscara de las filas que se quedan al deduplicar por (game_id, game_event_id):
+        de cada tiro repetido se conserva la última aparición (la más reciente al concatenar).
+        """
+        key = (self.columns['game_id'].astype(np.int64) << 32) | self.columns['game_event_id'].astype(np.int64)
+        _, first_reversed = np.unique(key[::-1], return_index=True)
+        keep = np.zeros(len(self), dtype=bool)
+        keep[len(self) - 1 - first_reversed] = True
+        return keep
+
+    @classmethod
+    def empty_store(cls, meta=None):
+        return cls({name: np.empty(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}, [], meta)
+
+    @classmethod
+    def from_frame(cls, frame, meta=None):
+        """Convierte el DataFrame de ShotChartDetail a la representación compacta."""
+        import pandas as pd
+
+        n = len(frame)
+        columns = {}
+        for name, (source, dtype) in NUMERIC_COLUMNS.items():
+            if source not in frame:
+                # Sin SHOT_MADE_FLAG se asume el contexto 'PTS' (solo tiros anotados)
+                columns[name] = np.full(n, name == 'made', dtype=dtype)
+                continue
+            values = frame[source]
+            if values.dtype == object:
+                values = pd.to_numeric(values, errors='coerce').fillna(0)
+            columns[name] = values.to_numpy().astype(dtype)
+
+        strings = []
+        string_ids = {}
+        for name, source in CATEGORICAL_COLUMNS.items():
+            if source not in frame:
+                columns[name] = np.full(n, MISSING_CODE, dtype=CODE_DTYPE)
+                continue
+            codes, uniques = pd.factorize(frame[source])
+            lookup = np.empty(len(uniques) + 1, dtype=CODE_DTYPE)
+            for i, value in enumerate(uniques):
+                value = str(value)
+                if value not in string_ids:
+                    string_ids[value] = len(strings)
+                    strings.append(value)
+                lookup[i] = string_ids[value]
+            lookup[-1] = MISSING_CODE  # factorize marca los nulos con -1
+            columns[name] = lookup[codes]
+
+        return cls(columns, strings, meta)
+
+    def to_frame(self):
+        """Reconstruye un DataFrame con las columnas originales de ShotChartDetail."""
+        import pandas as pd
+
+        n = len(self)
+        data = {'GRID_TYPE': ['Shot Chart Detail'] * n}
+        for name, (source, _) in NUMERIC_COLUMNS.items():
+            data[source] = self.columns[name]
+        for name, source in CATEGORICAL_COLUMNS.items():
+            data[source] = self.decode(name)
+
+        made = self.columns['made']
+        data['GAME_ID'] = np.char.zfill(self.columns['game_id'].astype(str), 10)
+        data['GAME_DATE'] = self.columns['game_date'].astype(str)
+        data['SHOT_MADE_FLAG'] = made.astype(np.int64)
+        data['SHOT_ATTEMPTED_FLAG'] = np.ones(n, dtype=np.int64)
+        data['EVENT_TYPE'] = np.where(made, 'Made Shot', 'Missed Shot')
+        data['SHOT_DISTANCE'] = (np.hypot(self.columns['loc_x'], self.columns['loc_y']) / 10).astype(np.int64)
+        return pd.DataFrame(data, columns=FRAME_COLUMNS)
+
+    @classmethod
+    def concat(cls, stores, meta=None):
+        """Une varios stores en uno, fusionando sus diccionarios de strings."""
+        stores = [store for store in stores if store is not None]
+        if not stores:
+            return cls.empty_store(meta)
+
+        strings = []
+        string_ids = {}
+        remapped = []
+        for store in stores:
+            lookup = np.empty(len(store.strings) + 1, dtype=CODE_DTYPE)
+            for i, value in enumerate(store.strings):
+                if value not in string_ids:
+                    string_ids[value] = len(strings)
+                    strings.append(value)
+                lookup[i] = string_ids[value]
+            lookup[-1] = MISSING_CODE
+            remapped.append({
+                name: lookup[column] if name in CATEGORICAL_COLUMNS else column
+                for name, column in store.columns.items()
+            })
+
+        columns = {name: np.concatenate([r[name] for r in remapped]) for name in COLUMN_DTYPES}
+        return cls(columns, strings, meta)
+
+    def save(self, path):
+        """Escribe el store en un único archivo de forma atómica."""
+        layout = []
+        offset = 0
+        for name in COLUMN_DTYPES:
+            column = np.ascontiguousarray(self.columns[name], dtype=COLUMN_DTYPES[name])
+            layout.append((name, column, offset))
+            offset += -(-column.nbytes // ALIGNMENT) * ALIGNMENT
+
+        header = json.dumps({
+            'rows': len(self),
+            'columns': [[name, column.dtype.str, start] for name, column, start in layout],
+            'strings': self.strings,
+            'meta': self.meta,
+        }, ensure_ascii=False).encode('utf-8')
+        prefix_size = len(MAGIC) + 4 + len(header)
+        padding = -prefix_size % ALIGNMENT
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(np.uint32(len(header) + padding).tobytes())
+            f.write(header + b' ' * padding)
+            for _, column, start in layout:
+                f.seek(prefix_size + padding + start)
+                f.write(column.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Lee un store; con mmap=True las columnas son vistas de solo lectura sobre el archivo."""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} no es un archivo de tiros")
+            header_size = int(np.frombuffer(f.read(4), dtype=np.uint32)[0])
+            header = json.loads(f.read(header_size))
+            data_start = len(MAGIC) + 4 + header_size
+            if not mmap:
+                f.seek(0)
+                buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode='r')
+
+        rows = header['rows']
+        columns = {}
+        for name, dtype, start in header['columns']:
+            dtype = np.dtype(dtype)
+            begin = data_start + start
+            columns[name] = buffer[begin:begin + rows * dtype.itemsize].view(dtype)
+        return cls(columns, header['strings'], header['meta'])
+
+
+def as_shot_store(data):
+    """Acepta un ShotStore o un DataFrame de ShotChartDetail y devuelve un ShotStore (o None)."""
+    if data is None or isinstance(data, ShotStore):
+        return data
+    return ShotStore.from_frame(data)
@@ -0,0 +1,83 @@
+# singleflight.py
+
+import hashlib
+import os
+import pickle
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin coalescencia
+    fcntl = None
+
+from cache import CACHE_DIR
+
+LOCK_DIR = os.environ.get("SHOT_LOCK_DIR", os.path.join(CACHE_DIR, "locks"))
+FAILURE_TTL = float(os.environ.get("SHOT_FAILURE_TTL", 10))  # segundos que se comparte el fallo del líder
+
+
+@contextmanager
+def file_lock(name):
+    """
+    Lock exclusivo entre procesos (workers de gunicorn) basado en flock.
+    Quien lo obtiene después del líder debe volver a consultar la caché compartida.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    with open(_lock_path(name, '.lock'), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SharedFailure(Exception):
+    """Fallo reciente del líder que no se pudo reconstruir con su tipo original."""
+
+
+@contextmanager
+def shared_failure(name, ttl=FAILURE_TTL):
+    """
+    Comparte el fallo del líder con quienes esperaban su file_lock: si el bloque lanza
+    una excepción se guarda durante ttl segundos, y quien entra en ese tiempo la recibe
+    en lugar de repetir la misma llamada. Un éxito borra la marca.
+    """
+    path = _lock_path(name, '.failed')
+    try:
+        with open(path, 'rb') as f:
+            blob = f.read() if time.time() - os.fstat(f.fileno()).st_mtime < ttl else None
+    except OSError:
+        blob = None
+    if blob is not None:
+        try:
+            error = pickle.loads(blob)
+        except Exception:
+            error = SharedFailure(f"{name}: el líder falló hace menos de {ttl:g} s")
+        raise error
+
+    try:
+        yield
+    except Exception as e:
+        try:
+            blob = pickle.dumps(e)
+        except Exception:
+            blob = pickle.dumps(SharedFailure(f"{type(e).__name__}: {e}"))
+        os.makedirs(LOCK_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(blob)
+        raise
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _lock_path(name, suffix):
+    digest = hashlib.sha1(str(name).encode('utf-8')).hexdigest()
+    return os.path.join(LOCK_DIR, f"{digest}{suffix}")
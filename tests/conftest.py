@@ -0,0 +1,50 @@
+# tests/conftest.py
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Los directorios de caché se leen al importar los módulos: todos cuelgan de uno temporal
+os.environ['SHOT_CACHE_DIR'] = os.path.join(tempfile.mkdtemp(prefix='shot-chart-tests-'), 'shots')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_frame(n=40, seed=0, game_id=22400001, game_date=20241022, first_event=1):
+    """DataFrame con las columnas de ShotChartDetail: n tiros de un partido."""
+    rng = np.random.default_rng(seed)
+    made = rng.random(n) < 0.45
+    return pd.DataFrame({
+        'GRID_TYPE': 'Shot Chart Detail',
+        'GAME_ID': f"{game_id:010d}",
+        'GAME_EVENT_ID': np.arange(first_event, first_event + n),
+        'PLAYER_ID': 1629029,
+        'PLAYER_NAME': 'Luka Dončić',
+        'TEAM_ID': 1610612742,
+        'TEAM_NAME': 'Dallas Mavericks',
+        'PERIOD': rng.integers(1, 6, n),
+        'MINUTES_REMAINING': rng.integers(0, 12, n),
+        'SECONDS_REMAINING': rng.integers(0, 60, n),
+        'EVENT_TYPE': np.where(made, 'Made Shot', 'Missed Shot'),
+        'ACTION_TYPE': rng.choice(['Jump Shot', 'Layup Shot', 'Step Back Jump shot'], n),
+        'SHOT_TYPE': '2PT Field Goal',
+        'SHOT_ZONE_BASIC': 'Mid-Range',
+        'SHOT_ZONE_AREA': 'Center(C)',
+        'SHOT_ZONE_RANGE': '16-24 ft.',
+        'SHOT_DISTANCE': rng.integers(0, 30, n),
+        'LOC_X': rng.integers(-250, 251, n),
+        'LOC_Y': rng.integers(-47, 400, n),
+        'SHOT_ATTEMPTED_FLAG': 1,
+        'SHOT_MADE_FLAG': made.astype(int),
+        'GAME_DATE': str(game_date),
+        'HTM': 'DAL',
+        'VTM': rng.choice(['LAL', 'BOS'], 1)[0],
+    })
+
+
+@pytest.fixture
+def shot_frame():
+    return make_frame
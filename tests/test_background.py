@@ -0,0 +1,22 @@
+# tests/test_background.py
+
+import plotly.graph_objects as go
+
+from background import cacheable
+
+
+def test_figures_are_cacheable():
+    assert cacheable(go.Figure())
+    assert cacheable({'data': [], 'layout': {'meta': {'view': 'shots'}}})
+    # JSON de la caché de figuras, tal cual llega al Store
+    assert cacheable('{"data":[],"layout":{"meta":{"view":"shots"}}}')
+
+
+def test_errors_are_not_cacheable():
+    assert not cacheable(go.Figure(layout={'meta': {'error': True}}))
+    assert not cacheable({'data': [], 'layout': {'meta': {'error': True}}})
+    assert not cacheable({'long_callback_error': {'msg': 'boom', 'tb': ''}})
+
+
+def test_stale_figures_are_not_cacheable():
+    assert not cacheable({'data': [], 'layout': {'meta': {'stale': True}}})
@@ -0,0 +1,61 @@
+# tests/test_baselines.py
+
+import baselines
+from baselines import build_baseline, load_baseline, refresh_baseline, save_baseline, update_baseline
+from charts import plot_relative_chart
+from shot_store import ShotStore
+
+SEASON = '2015-16'
+
+
+def league(shot_frame, games):
+    """Tiros de la liga: un partido por (fecha, número de tiros)."""
+    frames = [shot_frame(n=n, seed=i, game_id=21500001 + i, game_date=day) for i, (day, n) in enumerate(games)]
+    return ShotStore.concat([ShotStore.from_frame(frame) for frame in frames])
+
+
+def serve(monkeypatch, shots, calls=None):
+    def fetch_shots(player_id, team_id, season, context_measure='FGA', endpoint=None, date_from=None):
+        if calls is not None:
+            calls.append(date_from)
+        return shots.take(shots['game_date'] >= date_from) if date_from else shots
+    monkeypatch.setattr(baselines, 'fetch_shots', fetch_shots)
+
+
+def test_incremental_refresh_matches_full_rebuild(monkeypatch, shot_frame):
+    # El último día tenía un partido en juego: la actualización lo reemplaza entero
+    serve(monkeypatch, league(shot_frame, [(20151027, 50), (20151028, 20)]))
+    partial = build_baseline(SEASON)
+
+    full = league(shot_frame, [(20151027, 50), (20151028, 60), (20151029, 40)])
+    serve(monkeypatch, full)
+    updated = update_baseline(partial)
+    rebuilt = build_baseline(SEASON)
+    assert updated['summary'] == rebuilt['summary']
+    assert updated['tail'] == rebuilt['tail']
+    assert updated['latest_game_date'] == 20151029
+    assert updated['version'] == rebuilt['version']
+
+
+def test_refresh_saves_and_completed_seasons_do_not_expire(monkeypatch, shot_frame, tmp_path):
+    calls = []
+    serve(monkeypatch, league(shot_frame, [(20151027, 30)]), calls)
+    directory = str(tmp_path)
+    assert load_baseline(SEASON, directory) is None
+
+    baseline = refresh_baseline(SEASON, directory=directory)
+    assert load_baseline(SEASON, directory) == baseline
+    refresh_baseline(SEASON, directory=directory)
+    assert calls == [None]
+
+
+def test_other_formats_are_ignored(tmp_path, monkeypatch, shot_frame):
+    serve(monkeypatch, league(shot_frame, [(20151027, 30)]))
+    baseline = dict(build_baseline(SEASON), format=baselines.BASELINE_FORMAT + 1)
+    save_baseline(baseline, str(tmp_path))
+    assert load_baseline(SEASON, str(tmp_path)) is None
+
+
+def test_relative_chart_without_baseline(shot_frame):
+    fig = plot_relative_chart(ShotStore.from_frame(shot_frame()), None)
+    assert any('Sin promedios' in annotation.text for annotation in fig.layout.annotations)
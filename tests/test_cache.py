@@ -0,0 +1,67 @@
+# tests/test_cache.py
+
+import os
+import time
+from datetime import date
+
+from cache import ShotCache, current_season
+from shot_store import ShotStore
+
+COMPLETED_SEASON = '2015-16'
+
+
+def age(cache, key, seconds):
+    """Retrasa la fecha de descarga (mtime) de una entrada."""
+    path = cache._path(*key)
+    fetched_at = time.time() - seconds
+    os.utime(path, (fetched_at, fetched_at))
+
+
+def test_current_season_starts_in_october():
+    assert current_season(date(2024, 9, 30)) == '2023-24'
+    assert current_season(date(2024, 10, 1)) == '2024-25'
+
+
+def test_round_trip(tmp_path, shot_frame):
+    cache = ShotCache(str(tmp_path))
+    store = ShotStore.from_frame(shot_frame())
+    cache.set(1, 2, COMPLETED_SEASON, 'FGA', store)
+    cached = cache.get(1, 2, COMPLETED_SEASON, 'FGA')
+    assert list(cached['loc_x']) == list(store['loc_x'])
+    assert cache.get(1, 3, COMPLETED_SEASON, 'FGA') is None
+
+
+def test_current_season_expires(tmp_path, shot_frame):
+    cache = ShotCache(str(tmp_path), current_ttl=60)
+    key = (1, 2, current_season(), 'FGA')
+    cache.set(*key, ShotStore.from_frame(shot_frame()))
+    assert cache.get(*key) is not None
+    age(cache, key, 61)
+    assert cache.get(*key) is None
+
+
+def test_completed_season_does_not_expire(tmp_path, shot_frame):
+    cache = ShotCache(str(tmp_path), current_ttl=60)
+    key = (1, 2, COMPLETED_SEASON, 'FGA')
+    cache.set(*key, ShotStore.from_frame(shot_frame()))
+    age(cache, key, 10 * 365 * 24 * 3600)
+    assert cache.get(*key) is not None
+
+
+def test_evicts_least_recently_used(tmp_path, shot_frame):
+    cache = ShotCache(str(tmp_path))
+    keys = [(player, 2, COMPLETED_SEASON, 'FGA') for player in range(3)]
+    for key in keys:
+        cache.set(*key, ShotStore.from_frame(shot_frame()))
+    sizes = [os.path.getsize(cache._path(*key)) for key in keys]
+
+    # El acceso (atime) marca el orden del LRU: la entrada 0 se usa después que la 1
+    for i, key in enumerate(keys):
+        os.utime(cache._path(*key), (1000 + i, time.time()))
+    cache.get(*keys[0])
+
+    cache.max_bytes = sum(sizes) - 1
+    cache.evict()
+    assert cache.get(*keys[1]) is None
+    assert cache.get(*keys[0]) is not None
+    assert cache.get(*keys[2]) is not None
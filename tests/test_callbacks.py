@@ -0,0 +1,41 @@
+# tests/test_callbacks.py
+
+import json
+
+import pytest
+
+from background import cacheable
+from cache import shot_cache
+from callbacks import chart_data, chart_payload
+from shot_store import ShotStore
+
+SEASON = '2015-16'
+
+
+def test_cached_only_reads_the_cached_shots(shot_frame):
+    shot_cache.set(101, 2, SEASON, 'FGA', ShotStore.from_frame(shot_frame()))
+    etag, payload, stale = chart_payload(101, 2, SEASON, 'shots', cached_only=True)
+    assert not stale
+    # La segunda vez sale de la caché de figuras
+    assert chart_payload(101, 2, SEASON, 'shots', cached_only=True) == (etag, payload, stale)
+    # Al Store llega el JSON cacheado tal cual (lo parsea court.render)
+    data = chart_data(payload, stale)
+    assert data == payload.decode('utf-8')
+    assert json.loads(data)['data']
+    assert cacheable(data)
+
+
+def test_stale_charts_are_not_reused(shot_frame):
+    store = ShotStore.from_frame(shot_frame())
+    store.meta['stale'] = True
+    shot_cache.set(103, 2, SEASON, 'FGA', store)
+    _, payload, stale = chart_payload(103, 2, SEASON, 'shots', cached_only=True)
+    assert stale
+    data = chart_data(payload, stale)
+    assert data['layout']['meta']['stale']
+    assert not cacheable(data)
+
+
+def test_cached_only_without_shots():
+    with pytest.raises(LookupError):
+        chart_payload(102, 2, SEASON, 'shots', cached_only=True)
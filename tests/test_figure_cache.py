@@ -0,0 +1,44 @@
+# tests/test_figure_cache.py
+
+import pytest
+
+from figure_cache import FigureCache, content_etag
+
+
+@pytest.fixture
+def figures(tmp_path):
+    return FigureCache(str(tmp_path))
+
+
+def test_builds_once_per_version(figures):
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b'{"data":[]}'
+
+    first = figures.get_or_build((1, 2, '2015-16', 'shots'), 'v1', build)
+    second = figures.get_or_build((1, 2, '2015-16', 'shots'), 'v1', build)
+    assert first == second == (content_etag(b'{"data":[]}'), b'{"data":[]}')
+    assert len(builds) == 1
+
+
+def test_new_version_replaces_the_previous_one(figures):
+    selection = (1, 2, '2015-16', 'shots')
+    figures.get_or_build(selection, 'v1', lambda: b'1')
+    figures.get_or_build(selection, 'v2', lambda: b'2')
+    assert figures.get(selection, 'v1') is None
+    assert figures.get(selection, 'v2')[1] == b'2'
+
+
+def test_failed_build_is_shared(figures):
+    builds = []
+
+    def build():
+        builds.append(1)
+        raise ValueError("sin datos")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            figures.get_or_build((1, 2, '2015-16', 'efficiency'), 'v1', build)
+    assert len(builds) == 1
@@ -0,0 +1,41 @@
+# tests/test_get_data.py
+
+import numpy as np
+
+from get_data import merge_new_shots, summarize_store, with_summary
+from shot_store import ShotStore
+
+
+def cached_store(frame):
+    store = ShotStore.from_frame(frame)
+    return with_summary(store, summarize_store(store))
+
+
+def test_merge_appends_new_games(shot_frame):
+    stale = cached_store(shot_frame(seed=1))
+    new = ShotStore.from_frame(shot_frame(seed=2, game_id=22400002, game_date=20241024))
+    merged = merge_new_shots(stale, new)
+    assert len(merged) == len(stale) + len(new)
+    assert merged.meta['summary'] == summarize_store(merged)
+    assert merged.meta['latest_game_date'] == 20241024
+
+
+def test_merge_keeps_the_new_copy_of_repeated_shots(shot_frame):
+    stale = cached_store(shot_frame(n=40, seed=1))
+    # Los eventos 31-40 vuelven a llegar (corregidos) junto a 20 tiros nuevos del mismo partido
+    new = ShotStore.from_frame(shot_frame(n=30, seed=2, first_event=31))
+    merged = merge_new_shots(stale, new)
+    assert len(merged) == 60
+    assert merged.meta['summary'] == summarize_store(merged)
+
+    events = np.asarray(merged['game_event_id'])
+    assert len(np.unique(events)) == len(events)
+    repeated = np.isin(events, np.arange(31, 41))
+    np.testing.assert_array_equal(merged['loc_x'][repeated], new['loc_x'][:10])
+
+
+def test_merge_summarizes_entries_cached_without_summary(shot_frame):
+    stale = ShotStore.from_frame(shot_frame(seed=1))
+    new = ShotStore.from_frame(shot_frame(seed=2, game_id=22400002))
+    merged = merge_new_shots(stale, new)
+    assert merged.meta['summary'] == summarize_store(merged)
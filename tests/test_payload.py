@@ -0,0 +1,68 @@
+# tests/test_payload.py
+
+import base64
+
+import numpy as np
+import plotly.graph_objects as go
+
+from charts import court_figure
+from payload import client_figure, lean_figure, typed_array, with_court
+
+
+def decode(encoded):
+    values = np.frombuffer(base64.b64decode(encoded['bdata']), dtype=np.dtype(encoded['dtype']))
+    if 'shape' in encoded:
+        values = values.reshape([int(n) for n in encoded['shape'].split(',')])
+    return values
+
+
+def test_integers_use_the_smallest_dtype():
+    assert typed_array(np.array([0, 100, -5]))['dtype'] == 'i1'
+    assert typed_array(np.array([0, 200]))['dtype'] == 'u1'
+    assert typed_array(np.array([-250, 250]))['dtype'] == 'i2'
+    assert typed_array(np.array([0, 70000]))['dtype'] == 'i4'
+    assert typed_array(np.array([2 ** 40])) is None
+
+
+def test_round_trip():
+    values = np.array([-250, 0, 250, 470], dtype=np.int64)
+    np.testing.assert_array_equal(decode(typed_array(values)), values)
+
+    made = np.array([True, False, True])
+    encoded = typed_array(made)
+    assert encoded['dtype'] == 'u1'
+    assert decode(encoded).tolist() == [1, 0, 1]
+
+    floats = np.array([0.25, 0.5, 1 / 3])
+    encoded = typed_array(floats)
+    assert encoded['dtype'] == 'f4'
+    np.testing.assert_allclose(decode(encoded), floats, rtol=1e-6)
+
+
+def test_2d_arrays_keep_their_shape():
+    grid = np.arange(6).reshape(2, 3)
+    encoded = typed_array(grid)
+    assert encoded['shape'] == '2,3'
+    np.testing.assert_array_equal(decode(encoded), grid)
+
+
+def test_strings_are_not_encoded():
+    assert typed_array(np.array(['Jump Shot', 'Layup Shot'])) is None
+
+
+def test_lean_figure_encodes_trace_arrays():
+    fig = go.Figure(go.Scattergl(x=np.array([-250, 10]), y=np.array([5, 400]), text=['a', 'b']))
+    figure = lean_figure(fig)
+    trace = figure['data'][0]
+    assert decode(trace['x']).tolist() == [-250, 10]
+    assert decode(trace['y']).tolist() == [5, 400]
+    assert list(trace['text']) == ['a', 'b']
+
+
+def test_client_figure_drops_the_court_and_with_court_restores_it():
+    fig = court_figure()
+    fig.add_trace(go.Scattergl(x=np.array([0]), y=np.array([0])))
+    full = lean_figure(fig, court='full')
+    client = client_figure(fig)
+    assert 'shapes' in full['layout'] and 'shapes' not in client['layout']
+    assert with_court(client)['layout']['shapes'] == full['layout']['shapes']
@@ -0,0 +1,61 @@
+# tests/test_shot_index.py
+
+import numpy as np
+
+from shot_index import OVERTIME, ShotIndex, clutch_rows, opponent_codes
+from shot_store import ShotStore
+
+
+def season_store(shot_frame):
+    frames = [shot_frame(n=60, seed=game, game_id=22400001 + game, game_date=20241022 + game) for game in range(6)]
+    stores = [ShotStore.from_frame(frame) for frame in frames]
+    return ShotStore.concat(stores)
+
+
+def brute_force(shots, filters):
+    strings = np.array(shots.strings, dtype=object)
+    rows = np.ones(len(shots), dtype=bool)
+    if filters.get('periods'):
+        rows &= np.isin(np.minimum(shots['period'], OVERTIME), filters['periods'])
+    if filters.get('clutch'):
+        rows &= clutch_rows(shots)
+    if filters.get('action_types'):
+        rows &= np.isin(strings[shots['action_type']], filters['action_types'])
+    if filters.get('opponents'):
+        rows &= np.isin(strings[opponent_codes(shots)], filters['opponents'])
+    if filters.get('date_from'):
+        rows &= shots['game_date'] >= filters['date_from']
+    if filters.get('date_to'):
+        rows &= shots['game_date'] <= filters['date_to']
+    return rows
+
+
+def test_mask_matches_brute_force(shot_frame):
+    shots = season_store(shot_frame)
+    index = ShotIndex(shots)
+    for filters in [
+        {},
+        {'periods': [1, OVERTIME]},
+        {'clutch': True},
+        {'action_types': ['Jump Shot', 'Layup Shot']},
+        {'opponents': ['LAL']},
+        {'date_from': 20241023, 'date_to': 20241025},
+        {'periods': [4], 'action_types': ['Step Back Jump shot'], 'date_to': 20241024},
+        {'action_types': ['Hook Shot']},
+    ]:
+        np.testing.assert_array_equal(index.mask(filters), brute_force(shots, filters), err_msg=str(filters))
+
+
+def test_options(shot_frame):
+    options = ShotIndex(season_store(shot_frame)).options()
+    assert options['dates'] == (20241022, 20241027)
+    assert set(options['opponents']) <= {'LAL', 'BOS'}
+    assert 'DAL' not in options['opponents']
+
+
+def test_clutch_includes_five_minutes_remaining(shot_frame):
+    frame = shot_frame(n=4)
+    frame['PERIOD'] = [4, 4, 3, 5]
+    frame['MINUTES_REMAINING'] = [5, 5, 0, 4]
+    frame['SECONDS_REMAINING'] = [0, 1, 30, 59]
+    assert clutch_rows(ShotStore.from_frame(frame)).tolist() == [True, False, False, True]
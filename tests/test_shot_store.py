@@ -0,0 +1,75 @@
+# tests/test_shot_store.py
+
+import numpy as np
+
+from shot_store import ShotStore, MISSING_CODE
+
+
+def assert_same_shots(a, b):
+    assert len(a) == len(b)
+    for name in a.columns:
+        np.testing.assert_array_equal(a[name], b[name])
+    assert a.strings == b.strings
+
+
+def test_save_load_round_trip(tmp_path, shot_frame):
+    store = ShotStore.from_frame(shot_frame(), meta={'season': '2024-25'})
+    path = str(tmp_path / 'a.shots')
+    store.save(path)
+    for mmap in (True, False):
+        loaded = ShotStore.load(path, mmap=mmap)
+        assert_same_shots(loaded, store)
+        assert loaded.meta == {'season': '2024-25'}
+
+
+def test_empty_round_trip(tmp_path):
+    path = str(tmp_path / 'empty.shots')
+    ShotStore.empty_store().save(path)
+    loaded = ShotStore.load(path)
+    assert loaded.empty
+    assert set(loaded.columns) == set(ShotStore.empty_store().columns)
+
+
+def test_compact_dtypes_and_frame_round_trip(shot_frame):
+    frame = shot_frame()
+    store = ShotStore.from_frame(frame)
+    assert store['loc_x'].dtype == np.int16
+    assert store['made'].dtype == np.bool_
+    back = store.to_frame()
+    for column in ('GAME_ID', 'GAME_EVENT_ID', 'LOC_X', 'LOC_Y', 'SHOT_MADE_FLAG', 'ACTION_TYPE', 'VTM'):
+        assert list(back[column].astype(str)) == list(frame[column].astype(str))
+
+
+def test_take_and_concat_share_strings(shot_frame):
+    a = ShotStore.from_frame(shot_frame(seed=1))
+    b = ShotStore.from_frame(shot_frame(seed=2, game_id=22400002))
+    made = a.take(a['made'])
+    assert made.strings is a.strings or made.strings == a.strings
+    assert made['made'].all()
+
+    both = ShotStore.concat([a, b])
+    assert len(both) == len(a) + len(b)
+    assert list(both.decode('action_type')) == list(a.decode('action_type')) + list(b.decode('action_type'))
+    assert both.string_id('no existe') == MISSING_CODE
+
+
+def test_version_identifies_the_content(shot_frame):
+    a = ShotStore.from_frame(shot_frame(seed=1))
+    assert a.version == ShotStore.from_frame(shot_frame(seed=1)).version
+    assert a.version != ShotStore.from_frame(shot_frame(seed=2)).version
+
+
+def test_take_drops_derived_meta(shot_frame):
+    store = ShotStore.from_frame(shot_frame(), meta={'season': '2024-25'})
+    store.version
+    subset = store.take(store['made'])
+    assert subset.meta == {'season': '2024-25'}
+    assert subset.version != store.version
+
+
+def test_last_occurrence_keeps_the_newest_copy(shot_frame):
+    old = ShotStore.from_frame(shot_frame(n=5))
+    new = ShotStore.from_frame(shot_frame(n=5, seed=9))
+    both = ShotStore.concat([old, new])
+    keep = both.last_occurrence()
+    assert keep.tolist() == [False] * 5 + [True] * 5
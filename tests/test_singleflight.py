@@ -0,0 +1,59 @@
+# tests/test_singleflight.py
+
+import os
+import time
+
+import pytest
+
+import singleflight
+from get_data import get_shooting_chart_data
+from singleflight import shared_failure
+
+
+class Unavailable(Exception):
+    pass
+
+
+def test_failure_is_shared_until_it_expires():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        raise Unavailable("503")
+
+    for _ in range(3):
+        with pytest.raises(Unavailable):
+            with shared_failure('key-a'):
+                fetch()
+    assert len(calls) == 1
+
+    # Pasado el TTL se vuelve a intentar
+    path = singleflight._lock_path('key-a', '.failed')
+    os.utime(path, (time.time() - 60, time.time() - 60))
+    with pytest.raises(Unavailable):
+        with shared_failure('key-a'):
+            fetch()
+    assert len(calls) == 2
+
+
+def test_success_clears_the_failure():
+    with pytest.raises(Unavailable):
+        with shared_failure('key-b', ttl=0):
+            raise Unavailable("503")
+    with shared_failure('key-b', ttl=0):
+        pass
+    assert not os.path.exists(singleflight._lock_path('key-b', '.failed'))
+
+
+def test_followers_get_the_leader_error():
+    calls = []
+
+    class FailingEndpoint:
+        def __init__(self, **params):
+            calls.append(params)
+            raise Unavailable("stats.nba.com timeout")
+
+    for _ in range(3):
+        with pytest.raises(Unavailable):
+            get_shooting_chart_data(1, 2, '2015-16', 'FGA', endpoint=FailingEndpoint)
+    assert len(calls) == 1
@@ -0,0 +1,82 @@
+# tests/test_upstream.py
+
+import time
+
+import pytest
+import requests
+
+import upstream
+from upstream import CircuitBreaker, CircuitOpenError, call_upstream
+
+
+@pytest.fixture
+def breaker(tmp_path):
+    return CircuitBreaker(str(tmp_path / 'breaker'), failures=2, cooldown=30)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(upstream, 'backoff_delay', lambda attempt: 0)
+
+
+def end_cooldown(breaker):
+    breaker.store.set('opened_at', time.time() - breaker.cooldown - 1)
+
+
+def test_breaker_opens_and_lets_a_single_probe_through(breaker):
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+    end_cooldown(breaker)
+    assert breaker.allow()
+    # Semiabierto: solo pasa la primera prueba
+    assert not breaker.allow()
+
+    # La prueba falla: se reabre
+    breaker.record_failure()
+    assert breaker.is_open()
+
+    end_cooldown(breaker)
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_retries_transient_errors(tmp_path):
+    calls = []
+
+    def request():
+        calls.append(1)
+        if len(calls) < 3:
+            raise requests.exceptions.ConnectionError("reset")
+        return 'ok'
+
+    tolerant = CircuitBreaker(str(tmp_path / 'tolerant'), failures=5)
+    assert call_upstream(request, 'test', retries=2, breaker=tolerant) == 'ok'
+    assert len(calls) == 3
+
+
+def test_does_not_retry_other_errors(breaker):
+    calls = []
+
+    def request():
+        calls.append(1)
+        raise ValueError("bad parameter")
+
+    with pytest.raises(ValueError):
+        call_upstream(request, 'test', retries=2, breaker=breaker)
+    assert len(calls) == 1
+
+
+def test_open_breaker_does_not_call(breaker):
+    def request():
+        raise requests.exceptions.Timeout("timeout")
+
+    with pytest.raises(requests.exceptions.Timeout):
+        call_upstream(request, 'test', retries=1, breaker=breaker)
+    with pytest.raises(CircuitOpenError):
+        call_upstream(lambda: pytest.fail("no debería llamar"), 'test', breaker=breaker)
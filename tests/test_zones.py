@@ -0,0 +1,36 @@
+# tests/test_zones.py
+
+import numpy as np
+
+from zones import (ABOVE_BREAK_3, BACKCOURT, BASIC_ZONE_GROUP, LEFT_CORNER_3, MID_RANGE_BASIC, PAINT_NON_RA,
+                   RESTRICTED_AREA, RIGHT_CORNER_3, basic_zone_codes, classify_shots, zone_codes)
+
+# Puntos conocidos de la media cancha (LOC, canasta en (0, 0); LOC_X negativo es el lado derecho)
+POINTS = [
+    ((0, 0), RESTRICTED_AREA),
+    ((0, -40), RESTRICTED_AREA),
+    ((0, 100), PAINT_NON_RA),
+    ((0, 200), MID_RANGE_BASIC),
+    ((230, 10), LEFT_CORNER_3),
+    ((-230, 10), RIGHT_CORNER_3),
+    ((0, 300), ABOVE_BREAK_3),
+    ((0, 430), BACKCOURT),
+]
+
+
+def test_known_points():
+    loc_x, loc_y = np.array([point for point, _ in POINTS]).T
+    expected = [zone for _, zone in POINTS]
+    assert basic_zone_codes(loc_x, loc_y).tolist() == expected
+    _, group, counts = classify_shots(loc_x, loc_y)
+    assert group.tolist() == BASIC_ZONE_GROUP[expected].tolist()
+    assert counts.sum() == len(POINTS)
+
+
+def test_basic_zone_codes_match_zone_codes():
+    rng = np.random.default_rng(0)
+    loc_x = rng.integers(-260, 261, 5000).astype(np.int16)
+    loc_y = rng.integers(-60, 500, 5000).astype(np.int16)
+    np.testing.assert_array_equal(basic_zone_codes(loc_x, loc_y), zone_codes(loc_x, loc_y)[0])
+    # Los LOC con decimales se redondean a la celda más cercana
+    np.testing.assert_array_equal(basic_zone_codes(loc_x + 0.3, loc_y - 0.3), zone_codes(loc_x, loc_y)[0])
@@ -0,0 +1,168 @@
+# upstream.py
+
+import json
+import os
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import CACHE_DIR, ForkSafeCache
+from metrics import metrics
+
+# Timeouts de cada petición a stats.nba.com (segundos): conexión y lectura
+UPSTREAM_CONNECT_TIMEOUT = float(os.environ.get("UPSTREAM_CONNECT_TIMEOUT", 3.05))
+UPSTREAM_READ_TIMEOUT = float(os.environ.get("UPSTREAM_READ_TIMEOUT", 20))
+# Reintentos tras el primer intento, con espera exponencial (full jitter) acotada
+UPSTREAM_RETRIES = int(os.environ.get("UPSTREAM_RETRIES", 2))
+UPSTREAM_BACKOFF_BASE = float(os.environ.get("UPSTREAM_BACKOFF_BASE", 0.5))
+UPSTREAM_BACKOFF_MAX = float(os.environ.get("UPSTREAM_BACKOFF_MAX", 8))
+# Conexiones keep-alive por proceso (las comparaciones descargan varias series en paralelo)
+UPSTREAM_POOL_SIZE = int(os.environ.get("UPSTREAM_POOL_SIZE", 10))
+# Circuit breaker: fallos seguidos para abrirlo y segundos abierto antes de dejar pasar una prueba
+BREAKER_FAILURES = int(os.environ.get("UPSTREAM_BREAKER_FAILURES", 5))
+BREAKER_COOLDOWN = float(os.environ.get("UPSTREAM_BREAKER_COOLDOWN", 30))
+
+# Estado del breaker compartido por los workers web y los procesos de los jobs
+UPSTREAM_STATE_DIR = os.environ.get(
+    "UPSTREAM_STATE_DIR",
+    os.path.join(os.path.dirname(CACHE_DIR), "upstream")
+)
+
+# Fallos transitorios que se reintentan: red, timeouts y páginas de error en vez de JSON
+RETRYABLE_ERRORS = (requests.exceptions.RequestException, json.JSONDecodeError)
+
+
+class CircuitOpenError(Exception):
+    """stats.nba.com falló demasiadas veces seguidas: no se le llama hasta que pase el cooldown."""
+
+
+# Errores tras los que se puede servir la última copia en caché
+UPSTREAM_ERRORS = RETRYABLE_ERRORS + (CircuitOpenError,)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker compartido entre procesos (cada job de Dash es un fork, así
+    que un estado en memoria se perdería con cada petición). Tras failures
+    fallos seguidos queda abierto cooldown segundos; después deja pasar una
+    sola petición de prueba, que lo cierra si sale bien o lo reabre si falla.
+    """
+
+    def __init__(self, directory=UPSTREAM_STATE_DIR, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.directory = directory
+        self.failures = failures
+        self.cooldown = cooldown
+        self._store = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = ForkSafeCache(self.directory)
+        return self._store
+
+    def is_open(self):
+        """Indica si el breaker está abierto y dentro del cooldown."""
+        opened_at = self.store.get('opened_at')
+        return opened_at is not None and time.time() - opened_at < self.cooldown
+
+    def allow(self):
+        """Indica si se puede llamar a stats.nba.com ahora."""
+        opened_at = self.store.get('opened_at')
+        if opened_at is None:
+            return True
+        if time.time() - opened_at < self.cooldown:
+            return False
+        # Semiabierto: add es atómico, solo un proceso hace la petición de prueba
+        return self.store.add('probe', os.getpid(), expire=self.cooldown)
+
+    def record_success(self):
+        with self.store.transact():
+            for key in ('failures', 'opened_at', 'probe'):
+                self.store.delete(key)
+
+    def record_failure(self):
+        with self.store.transact():
+            failures = self.store.incr('failures', default=0)
+            # Falló la petición de prueba (semiabierto) o se alcanzó el umbral estando cerrado
+            probe_failed = self.store.pop('probe') is not None
+            opening = failures >= self.failures and (probe_failed or self.store.get('opened_at') is None)
+            if opening:
+                self.store.set('opened_at', time.time())
+        if opening:
+            metrics.inc('upstream_breaker_opened_total')
+
+
+breaker = CircuitBreaker()
+
+
+def backoff_delay(attempt, base=UPSTREAM_BACKOFF_BASE, cap=UPSTREAM_BACKOFF_MAX):
+    """Espera antes del reintento attempt (0, 1, ...): aleatoria entre 0 y base * 2^attempt, como mucho cap."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call_upstream(request, endpoint, retries=UPSTREAM_RETRIES, breaker=breaker):
+    """
+    Ejecuta request() (una llamada a stats.nba.com) con reintentos y backoff
+    para los fallos transitorios, pasando por el circuit breaker. Lanza
+    CircuitOpenError sin llamar si el breaker está abierto y el último error
+    si se agotan los reintentos.
+    """
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            metrics.inc('upstream_errors_total', endpoint=endpoint, error='CircuitOpenError')
+            raise CircuitOpenError(f"{endpoint}: stats.nba.com no responde, reintento en {breaker.cooldown:.0f} s")
+        try:
+            result = request()
+        except RETRYABLE_ERRORS as e:
+            breaker.record_failure()
+            metrics.inc('upstream_errors_total', endpoint=endpoint, error=type(e).__name__)
+            if attempt == retries:
+                raise
+            metrics.inc('upstream_retries_total', endpoint=endpoint)
+            time.sleep(backoff_delay(attempt))
+            continue
+        breaker.record_success()
+        return result
+
+
+def pooled_session(pool_size=UPSTREAM_POOL_SIZE):
+    """Sesión de requests con un pool de conexiones keep-alive y sin reintentos propios (los hace call_upstream)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def install_session():
+    """Hace que nba_api use la sesión compartida del proceso en todas sus peticiones."""
+    from nba_api.stats.library.http import NBAStatsHTTP
+    NBAStatsHTTP.set_session(pooled_session())
+
+
+def upstream_timeout():
+    """(conexión, lectura) para el parámetro timeout de los endpoints de nba_api."""
+    return (UPSTREAM_CONNECT_TIMEOUT, UPSTREAM_READ_TIMEOUT)
+
+
+_installed = False
+
+
+def ensure_session():
+    """Instala la sesión compartida la primera vez que el proceso llama a stats.nba.com."""
+    global _installed
+    if not _installed:
+        install_session()
+        _installed = True
+
+
+def _after_fork():
+    # Un proceso hijo no puede compartir los sockets del padre: cada fork abre su propio pool
+    if _installed:
+        install_session()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,231 @@
+# warm_cache.py
+"""
+Precarga la caché de tiros de cada jugador y temporada (TeamID 0: todos sus
+equipos), o de las combinaciones jugador/equipo indicadas con --teams.
+
+Uso:
+    python warm_cache.py --seasons 2024-25 --workers 4 --rate 1.5
+    python warm_cache.py --seasons 2024-25 --teams "Dallas Mavericks" --record recordings/
+    python warm_cache.py --seasons 2024-25 --teams "Dallas Mavericks" --replay recordings/
+    python warm_cache.py --seasons 2024-25 --baselines    # también los promedios de la liga
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from cache import CACHE_DIR, shot_cache
+from get_data import get_players_list, get_player_id, get_team_id, get_shooting_chart_data
+from upstream import UPSTREAM_ERRORS, breaker
+
+
+class TokenBucket:
+    """Limitador de peticiones por token bucket, seguro entre hilos."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class StaleDataError(Exception):
+    """stats.nba.com falló y se obtuvo la copia vencida de la caché: la combinación no se actualizó."""
+
+
+class Progress:
+    """
+    Combinaciones sin tiros de la ejecución en curso (una por línea), para reanudarla
+    sin volver a pedirlas. Las que tienen datos se omiten por la caché de tiros, que
+    respeta su TTL; el archivo se borra al terminar una ejecución sin fallos.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.empty = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.empty = {line.strip() for line in f if line.strip()}
+
+    @staticmethod
+    def key(player_id, team_id, season, context):
+        return f"{player_id}_{team_id}_{season}_{context}"
+
+    def mark(self, key):
+        with self.lock:
+            self.empty.add(key)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(key + '\n')
+
+    def clear(self):
+        with self.lock:
+            self.empty.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def fetch_with_retries(job, limiter, retries, backoff, context, endpoint=None):
+    """
+    Descarga una combinación respetando el limitador. Los errores de stats.nba.com
+    ya se reintentan en call_upstream (con su backoff y el circuit breaker), así
+    que aquí solo se reintentan los demás fallos, con backoff exponencial.
+    """
+    player_id, team_id, season = job
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            data = get_shooting_chart_data(player_id, team_id, season, context, endpoint=endpoint)
+        except UPSTREAM_ERRORS:
+            raise
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+            continue
+        if data.meta.get('stale'):
+            raise StaleDataError("stats.nba.com no responde: solo hay la copia vencida")
+        return len(data)
+
+
+def build_jobs(player_names, team_names, seasons):
+    """Combinaciones (player_id, team_id, season) a precargar; sin equipos se usa team_id 0 (cualquiera)."""
+    player_ids = [get_player_id(name) for name in player_names]
+    team_ids = [get_team_id(name) for name in team_names] if team_names else [0]
+    return [(player_id, team_id, season)
+            for season in seasons
+            for player_id in player_ids
+            for team_id in team_ids]
+
+
+def warm_cache(jobs, workers=4, rate=1.0, burst=2, retries=3, backoff=2.0,
+               context='FGA', progress_path=None, endpoint=None):
+    """
+    Ejecuta las descargas en un pool acotado. Devuelve (ok, fallidas, omitidas).
+    Se omiten las combinaciones frescas en la caché y las que ya resultaron sin tiros
+    en esta ejecución (si se está reanudando).
+    """
+    progress = Progress(progress_path or os.path.join(CACHE_DIR, 'warm_progress.txt'))
+    limiter = TokenBucket(rate, burst)
+
+    pending = []
+    skipped = 0
+    for job in jobs:
+        if (shot_cache.contains(*job, context)
+                or Progress.key(*job, context) in progress.empty):
+            skipped += 1
+        else:
+            pending.append(job)
+
+    ok = failed = 0
+    stopped = False
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_with_retries, job, limiter, retries, backoff, context, endpoint): job
+            for job in pending
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            if future.cancelled():
+                # Cuenta como fallida: se descargará al volver a ejecutar
+                failed += 1
+                continue
+            try:
+                n_shots = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"✗ {job}: {e}", file=sys.stderr)
+                if not stopped and breaker.is_open():
+                    # Con el breaker abierto el resto fallaría igual: se cancelan las pendientes
+                    stopped = True
+                    for other in futures:
+                        other.cancel()
+                    print("✗ circuit breaker abierto: se detiene la precarga", file=sys.stderr)
+                continue
+            ok += 1
+            if not n_shots:
+                progress.mark(Progress.key(*job, context))
+            print(f"✓ {job}: {n_shots} tiros ({ok + failed}/{len(pending)})", file=sys.stderr)
+
+    if not failed:
+        progress.clear()
+    return ok, failed, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precarga la caché de tiros de la NBA.")
+    parser.add_argument('--seasons', nargs='+', required=True, help="Temporadas 'YYYY-YY'")
+    parser.add_argument('--players', nargs='*', help="Nombres de jugadores (por defecto, todos los activos)")
+    parser.add_argument('--teams', nargs='*',
+                        help="Nombres de equipos (por defecto, TeamID 0: todos los equipos del jugador)")
+    parser.add_argument('--workers', type=int, default=4, help="Descargas concurrentes")
+    parser.add_argument('--rate', type=float, default=1.0, help="Peticiones por segundo")
+    parser.add_argument('--burst', type=int, default=2, help="Ráfaga máxima del token bucket")
+    parser.add_argument('--retries', type=int, default=3,
+                        help="Reintentos de los fallos ajenos a stats.nba.com (los de la API los hace upstream.py)")
+    parser.add_argument('--backoff', type=float, default=2.0, help="Espera base entre reintentos (s)")
+    parser.add_argument('--context', default='FGA')
+    parser.add_argument('--progress', help="Archivo de progreso para reanudar una ejecución interrumpida")
+    parser.add_argument('--reset', action='store_true', help="Ignora el progreso previo")
+    parser.add_argument('--replay', help="Directorio con respuestas grabadas (sin red)")
+    parser.add_argument('--record', help="Graba las respuestas descargadas en este directorio")
+    parser.add_argument('--baselines', action='store_true',
+                        help="Actualiza también los promedios de la liga de cada temporada (baselines.py)")
+    args = parser.parse_args(argv)
+
+    progress_path = args.progress or os.path.join(CACHE_DIR, 'warm_progress.txt')
+    if args.reset and os.path.exists(progress_path):
+        os.remove(progress_path)
+
+    endpoint = None
+    if args.replay:
+        from replay import replay_endpoint
+        endpoint = replay_endpoint(args.replay)
+    elif args.record:
+        from replay import recording_endpoint
+        endpoint = recording_endpoint(args.record)
+
+    baselines_failed = 0
+    if args.baselines:
+        # La vista relativa solo lee estos artefactos: se actualizan aquí, fuera de las peticiones
+        from baselines import refresh_baseline
+        for season in args.seasons:
+            try:
+                refresh_baseline(season, endpoint=endpoint)
+            except Exception as e:
+                baselines_failed += 1
+                print(f"✗ promedios {season}: {e}", file=sys.stderr)
+                continue
+            print(f"✓ promedios {season}", file=sys.stderr)
+
+    jobs = build_jobs(args.players or get_players_list(), args.teams, args.seasons)
+    print(f"{len(jobs)} combinaciones en {shot_cache.directory}", file=sys.stderr)
+
+    ok, failed, skipped = warm_cache(
+        jobs, workers=args.workers, rate=args.rate, burst=args.burst, retries=args.retries,
+        backoff=args.backoff, context=args.context, progress_path=progress_path, endpoint=endpoint
+    )
+    print(f"Completadas: {ok} | Fallidas: {failed} | Omitidas: {skipped}", file=sys.stderr)
+    return 1 if failed or baselines_failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
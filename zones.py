@@ -0,0 +1,158 @@
+# zones.py
+
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from cache import CACHE_DIR
+
+# Geometría de la cancha en unidades de LOC (décimas de pie, canasta en (0, 0)).
+# La usan tanto las líneas dibujadas (charts.court_shapes) como la rejilla de zonas.
+BASELINE_Y = -47.5
+HALF_COURT_Y = 422.5
+SIDELINE_X = 250
+PAINT_HALF_WIDTH = 80
+PAINT_TOP = 142.5
+RESTRICTED_RADIUS = 40
+THREE_PT_RADIUS = 237.5
+CORNER_THREE_X = 220
+CORNER_THREE_TOP = 92.5  # Altura donde terminan las líneas de las esquinas
+
+# Categorías oficiales de ShotChartDetail (SHOT_ZONE_BASIC, SHOT_ZONE_AREA, SHOT_ZONE_RANGE).
+# LOC_X negativo es el lado derecho de la cancha.
+BASIC_ZONES = ('Restricted Area', 'In The Paint (Non-RA)', 'Mid-Range', 'Left Corner 3',
+               'Right Corner 3', 'Above the Break 3', 'Backcourt')
+ZONE_AREAS = ('Center(C)', 'Left Side Center(LC)', 'Right Side Center(RC)', 'Left Side(L)',
+              'Right Side(R)', 'Back Court(BC)')
+ZONE_RANGES = ('Less Than 8 ft.', '8-16 ft.', '16-24 ft.', '24+ ft.', 'Back Court Shot')
+(RESTRICTED_AREA, PAINT_NON_RA, MID_RANGE_BASIC, LEFT_CORNER_3, RIGHT_CORNER_3,
+ ABOVE_BREAK_3, BACKCOURT) = range(len(BASIC_ZONES))
+CENTER, LEFT_CENTER, RIGHT_CENTER, LEFT_SIDE, RIGHT_SIDE, BACK_COURT = range(len(ZONE_AREAS))
+LESS_THAN_8, FROM_8_TO_16, FROM_16_TO_24, FROM_24, BACK_COURT_SHOT = range(len(ZONE_RANGES))
+
+# Grupos de los gráficos (compactos, caben en int8) y grupo de cada zona oficial
+PAINT = 0
+THREE = 1
+MID_RANGE = 2
+
+ZONE_NAMES = ('Pintura', 'Triples', 'Medio Rango')
+BASIC_ZONE_GROUP = np.array([PAINT, PAINT, MID_RANGE, THREE, THREE, THREE, THREE], dtype=np.int8)
+
+# Rejilla: una celda por unidad de LOC; la última fila (y = 423) representa todo lo que pasa de media cancha
+GRID_X_MIN, GRID_X_MAX = -SIDELINE_X, SIDELINE_X
+GRID_Y_MIN, GRID_Y_MAX = int(np.floor(BASELINE_Y)), int(np.ceil(HALF_COURT_Y))
+
+ZONE_GRID_DIR = os.environ.get("ZONE_GRID_DIR", os.path.dirname(CACHE_DIR))
+# Cambia cuando cambian las reglas de build_zone_grid (la geometría ya entra en la clave)
+ZONE_GRID_FORMAT = 1
+
+
+def _geometry_key():
+    """Hash de la geometría y las categorías: si cambian, la rejilla guardada deja de valer."""
+    geometry = (ZONE_GRID_FORMAT, BASELINE_Y, HALF_COURT_Y, SIDELINE_X, PAINT_HALF_WIDTH, PAINT_TOP, RESTRICTED_RADIUS,
+                THREE_PT_RADIUS, CORNER_THREE_X, CORNER_THREE_TOP, BASIC_ZONES, ZONE_AREAS, ZONE_RANGES)
+    return hashlib.sha1(repr(geometry).encode('utf-8')).hexdigest()[:12]
+
+
+def build_zone_grid():
+    """
+    Clasifica cada punto entero de la media cancha. Devuelve un array int8
+    (3, ny, nx) con el índice de la zona básica, el área y el rango de distancia.
+    Los tiros sobre una línea cuentan como de dentro (como en la NBA).
+    """
+    x, y = np.meshgrid(np.arange(GRID_X_MIN, GRID_X_MAX + 1, dtype=np.float64),
+                       np.arange(GRID_Y_MIN, GRID_Y_MAX + 1, dtype=np.float64))
+    distance = np.hypot(x, y)
+    backcourt = y > HALF_COURT_Y
+    corner = (np.abs(x) > CORNER_THREE_X) & (y <= CORNER_THREE_TOP)
+    above_break = (distance > THREE_PT_RADIUS) & (y > CORNER_THREE_TOP)
+    in_paint = (np.abs(x) <= PAINT_HALF_WIDTH) & (y <= PAINT_TOP)
+    # El área restringida baja en línea recta hasta la línea de fondo por debajo del aro
+    restricted = (distance <= RESTRICTED_RADIUS) | ((y < 0) & (np.abs(x) <= RESTRICTED_RADIUS))
+
+    # Se asigna de menor a mayor prioridad
+    basic = np.full(x.shape, MID_RANGE_BASIC, dtype=np.int8)
+    basic[in_paint] = PAINT_NON_RA
+    basic[restricted] = RESTRICTED_AREA
+    basic[above_break] = ABOVE_BREAK_3
+    basic[corner] = np.where(x[corner] < 0, RIGHT_CORNER_3, LEFT_CORNER_3)
+    basic[backcourt] = BACKCOURT
+
+    # Área según el ángulo respecto a la canasta (0° = de frente)
+    angle = np.degrees(np.arctan2(x, np.maximum(y, 0)))
+    area_by_angle = np.array([RIGHT_SIDE, RIGHT_CENTER, CENTER, LEFT_CENTER, LEFT_SIDE], dtype=np.int8)
+    area = area_by_angle[np.digitize(angle, [-67.5, -22.5, 22.5, 67.5])]
+    area[basic == RESTRICTED_AREA] = CENTER
+    area[basic == LEFT_CORNER_3] = LEFT_SIDE
+    area[basic == RIGHT_CORNER_3] = RIGHT_SIDE
+    # Los triples por encima del codo nunca son de un lateral
+    area[(basic == ABOVE_BREAK_3) & (area == LEFT_SIDE)] = LEFT_CENTER
+    area[(basic == ABOVE_BREAK_3) & (area == RIGHT_SIDE)] = RIGHT_CENTER
+    area[backcourt] = BACK_COURT
+
+    distance_range = np.digitize(distance, [80, 160, 240]).astype(np.int8)
+    # Los triples de esquina (a 22 pies) también cuentan como 24+ ft.
+    distance_range[BASIC_ZONE_GROUP[basic] == THREE] = FROM_24
+    distance_range[backcourt] = BACK_COURT_SHOT
+
+    return np.stack([basic, area, distance_range])
+
+
+@lru_cache(maxsize=1)
+def zone_grid(directory=ZONE_GRID_DIR):
+    """Rejilla de zonas: se construye una vez, se guarda en disco y después se lee con memory-map."""
+    path = os.path.join(directory, f"zone_grid_{_geometry_key()}.npy")
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        pass
+    grid = build_zone_grid()
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, grid)
+    os.replace(tmp_path, path)
+    return grid
+
+
+def _grid_cells(loc_x, loc_y):
+    """Fila y columna de la rejilla de cada tiro (LOC es entero en el ShotStore: no hace falta redondear)."""
+    def cell(values, low, high):
+        values = np.asarray(values)
+        if values.dtype.kind != 'i':
+            values = np.rint(values.astype(np.float64))
+        return np.clip(values, low, high).astype(np.intp) - low
+    return cell(loc_y, GRID_Y_MIN, GRID_Y_MAX), cell(loc_x, GRID_X_MIN, GRID_X_MAX)
+
+
+def zone_codes(loc_x, loc_y):
+    """
+    Zona básica, área y rango oficiales de cada tiro con una sola indexación de
+    la rejilla. Devuelve un array int8 (3, n): índices en BASIC_ZONES, ZONE_AREAS y ZONE_RANGES.
+    """
+    iy, ix = _grid_cells(loc_x, loc_y)
+    return zone_grid()[:, iy, ix]
+
+
+def basic_zone_codes(loc_x, loc_y):
+    """Solo la zona básica (índices en BASIC_ZONES) de cada tiro: un tercio de los accesos de zone_codes."""
+    iy, ix = _grid_cells(loc_x, loc_y)
+    return zone_grid()[0][iy, ix]
+
+
+def group_counts(basic_counts):
+    """Tiros por grupo de los gráficos (ZONE_NAMES) a partir de los conteos por zona oficial."""
+    return np.bincount(BASIC_ZONE_GROUP, weights=basic_counts, minlength=len(ZONE_NAMES)).astype(np.int64)
+
+
+def classify_shots(loc_x, loc_y):
+    """
+    Clasifica todos los tiros en una sola pasada vectorizada.
+    Devuelve (distancia, grupo, conteos): la distancia al aro en unidades de LOC,
+    un array int8 con el grupo de los gráficos de cada tiro y los tiros por grupo.
+    """
+    distance = np.hypot(np.asarray(loc_x, dtype=np.float64), np.asarray(loc_y, dtype=np.float64))
+    group = BASIC_ZONE_GROUP[basic_zone_codes(loc_x, loc_y)]
+    counts = np.bincount(group, minlength=len(ZONE_NAMES))
+    return distance, group, counts